@@ -1,3 +1,10 @@
+from collections import deque
+from heapq import heappop, heappush
+from math import inf
+from scar_sim.metrics import Welford
+from typing import Literal
+
+
 class SimulationObject:
     def __init__(self):
         """
@@ -19,6 +26,10 @@ class SimulationEntity(SimulationObject):
         processing_sd_time: float = 0.0,
         processing_cashflow_per_unit: float = 0.0,
         metadata: dict = None,
+        stream_key: str | None = None,
+        capacity: int | None = None,
+        throughput: float | None = None,
+        queue_discipline: Literal["fifo", "priority"] = "fifo",
     ):
         """
         Initializes a SimulationEntity with processing parameters and metadata.
@@ -34,7 +45,30 @@ class SimulationEntity(SimulationObject):
 
         - metadata (dict): A dictionary of metadata associated with the entity.
             - This is injected into orders and can be used for tracking and analysis.
+        - stream_key (str | None): A stable key for the entity's random stream when the Simulation uses per-entity random streams.
+            - Give the same entity the same key in every scenario so that it gets the same random numbers (common random numbers) even if other entities are added or removed.
+            - Default: None (use the entity's simulation id)
+        - capacity (int | None): The number of Orders the entity can process at once (parallel servers).
+            - Orders that arrive while every server is busy wait in a line and start processing as servers free up.
+            - On an Arc that consolidates shipments, the capacity applies to shipments instead of Orders.
+            - Default: None (unlimited)
+        - throughput (float | None): The number of units the entity processes per unit of time. Each Order's processing time is extended by its units divided by the throughput.
+            - Default: None (processing time does not depend on units)
+        - queue_discipline (Literal['fifo', 'priority']): The order in which waiting Orders are served when the entity has a capacity.
+            - 'fifo': First come, first served.
+            - 'priority': Lowest `get_priority` first (earliest due time by default), first come, first served among equals.
+            - Default: 'fifo'
+
+        Raises:
+
+        - ValueError: If capacity or throughput is not positive or queue_discipline is not recognized.
         """
+        if capacity is not None and capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if throughput is not None and throughput <= 0:
+            raise ValueError("throughput must be positive")
+        if queue_discipline not in ("fifo", "priority"):
+            raise ValueError(f"Unknown queue discipline: {queue_discipline}")
         metadata = metadata if metadata is not None else dict()
         # Basic info
         super().__init__()
@@ -49,7 +83,9 @@ class SimulationEntity(SimulationObject):
             ).lstrip("_")
             + "_cashflow"
         )
+        self.__metadata_version__ = 0
         self.metadata = metadata
+        self.stream_key = stream_key
 
         # Processing defaults
         self.__default_processing_min_time__ = processing_min_time
@@ -65,6 +101,54 @@ class SimulationEntity(SimulationObject):
         self.processing_time_sd = processing_sd_time
         self.processing_cashflow_per_unit = processing_cashflow_per_unit
 
+        # Resource capacity
+        self.capacity = capacity
+        self.throughput = throughput
+        self.queue_discipline = queue_discipline
+        # Whether Orders must acquire one of a limited number of servers
+        self.__constrained__ = capacity is not None
+        self.__busy__ = 0
+        # Waiting jobs as (enqueue time, start, arg) in a deque (fifo) or as (priority, seq, enqueue time, start, arg) in a heap (priority)
+        self.__waiting__ = deque() if queue_discipline == "fifo" else []
+        self.__waiting_seq__ = 0
+        # Time weighted statistics, accumulated whenever the busy servers or the waiting line change
+        self.__stats_time__ = 0.0
+        self.__busy_area__ = 0.0
+        self.__queue_area__ = 0.0
+        self.__max_queue_length__ = 0
+        self.__served__ = 0
+        self.__waiting_times__ = Welford()
+
+    @property
+    def metadata(self) -> dict:
+        """
+        A dictionary of metadata associated with the entity.
+
+        Assigning a new dictionary (or calling `update_metadata`) bumps the entity's metadata version so that interned history snapshots taken before the change are kept as they were.
+        """
+        return self.__metadata__
+
+    @metadata.setter
+    def metadata(self, metadata: dict) -> None:
+        self.__metadata__ = metadata
+        self.__metadata_version__ += 1
+
+    def update_metadata(self, **kwargs) -> None:
+        """
+        Updates the entity's metadata with the provided key-value pairs and bumps its metadata version.
+
+        Use this (or assign a new dictionary to `metadata`) instead of mutating the metadata dictionary in place when a Simulation interns history metadata.
+
+        Optional Arguments:
+
+        - kwargs: The key-value pairs to add or overwrite in the metadata.
+
+        Returns:
+
+        - None
+        """
+        self.metadata = {**self.__metadata__, **kwargs}
+
     def get_metadata(self, **kwargs) -> dict:
         """
         Retrieve the metadata dictionary for the entity, optionally augmented with additional key-value pairs.
@@ -92,7 +176,7 @@ class SimulationEntity(SimulationObject):
 
         - float: A processing time value, which is at least the minimum processing time and follows a normal distribution defined by the average and standard deviation.
         """
-        return self.__simulation__.normal_generator(
+        return self.__simulation__.get_normal_generator(self)(
             mean=self.processing_time_avg,
             sigma=self.processing_time_sd,
             min=self.processing_time_min,
@@ -153,6 +237,156 @@ class SimulationEntity(SimulationObject):
             processing_cashflow_per_unit=self.__default_processing_cashflow_per_unit__,
         )
 
+    def get_service_time(self, units: int) -> float:
+        """
+        Calculates the time an Order of a given number of units spends being processed by this entity: a processing time draw (see `get_processing_time`) plus the units divided by the throughput, if any.
+
+        Required Arguments:
+
+        - units (int): The number of units being processed.
+
+        Returns:
+
+        - float: The service time.
+        """
+        if self.throughput is None:
+            return self.get_processing_time()
+        return self.get_processing_time() + units / self.throughput
+
+    def get_priority(self, order) -> float:
+        """
+        Returns the priority of a waiting Order when the entity uses the 'priority' queue discipline. Lower values are served first.
+
+        This method can be overridden in subclasses to provide custom priorities.
+
+        By default, this returns the Order's due time (or inf if it has none), which serves the earliest due Orders first.
+
+        Required Arguments:
+
+        - order (Order): The waiting Order.
+
+        Returns:
+
+        - float: The priority.
+        """
+        return order.due_time if order.due_time is not None else inf
+
+    def __accumulate__(self) -> None:
+        """
+        An internal method to add the busy servers and waiting line length since the last change to the time weighted statistics.
+
+        Returns:
+
+        - None
+        """
+        now = self.__simulation__.current_time()
+        elapsed = now - self.__stats_time__
+        if elapsed:
+            self.__busy_area__ += self.__busy__ * elapsed
+            self.__queue_area__ += len(self.__waiting__) * elapsed
+            self.__stats_time__ = now
+
+    def __acquire__(self, order, start, arg) -> bool:
+        """
+        An internal method to request a server for a job (an Order, or a shipment on an Arc that consolidates them).
+
+        Required Arguments:
+
+        - order (Order): The Order the job belongs to (the first Order of a shipment), used for its priority.
+        - start (callable): The function that starts processing the job. It is called with arg once the job gets a server, unless a server is free now.
+        - arg: The argument for start.
+
+        Returns:
+
+        - bool: True if a server was free and is now busy (the caller starts processing right away), False if the job was added to the waiting line.
+        """
+        self.__accumulate__()
+        if self.__busy__ < self.capacity:
+            self.__busy__ += 1
+            self.__served__ += 1
+            self.__waiting_times__.add(0.0)
+            return True
+        waiting = self.__waiting__
+        if self.queue_discipline == "fifo":
+            waiting.append((self.__stats_time__, start, arg))
+        else:
+            self.__waiting_seq__ += 1
+            heappush(
+                waiting,
+                (
+                    self.get_priority(order),
+                    self.__waiting_seq__,
+                    self.__stats_time__,
+                    start,
+                    arg,
+                ),
+            )
+        if len(waiting) > self.__max_queue_length__:
+            self.__max_queue_length__ = len(waiting)
+        return False
+
+    def __release__(self) -> None:
+        """
+        An internal method to free the server of a job that finished processing. The next waiting job, if any, takes over the server and starts processing.
+
+        Returns:
+
+        - None
+        """
+        self.__accumulate__()
+        waiting = self.__waiting__
+        if not waiting:
+            self.__busy__ -= 1
+            return
+        if self.queue_discipline == "fifo":
+            enqueued, start, arg = waiting.popleft()
+        else:
+            enqueued, start, arg = heappop(waiting)[2:]
+        self.__served__ += 1
+        self.__waiting_times__.add(self.__stats_time__ - enqueued)
+        start(arg)
+
+    def get_resource_stats(self) -> dict:
+        """
+        Returns the capacity statistics of the entity up to the current simulation time. Statistics are only kept for entities with a capacity.
+
+        Returns:
+
+        - dict: A dictionary with the following keys.
+            - 'capacity': The number of servers.
+            - 'busy': The number of busy servers.
+            - 'queue_length': The number of jobs waiting.
+            - 'max_queue_length': The longest the waiting line has been.
+            - 'mean_queue_length': The time weighted average number of jobs waiting.
+            - 'utilisation': The time weighted average share of busy servers.
+            - 'served': The number of jobs that got a server.
+            - 'mean_waiting_time': The average time served jobs waited for a server (None if no jobs were served).
+            - 'max_waiting_time': The longest time a served job waited for a server (None if no jobs were served).
+        """
+        if self.__simulation__ is not None:
+            self.__accumulate__()
+        elapsed = self.__stats_time__
+        waiting_times = self.__waiting_times__
+        return {
+            "capacity": self.capacity,
+            "busy": self.__busy__,
+            "queue_length": len(self.__waiting__),
+            "max_queue_length": self.__max_queue_length__,
+            "mean_queue_length": (
+                self.__queue_area__ / elapsed if elapsed else 0.0
+            ),
+            "utilisation": (
+                self.__busy_area__ / (elapsed * self.capacity)
+                if elapsed and self.capacity
+                else 0.0
+            ),
+            "served": self.__served__,
+            "mean_waiting_time": (
+                waiting_times.mean if waiting_times.count else None
+            ),
+            "max_waiting_time": waiting_times.max,
+        }
+
     def get_cashflow(self, units: int) -> float:
         """
         Calculate the cashflow for processing a given number of units through this entity.
@@ -166,6 +400,17 @@ class SimulationEntity(SimulationObject):
         return self.processing_cashflow_per_unit * units
 
 
+NODE_HOOKS = (
+    "order_placed",
+    "order_shipped",
+    "order_arrived",
+    "order_completed",
+)
+"""The Node methods Orders call as they progress, indexed by Order status code."""
+ORDER_ARRIVED = NODE_HOOKS.index("order_arrived")
+"""The status code of an arrived Order (`scar_sim.order.ARRIVED`, which can not be imported here since scar_sim.order imports this module)."""
+
+
 class Node(SimulationEntity):
     def __init__(self, **kwargs):
         """
@@ -189,6 +434,24 @@ class Node(SimulationEntity):
         # Connected by an arc that represents processing time and cashflow at the node
         self.inbound_graph_id = None
         self.outbound_graph_id = None
+        # Whether each hook in NODE_HOOKS is called (refined by `__detect_hooks__` when the Node is added to a Simulation)
+        self.__hooks__ = (True,) * len(NODE_HOOKS)
+
+    def __detect_hooks__(self) -> None:
+        """
+        An internal method to detect which Order hooks (see `NODE_HOOKS`) are overridden, so Orders can skip calls to the placeholder ones.
+
+        This is called by the Simulation when the Node is added. Hooks overridden on the instance after that are not detected.
+
+        Returns:
+
+        - None
+        """
+        self.__hooks__ = tuple(
+            name in self.__dict__
+            or getattr(self.__class__, name) is not getattr(Node, name)
+            for name in NODE_HOOKS
+        )
 
     def order_arrived(self, order):
         """
@@ -253,6 +516,8 @@ class Arc(SimulationEntity):
         origin_node: Node,
         destination_node: Node,
         is_symmetric: bool = True,
+        consolidation_window: float | None = None,
+        consolidation_capacity: int | None = None,
         **kwargs,
     ):
         """
@@ -270,8 +535,139 @@ class Arc(SimulationEntity):
 
         - is_symmetric (bool): Indicates whether the arc is symmetric, meaning the processing parameters apply equally in both directions.
             - Default: True
+        - consolidation_window (float | None): If set, Orders shipped onto the arc are consolidated into shipments that leave this long after their first Order joined.
+            - Each shipment is processed with a single processing time draw and a single arrival event, after which its Orders continue individually.
+            - Shipments are kept per direction, so Orders travelling a symmetric arc in opposite directions are not consolidated together.
+            - Default: None
+        - consolidation_capacity (int | None): If set, Orders are consolidated into shipments of at most this many units, which leave as soon as they are full.
+            - An Order that does not fit sends the open shipment on its way and starts a new one. Orders larger than the capacity travel alone.
+            - Without a consolidation_window, shipments only leave once full.
+            - Default: None
+
+        Raises:
+
+        - ValueError: If consolidation_window is negative or consolidation_capacity is not positive.
         """
+        if consolidation_window is not None and consolidation_window < 0:
+            raise ValueError("consolidation_window must not be negative")
+        if consolidation_capacity is not None and consolidation_capacity <= 0:
+            raise ValueError("consolidation_capacity must be positive")
         super().__init__(**kwargs)
         self.is_symmetric = is_symmetric
         self.origin_node = origin_node
         self.destination_node = destination_node
+        self.consolidation_window = consolidation_window
+        self.consolidation_capacity = consolidation_capacity
+        # Whether Orders are consolidated into shipments on this arc
+        self.__consolidates__ = (
+            consolidation_window is not None
+            or consolidation_capacity is not None
+        )
+        # Open shipments keyed by the Node they travel to as [orders, units, dispatch event]
+        self.__shipments__ = {}
+
+    def __consolidate__(self, order) -> None:
+        """
+        An internal method to add an Order that was shipped onto the arc to the open shipment in its direction.
+
+        This is called by the Order instead of scheduling its own arrival when the arc consolidates shipments.
+
+        Required Arguments:
+
+        - order (Order): The Order to add. Its next Node must already be set.
+
+        Returns:
+
+        - None
+        """
+        node = order.__next_node__
+        capacity = self.consolidation_capacity
+        shipment = self.__shipments__.get(node)
+        if (
+            shipment is not None
+            and capacity is not None
+            and shipment[1] + order.units > capacity
+        ):
+            self.__dispatch__(node)
+            shipment = None
+        if shipment is None:
+            shipment = self.__shipments__[node] = [[], 0, None]
+            if self.consolidation_window is not None:
+                shipment[2] = self.__simulation__.add_event(
+                    self.consolidation_window, self.__dispatch__, args=(node,)
+                )
+        shipment[0].append(order)
+        shipment[1] += order.units
+        if capacity is not None and shipment[1] >= capacity:
+            self.__dispatch__(node)
+
+    def __dispatch__(self, node: Node) -> None:
+        """
+        An internal method to send the open shipment towards a Node on its way.
+
+        The shipment's service time (see `get_service_time`) is drawn once (from the arc's random stream) and a single arrival event is scheduled for all of its Orders, once the shipment gets a server if the arc has a capacity.
+
+        Required Arguments:
+
+        - node (Node): The Node the shipment travels to.
+
+        Returns:
+
+        - None
+        """
+        orders, units, event = self.__shipments__.pop(node)
+        if event is not None:
+            # The window event is still pending if the shipment filled up first
+            self.__simulation__.cancel_event(event)
+        if self.__constrained__ and not self.__acquire__(
+            orders[0], self.__depart__, (orders, units)
+        ):
+            return
+        self.__depart__((orders, units))
+
+    def __depart__(self, shipment: tuple) -> None:
+        """
+        An internal method to start processing a shipment, which schedules its arrival.
+
+        Required Arguments:
+
+        - shipment (tuple): The Orders of the shipment and its total units.
+
+        Returns:
+
+        - None
+        """
+        orders, units = shipment
+        self.__simulation__.add_event(
+            self.get_service_time(units), self.__deliver__, args=(orders,)
+        )
+
+    def __deliver__(self, orders: list) -> None:
+        """
+        An internal method to hand an arrived shipment back to its Orders, which then continue individually in the order they joined the shipment.
+
+        Required Arguments:
+
+        - orders (list[Order]): The Orders of the shipment.
+
+        Returns:
+
+        - None
+        """
+        if self.__constrained__:
+            self.__release__()
+        for order in orders:
+            order.__next__(ORDER_ARRIVED)
+
+    def get_shipments(self) -> list[dict]:
+        """
+        Returns the shipments that are waiting to leave on the arc.
+
+        Returns:
+
+        - list[dict]: A dictionary per open shipment with the 'node' it travels to, its 'orders' and its total 'units'.
+        """
+        return [
+            {"node": node, "orders": list(orders), "units": units}
+            for node, (orders, units, _) in self.__shipments__.items()
+        ]
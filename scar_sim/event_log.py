@@ -0,0 +1,217 @@
+from array import array
+from typing import Iterator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class EventLog:
+    def __init__(self, capacity: int | None = None):
+        """
+        Initializes a columnar log of processed events.
+
+        Each logged event is stored as a time (8 bytes), an event id (8 bytes) and an interned function name code (4 bytes) in typed arrays.
+        Function names are stored once no matter how many events reference them, and no references to event arguments are kept.
+
+        Optional Arguments:
+
+        - capacity (int | None): The maximum number of events to keep.
+            - If set, the log acts as a ring buffer that only keeps the most recent events.
+            - If None, all events are kept.
+            - Default: None
+
+        Raises:
+
+        - ValueError: If capacity is not a positive integer.
+        """
+        if capacity is not None and capacity <= 0:
+            raise ValueError("capacity must be a positive integer or None")
+        self.__capacity__ = capacity
+        self.__count__ = 0
+        self.__func_names__ = []
+        self.__func_codes__ = {}
+        size = capacity if capacity is not None else 0
+        self.__time__ = array("d", bytes(8 * size))
+        self.__event_id__ = array("q", bytes(8 * size))
+        self.__func_code__ = array("i", bytes(4 * size))
+
+    @property
+    def bytes_per_event(self) -> int:
+        """
+        The number of bytes used to store each logged event.
+        """
+        return (
+            self.__time__.itemsize
+            + self.__event_id__.itemsize
+            + self.__func_code__.itemsize
+        )
+
+    @property
+    def total_events(self) -> int:
+        """
+        The total number of events ever logged, including those dropped from a full ring buffer.
+        """
+        return self.__count__
+
+    def __len__(self) -> int:
+        if self.__capacity__ is None:
+            return self.__count__
+        return min(self.__count__, self.__capacity__)
+
+    def append(self, time: float, event_id: int, func_name: str) -> None:
+        """
+        Logs a processed event.
+
+        Required Arguments:
+
+        - time (float): The time at which the event was processed.
+        - event_id (int): The id of the processed event.
+        - func_name (str): The name of the function that was called.
+
+        Returns:
+
+        - None
+        """
+        func_code = self.__func_codes__.get(func_name)
+        if func_code is None:
+            func_code = self.__func_codes__[func_name] = len(
+                self.__func_names__
+            )
+            self.__func_names__.append(func_name)
+        if self.__capacity__ is None:
+            self.__time__.append(time)
+            self.__event_id__.append(event_id)
+            self.__func_code__.append(func_code)
+        else:
+            idx = self.__count__ % self.__capacity__
+            self.__time__[idx] = time
+            self.__event_id__[idx] = event_id
+            self.__func_code__[idx] = func_code
+        self.__count__ += 1
+
+    def __ordered__(self, column: array) -> array:
+        """
+        An internal method to return a column in chronological order.
+
+        Required Arguments:
+
+        - column (array): One of the log columns.
+
+        Returns:
+
+        - array: The column itself if no reordering is needed, otherwise a reordered copy.
+        """
+        if self.__capacity__ is None:
+            return column
+        if self.__count__ <= self.__capacity__:
+            return column[: self.__count__]
+        start = self.__count__ % self.__capacity__
+        return column[start:] + column[:start]
+
+    def get_func_names(self) -> list[str]:
+        """
+        Returns the interned function names. The function name code of an event is an index into this list.
+
+        Returns:
+
+        - list[str]: The interned function names.
+        """
+        return list(self.__func_names__)
+
+    def to_columns(self) -> dict:
+        """
+        Exports the retained events as columns of python lists in chronological order.
+
+        Returns:
+
+        - dict: A dictionary with 'event_id', 'time' and 'func' lists.
+        """
+        names = self.__func_names__
+        return {
+            "event_id": self.__ordered__(self.__event_id__).tolist(),
+            "time": self.__ordered__(self.__time__).tolist(),
+            "func": [
+                names[code] for code in self.__ordered__(self.__func_code__)
+            ],
+        }
+
+    def to_numpy(self) -> dict:
+        """
+        Exports the retained events as NumPy arrays in chronological order.
+
+        The arrays are copies so that the log can keep growing while they are in use.
+
+        Raises:
+
+        - ImportError: If NumPy is not installed.
+
+        Returns:
+
+        - dict: A dictionary with 'event_id', 'time' and 'func_code' arrays and a 'func_names' list to decode 'func_code'.
+        """
+        if np is None:
+            raise ImportError("NumPy is required to export the event log")
+        return {
+            "event_id": np.array(
+                self.__ordered__(self.__event_id__), dtype=np.int64
+            ),
+            "time": np.array(self.__ordered__(self.__time__), dtype=np.float64),
+            "func_code": np.array(
+                self.__ordered__(self.__func_code__), dtype=np.int32
+            ),
+            "func_names": self.get_func_names(),
+        }
+
+    def iter_csv_chunks(self, chunk_size: int = 100000) -> Iterator[str]:
+        """
+        Yields the retained events as CSV text in chronological order, a chunk of rows at a time.
+
+        The first chunk starts with a header row.
+
+        Optional Arguments:
+
+        - chunk_size (int): The maximum number of rows per chunk.
+            - Default: 100000
+
+        Returns:
+
+        - Iterator[str]: CSV formatted chunks.
+        """
+        names = self.__func_names__
+        event_ids = self.__ordered__(self.__event_id__)
+        times = self.__ordered__(self.__time__)
+        func_codes = self.__ordered__(self.__func_code__)
+        header = "event_id,time,func\n"
+        for start in range(0, len(self), chunk_size):
+            stop = min(start + chunk_size, len(self))
+            yield header + "".join(
+                f"{event_ids[idx]},{times[idx]!r},{names[func_codes[idx]]}\n"
+                for idx in range(start, stop)
+            )
+            header = ""
+        if header:
+            yield header
+
+    def to_csv(self, filename: str, chunk_size: int = 100000) -> str:
+        """
+        Writes the retained events to a CSV file in chronological order.
+
+        Required Arguments:
+
+        - filename (str): The file path to write to.
+
+        Optional Arguments:
+
+        - chunk_size (int): The number of rows written at a time.
+            - Default: 100000
+
+        Returns:
+
+        - str: The filename that was written.
+        """
+        with open(filename, "w") as f:
+            for chunk in self.iter_csv_chunks(chunk_size=chunk_size):
+                f.write(chunk)
+        return filename
@@ -1,19 +1,497 @@
 from scar_sim.entity import Node, Arc
+from scar_sim.routing import (
+    INF,
+    astar_path,
+    build_csr,
+    edge_position,
+    init_route_worker,
+    k_shortest_paths,
+    landmark_tables,
+    pareto_paths,
+    path_weight,
+    repair_tree_decrease,
+    repair_tree_increase,
+    route_options_from_origin,
+    route_options_task,
+    shortest_path_tree,
+    tree_path,
+)
 from scgraph import Graph as SCGraph
-from typing import Literal
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+from typing import Iterable, Iterator, Literal
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class Graph:
-    def __init__(self):
+    def __init__(self, path_cache_size: int = 1024, tree_cache_size: int = 64):
         """
         Initializes a Graph object to manage nodes and arcs within the simulation.
+
+        Edges are stored in compressed sparse row (CSR) form: contiguous typed arrays of edge targets, time weights, cashflow weights and Arc indices, indexed by an `indptr` array of row offsets per graph ID (see `get_csr`).
+        Weight changes are written into the arrays in place. New edges are collected separately and merged into new arrays the next time the graph is read.
+
+        Optional Arguments:
+
+        - path_cache_size (int): The maximum number of optimal paths cached per graph type (least recently used paths are evicted first).
+            - Set to 0 to disable path caching.
+            - Default: 1024
+        - tree_cache_size (int): The maximum number of shortest path trees cached per graph type (least recently used trees are evicted first).
+            - Set to 0 to disable tree caching.
+            - Default: 64
+        """
+        self.version = 0
+        """A counter that is incremented every time an edge weight in the graph changes."""
+        self.__csr__ = build_csr(0, [])
+        # Edges added since the CSR arrays were last built keyed by (origin, destination) graph IDs as [time, cashflow, arc index]
+        self.__pending_edges__ = {}
+        # The Arc objects referenced by the CSR arc indices
+        self.__arc_objs__ = []
+        # Maps Arc ids to their index in the Arc list
+        self.__arc_index__ = {}
+        # Cached compatibility views (see `time_graph`) keyed by graph type as (stamp, view)
+        self.__views__ = {}
+        self.__path_cache_size__ = path_cache_size
+        # Persistent shortest path solvers per graph type (built lazily)
+        self.__solvers__ = {}
+        # LRU caches of optimal paths per graph type keyed by (origin, destination) graph IDs
+        self.__path_cache__ = {"time": OrderedDict(), "cashflow": OrderedDict()}
+        # Maps (origin, destination) edges to the cache keys of paths that use them per graph type
+        self.__path_cache_edges__ = {"time": {}, "cashflow": {}}
+        self.__tree_cache_size__ = tree_cache_size
+        # LRU caches of shortest path trees per graph type keyed by origin graph ID
+        self.__tree_cache__ = {"time": OrderedDict(), "cashflow": OrderedDict()}
+        # The graph IDs with an edge into each graph ID (used to repair trees)
+        self.__in_edges__ = []
+        # The Node each graph ID belongs to
+        self.__node_objs__ = []
+        # LRU caches of alternative route sets per graph type keyed by (origin, destination, k) graph IDs
+        self.__route_sets__ = {"time": OrderedDict(), "cashflow": OrderedDict()}
+        # ALT landmark distance tables per graph type (see `preprocess_landmarks`)
+        self.__landmarks__ = {}
+        # LRU cache of compiled itineraries keyed by path (see `get_itinerary`)
+        self.__itineraries__ = OrderedDict()
+
+    def __getstate__(self) -> dict:
+        # Solvers are rebuilt on demand since they can not be serialized
+        state = self.__dict__.copy()
+        state["__solvers__"] = {}
+        state["__views__"] = {}
+        state["__itineraries__"] = OrderedDict()
+        return state
+
+    def __shared_state__(self) -> list:
+        """
+        An internal method to list the parts of the graph that are never modified in place, so forks of a simulation can share them (see `Simulation.fork`).
+
+        The CSR row offsets and edge targets are rebuilt rather than modified when edges are added, and landmark tables are replaced rather than updated.
+
+        Returns:
+
+        - list: The shareable objects.
+        """
+        return [
+            self.__csr__["indptr"],
+            self.__csr__["indices"],
+            *self.__landmarks__.values(),
+        ]
+
+    def __compact__(self) -> dict:
+        """
+        An internal method to merge pending edges and new graph IDs into freshly built CSR arrays.
+
+        New arrays are built rather than resizing the current ones so that NumPy views from `to_numpy` stay valid (they keep referring to the previous arrays).
+
+        Returns:
+
+        - dict: The up to date CSR graph.
+        """
+        csr = self.__csr__
+        size = len(self.__node_objs__)
+        if not self.__pending_edges__ and len(csr["indptr"]) - 1 == size:
+            return csr
+        indptr = csr["indptr"]
+        indices = csr["indices"]
+        edges = [
+            (
+                origin_id,
+                indices[position],
+                csr["time"][position],
+                csr["cashflow"][position],
+                csr["arc"][position],
+            )
+            for origin_id in range(len(indptr) - 1)
+            for position in range(indptr[origin_id], indptr[origin_id + 1])
+        ]
+        edges += [
+            (origin_id, destination_id, *weights)
+            for (
+                origin_id,
+                destination_id,
+            ), weights in self.__pending_edges__.items()
+        ]
+        self.__pending_edges__ = {}
+        self.__csr__ = build_csr(size, edges)
+        return self.__csr__
+
+    def __view__(self, graph: Literal["cashflow", "time", "arc"]) -> list[dict]:
+        """
+        An internal method to build (or reuse) a list of dictionaries view of one of the CSR edge arrays.
+
+        Required Arguments:
+
+        - graph (Literal['cashflow', 'time', 'arc']): The edge array to view.
+
+        Returns:
+
+        - list[dict]: A list mapping each graph ID to a dictionary of its connected graph IDs and edge values (Arc objects for 'arc').
+        """
+        stamp = (self.version, len(self.__node_objs__), len(self.__arc_objs__))
+        cached = self.__views__.get(graph)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        csr = self.__compact__()
+        indptr = csr["indptr"]
+        indices = csr["indices"]
+        values = csr[graph]
+        view = []
+        for origin_id in range(len(indptr) - 1):
+            positions = range(indptr[origin_id], indptr[origin_id + 1])
+            if graph == "arc":
+                view.append(
+                    {
+                        indices[position]: self.__arc_objs__[values[position]]
+                        for position in positions
+                        if values[position] >= 0
+                    }
+                )
+            else:
+                view.append(
+                    {
+                        indices[position]: values[position]
+                        for position in positions
+                    }
+                )
+        self.__views__[graph] = (stamp, view)
+        return view
+
+    @property
+    def time_graph(self) -> list[dict]:
+        """
+        A read only compatibility view of the time graph as a list of dictionaries. This maps index based graph IDs to time values.
+
+        The view is rebuilt from the CSR arrays after the graph changes and modifying it does not change the graph. Use `update_graphs` to change edge weights.
+        """
+        return self.__view__("time")
+
+    @property
+    def cashflow_graph(self) -> list[dict]:
+        """
+        A read only compatibility view of the cashflow graph as a list of dictionaries. This maps index based graph IDs to cashflow values. Cashflows are stored as negative values since we are trying to minimize costs (which are negative cashflows).
+
+        The view is rebuilt from the CSR arrays after the graph changes and modifying it does not change the graph. Use `update_graphs` to change edge weights.
+        """
+        return self.__view__("cashflow")
+
+    @property
+    def arc_obj_graph(self) -> list[dict]:
+        """
+        A read only compatibility view of the arc object graph as a list of dictionaries. This maps index based graph IDs to Arc objects.
+
+        Use `get_arc` to look up a single edge without building the view.
+        """
+        return self.__view__("arc")
+
+    def get_csr(self) -> dict:
+        """
+        Returns the graph in compressed sparse row (CSR) form.
+
+        The arrays are shared with the graph and must not be modified. Edge weights in them are updated in place when `update_graphs` changes existing edges.
+
+        Returns:
+
+        - dict: The CSR graph.
+            - 'indptr': An array where the outgoing edges of graph ID `i` are stored at positions `indptr[i]` to `indptr[i + 1]`.
+            - 'indices': An array with the graph ID each edge ends at.
+            - 'time': An array with the time weight of each edge.
+            - 'cashflow': An array with the cashflow weight of each edge (costs are stored as positive values).
+            - 'arc': An array with the index of the Arc of each edge (see `get_arc`), or -1 for the internal edge of a Node.
+        """
+        return self.__compact__()
+
+    def to_numpy(self) -> dict:
+        """
+        Exports the CSR arrays of the graph (see `get_csr`) as zero copy NumPy views.
+
+        The views reflect later in place weight updates. Adding Nodes or Arcs moves the graph to new arrays, so call this again after changing the network.
+
+        Raises:
+
+        - ImportError: If NumPy is not installed.
+
+        Returns:
+
+        - dict: A dictionary with 'indptr', 'indices', 'time', 'cashflow' and 'arc' arrays.
+        """
+        if np is None:
+            raise ImportError("NumPy is required to export the graph")
+        csr = self.__compact__()
+        return {
+            "indptr": np.frombuffer(csr["indptr"], dtype=np.int64),
+            "indices": np.frombuffer(csr["indices"], dtype=np.int64),
+            "time": np.frombuffer(csr["time"], dtype=np.float64),
+            "cashflow": np.frombuffer(csr["cashflow"], dtype=np.float64),
+            "arc": np.frombuffer(csr["arc"], dtype=np.int64),
+        }
+
+    def get_arc(self, origin_id: int, destination_id: int) -> Arc | None:
+        """
+        Gets the Arc an edge belongs to.
+
+        Required Arguments:
+
+        - origin_id (int): The graph ID the edge starts at.
+        - destination_id (int): The graph ID the edge ends at.
+
+        Returns:
+
+        - Arc | None: The Arc of the edge, or None if the edge does not exist or is the internal edge of a Node.
+        """
+        if self.__pending_edges__:
+            pending = self.__pending_edges__.get((origin_id, destination_id))
+            if pending is not None:
+                return (
+                    self.__arc_objs__[pending[2]] if pending[2] >= 0 else None
+                )
+        csr = self.__csr__
+        position = edge_position(csr, origin_id, destination_id)
+        if position < 0 or csr["arc"][position] < 0:
+            return None
+        return self.__arc_objs__[csr["arc"][position]]
+
+    def get_itinerary(self, path: list[int]) -> list[tuple]:
+        """
+        Compiles a path into the (Arc, Node) steps an Order travels along it: the Arc of each hop and the Node it leads to, which resolves the direction of symmetric Arcs.
+
+        Itineraries are served from a least recently used cache (sized like the path cache) so Orders on the same path share one itinerary. The cache is cleared when an Arc is added.
+        The returned itinerary is shared and must not be modified.
+
+        Required Arguments:
+
+        - path (list[int]): A path of graph IDs alternating between the inbound and outbound graph IDs of Nodes.
+
+        Returns:
+
+        - list[tuple]: The (Arc, Node) step of each hop of the path.
         """
-        self.time_graph = []
-        """Initializes the time graph as a list of dictionaries. This maps index based graph IDs to time values."""
-        self.cashflow_graph = []
-        """Initializes the cashflow graph as a list of dictionaries. This maps index based graph IDs to cashflow values. Cashflows are stored as negative values since we are trying to minimize costs (which are negative cashflows)."""
-        self.arc_obj_graph = []
-        """Initializes the arc object graph as a list of dictionaries. This maps index based graph IDs to Arc objects."""
+        key = tuple(path)
+        cache = self.__itineraries__
+        itinerary = cache.get(key)
+        if itinerary is not None:
+            cache.move_to_end(key)
+            return itinerary
+        itinerary = []
+        for idx in range(1, len(path) - 1, 2):
+            arc = self.get_arc(path[idx], path[idx + 1])
+            itinerary.append(
+                (
+                    arc,
+                    (
+                        arc.origin_node
+                        if arc.origin_node.inbound_graph_id == path[idx + 1]
+                        else arc.destination_node
+                    ),
+                )
+            )
+        if self.__path_cache_size__ > 0:
+            cache[key] = itinerary
+            if len(cache) > self.__path_cache_size__:
+                cache.popitem(last=False)
+        return itinerary
+
+    def __get_solver__(self, graph: Literal["cashflow", "time"]) -> SCGraph:
+        """
+        An internal method to get the persistent shortest path solver for a graph type, building it if needed.
+
+        Solvers are kept in sync with the graph by `add_object` and `update_graphs` so they do not need to be rebuilt between queries.
+
+        Required Arguments:
+
+        - graph (Literal['cashflow', 'time']): The graph type.
+
+        Returns:
+
+        - SCGraph: The solver for the graph type.
+        """
+        solver = self.__solvers__.get(graph)
+        if solver is None:
+            # Pass a copy since the solver may keep and modify its input
+            solver = self.__solvers__[graph] = SCGraph(
+                [dict(edges) for edges in self.__view__(graph)]
+            )
+        return solver
+
+    def __invalidate__(
+        self,
+        graph: Literal["cashflow", "time"],
+        origin_id: int,
+        destination_id: int,
+        old_weight: float | None,
+        new_weight: float,
+    ) -> None:
+        """
+        An internal method to drop cached paths and repair cached trees that may no longer be optimal after an edge weight changed.
+
+        If the weight increased, only cached paths that use the edge can become suboptimal, so only those are dropped.
+        Otherwise (a decreased weight or a new edge) any cached path may have a better alternative, so the path cache for the graph type is cleared.
+        Cached trees are repaired in place, touching only the part of each tree whose distances can change (see `scar_sim.routing.repair_tree_increase` and `scar_sim.routing.repair_tree_decrease`).
+        Cached route sets are re-weighed on lookup, so they are only cleared when a new edge is added.
+        Landmark tables remain valid lower bounds when a weight increases, but are dropped (falling back to Dijkstra's algorithm until `preprocess_landmarks` is called again) otherwise.
+
+        Required Arguments:
+
+        - graph (Literal['cashflow', 'time']): The graph type whose edge changed.
+        - origin_id (int): The graph ID the edge starts at.
+        - destination_id (int): The graph ID the edge ends at.
+        - old_weight (float | None): The previous edge weight. None if the edge is new.
+        - new_weight (float): The new edge weight.
+
+        Returns:
+
+        - None
+        """
+        increased = old_weight is not None and new_weight > old_weight
+        cache = self.__path_cache__[graph]
+        edges = self.__path_cache_edges__[graph]
+        if increased:
+            for key in edges.pop((origin_id, destination_id), ()):
+                self.__drop_cached_path__(graph, key, cache.pop(key))
+        else:
+            cache.clear()
+            edges.clear()
+        if old_weight is None:
+            self.__route_sets__[graph].clear()
+        if not increased:
+            self.__landmarks__.pop(graph, None)
+        trees = self.__tree_cache__[graph]
+        csr = self.__compact__() if trees else None
+        for tree in trees.values():
+            if increased:
+                repair_tree_increase(
+                    csr,
+                    graph,
+                    self.__in_edges__,
+                    tree,
+                    origin_id,
+                    destination_id,
+                )
+            else:
+                repair_tree_decrease(
+                    csr, graph, tree, origin_id, destination_id
+                )
+
+    def __drop_cached_path__(
+        self, graph: Literal["cashflow", "time"], key: tuple, path: list[int]
+    ) -> None:
+        """
+        An internal method to remove a cached path from the edge index.
+
+        Required Arguments:
+
+        - graph (Literal['cashflow', 'time']): The graph type of the cached path.
+        - key (tuple): The (origin, destination) cache key of the path.
+        - path (list[int]): The cached path.
+
+        Returns:
+
+        - None
+        """
+        edges = self.__path_cache_edges__[graph]
+        for edge in zip(path, path[1:]):
+            keys = edges.get(edge)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del edges[edge]
+
+    def __set_edge__(
+        self,
+        origin_id: int,
+        destination_id: int,
+        time: float,
+        cashflow: float,
+        arc: Arc | None = None,
+    ) -> None:
+        """
+        An internal method to set the weights of a single edge and keep solvers and cached paths consistent.
+
+        Required Arguments:
+
+        - origin_id (int): The graph ID the edge starts at.
+        - destination_id (int): The graph ID the edge ends at.
+        - time (float): The time weight of the edge.
+        - cashflow (float): The cashflow weight of the edge.
+
+        Optional Arguments:
+
+        - arc (Arc | None): The Arc the edge belongs to. None for the internal edge of a Node.
+            - Default: None
+
+        Returns:
+
+        - None
+        """
+        arc_idx = -1
+        if arc is not None:
+            arc_idx = self.__arc_index__.get(arc.id)
+            if arc_idx is None:
+                arc_idx = self.__arc_index__[arc.id] = len(self.__arc_objs__)
+                self.__arc_objs__.append(arc)
+        key = (origin_id, destination_id)
+        csr = self.__csr__
+        pending = self.__pending_edges__.get(key)
+        position = (
+            edge_position(csr, origin_id, destination_id)
+            if pending is None
+            else -1
+        )
+        if pending is not None:
+            old_weights = (pending[0], pending[1])
+            pending[0] = time
+            pending[1] = cashflow
+            if arc is not None:
+                pending[2] = arc_idx
+        elif position >= 0:
+            old_weights = (csr["time"][position], csr["cashflow"][position])
+            csr["time"][position] = time
+            csr["cashflow"][position] = cashflow
+            if arc is not None and csr["arc"][position] != arc_idx:
+                csr["arc"][position] = arc_idx
+                self.version += 1
+        else:
+            # New edges are merged into the CSR arrays on the next read
+            old_weights = (None, None)
+            self.__pending_edges__[key] = [time, cashflow, arc_idx]
+            self.__in_edges__[destination_id].add(origin_id)
+        for graph, old_weight, weight in (
+            ("time", old_weights[0], time),
+            ("cashflow", old_weights[1], cashflow),
+        ):
+            if old_weight == weight:
+                continue
+            if graph in self.__solvers__:
+                self.__solvers__[graph].add_edge(
+                    origin_id, destination_id, weight
+                )
+            self.__invalidate__(
+                graph, origin_id, destination_id, old_weight, weight
+            )
+            self.version += 1
 
     def update_graphs(self, obj: Arc | Node):
         """
@@ -34,34 +512,30 @@ class Graph:
         - None
         """
         if isinstance(obj, Arc):
-            self.time_graph[obj.origin_node.outbound_graph_id][
-                obj.destination_node.inbound_graph_id
-            ] = max(float(obj.processing_time_avg), 0)
-            self.cashflow_graph[obj.origin_node.outbound_graph_id][
-                obj.destination_node.inbound_graph_id
-            ] = max(-float(obj.processing_cashflow_per_unit), 0)
-            self.arc_obj_graph[obj.origin_node.outbound_graph_id][
-                obj.destination_node.inbound_graph_id
-            ] = obj
+            time = max(float(obj.processing_time_avg), 0)
+            cashflow = max(-float(obj.processing_cashflow_per_unit), 0)
+            self.__set_edge__(
+                obj.origin_node.outbound_graph_id,
+                obj.destination_node.inbound_graph_id,
+                time,
+                cashflow,
+                obj,
+            )
             if obj.is_symmetric:
-                self.time_graph[obj.destination_node.outbound_graph_id][
-                    obj.origin_node.inbound_graph_id
-                ] = max(float(obj.processing_time_avg), 0)
-                self.cashflow_graph[obj.destination_node.outbound_graph_id][
-                    obj.origin_node.inbound_graph_id
-                ] = max(-float(obj.processing_cashflow_per_unit), 0)
-                self.arc_obj_graph[obj.destination_node.outbound_graph_id][
-                    obj.origin_node.inbound_graph_id
-                ] = obj
-        elif isinstance(obj, Node):
-            self.time_graph[obj.inbound_graph_id] = {
-                obj.outbound_graph_id: max(float(obj.processing_time_avg), 0)
-            }
-            self.cashflow_graph[obj.inbound_graph_id] = {
-                obj.outbound_graph_id: max(
-                    -float(obj.processing_cashflow_per_unit), 0
+                self.__set_edge__(
+                    obj.destination_node.outbound_graph_id,
+                    obj.origin_node.inbound_graph_id,
+                    time,
+                    cashflow,
+                    obj,
                 )
-            }
+        elif isinstance(obj, Node):
+            self.__set_edge__(
+                obj.inbound_graph_id,
+                obj.outbound_graph_id,
+                max(float(obj.processing_time_avg), 0),
+                max(-float(obj.processing_cashflow_per_unit), 0),
+            )
 
     def add_object(self, obj: Node | Arc) -> Node | Arc:
         """
@@ -76,11 +550,21 @@ class Graph:
         - obj (Node | Arc): The Node or Arc object to add to the graphs.
         """
         if isinstance(obj, Node):
-            obj.inbound_graph_id = len(self.time_graph)
+            obj.inbound_graph_id = len(self.__node_objs__)
             obj.outbound_graph_id = obj.inbound_graph_id + 1
-            self.time_graph += [dict(), dict()]
-            self.cashflow_graph += [dict(), dict()]
-            self.arc_obj_graph += [dict(), dict()]
+            self.__in_edges__ += [set(), set()]
+            self.__node_objs__ += [obj, obj]
+            for solver in self.__solvers__.values():
+                solver.add_node()
+                solver.add_node()
+            # New nodes are unreachable until their edges are added
+            for trees in self.__tree_cache__.values():
+                for tree in trees.values():
+                    tree["distance"].extend((INF, INF))
+                    tree["predecessor"].extend((-1, -1))
+        elif isinstance(obj, Arc):
+            # A new Arc can change the Arc of an edge in cached itineraries
+            self.__itineraries__.clear()
         if isinstance(obj, Node | Arc):
             self.update_graphs(obj)
         return obj
@@ -96,19 +580,20 @@ class Graph:
         - path (list[int]): A list of graph IDs representing the path.
         - graph (Literal['cashflow', 'time']): The type of graph to use for weight calculation.
 
+        Raises:
+
+        - KeyError: If an edge of the path does not exist in the graph.
+
         Returns:
 
         - float: The total weight of the path.
             - Note: Since cashflows are stored as negative values, the returned cashflow weight will be adjusted back to its original sign for consistency.
         """
-        graph_obj = (
-            self.cashflow_graph if graph == "cashflow" else self.time_graph
+        weight_sum = path_weight(
+            self.__compact__(),
+            "cashflow" if graph == "cashflow" else "time",
+            path,
         )
-        weight_sum = 0.0
-        for i in range(len(path) - 1):
-            origin = path[i]
-            destination = path[i + 1]
-            weight_sum += graph_obj[origin][destination]
         return weight_sum if graph == "time" else -weight_sum
 
     def get_optimal_path(
@@ -120,6 +605,9 @@ class Graph:
         """
         Calculates the optimal path between the specified origin and destination nodes based on the specified graph type.
 
+        Paths are served from a least recently used cache when possible. Cached paths are dropped when an edge weight change could make them suboptimal.
+        Other paths are found with a goal directed A* search if landmarks are available (see `preprocess_landmarks`), otherwise with Dijkstra's algorithm.
+
         Required Arguments:
 
         - origin_node (Node): The starting node for the path.
@@ -130,13 +618,390 @@ class Graph:
 
         - list[int]: A list of graph IDs representing the optimal path.
         """
-        graph_obj = SCGraph(
-            self.cashflow_graph if graph == "cashflow" else self.time_graph
+        graph = "cashflow" if graph == "cashflow" else "time"
+        key = (origin_node.inbound_graph_id, destination_node.inbound_graph_id)
+        cache = self.__path_cache__[graph]
+        path = cache.get(key)
+        if path is not None:
+            cache.move_to_end(key)
+            return list(path)
+        tables = self.__landmarks__.get(graph)
+        if tables is not None:
+            result = astar_path(self.__compact__(), graph, tables, *key)
+            if result is None:
+                raise ValueError(
+                    "The origin and destination nodes are not connected in the graph"
+                )
+            path = result[1]
+        else:
+            path = self.__get_solver__(graph).dijkstra(*key)["path"]
+        if self.__path_cache_size__ > 0:
+            cache[key] = path
+            edges = self.__path_cache_edges__[graph]
+            for edge in zip(path, path[1:]):
+                edges.setdefault(edge, set()).add(key)
+            if len(cache) > self.__path_cache_size__:
+                self.__drop_cached_path__(graph, *cache.popitem(last=False))
+        return list(path)
+
+    def preprocess_landmarks(
+        self,
+        count: int = 8,
+        graphs: tuple = ("time", "cashflow"),
+    ) -> None:
+        """
+        Selects landmark nodes and precomputes ALT (A*, landmarks and triangle inequality) distance tables so that `get_optimal_path` can run a goal directed A* search that only explores a small part of large graphs.
+
+        Each landmark costs two shortest path trees to preprocess and two distance arrays of memory per graph type.
+        The tables stay in use when edge weights increase (the bounds stay valid). When a weight decreases or an edge is added, the tables for that graph type are dropped and queries fall back to Dijkstra's algorithm until this is called again.
+
+        Optional Arguments:
+
+        - count (int): The maximum number of landmarks per graph type.
+            - Default: 8
+        - graphs (tuple): The graph types to preprocess.
+            - Default: ('time', 'cashflow')
+
+        Returns:
+
+        - None
+        """
+        csr = self.__compact__()
+        candidate_ids = list(range(0, len(self.__node_objs__), 2))
+        for graph in graphs:
+            graph = "cashflow" if graph == "cashflow" else "time"
+            self.__landmarks__[graph] = landmark_tables(
+                csr, graph, candidate_ids, count
+            )
+
+    def has_landmarks(self, graph: Literal["cashflow", "time"]) -> bool:
+        """
+        Checks whether up to date landmark tables are available for a graph type (see `preprocess_landmarks`).
+
+        Required Arguments:
+
+        - graph (Literal['cashflow', 'time']): The graph type.
+
+        Returns:
+
+        - bool: True if optimal paths for the graph type are found with landmark guided A* search.
+        """
+        graph = "cashflow" if graph == "cashflow" else "time"
+        return graph in self.__landmarks__
+
+    def get_shortest_path_tree(
+        self, origin_node: Node, graph: Literal["cashflow", "time"]
+    ) -> dict:
+        """
+        Calculates the shortest path tree from the specified origin node to every graph ID based on the specified graph type.
+
+        Trees are cached per origin and are repaired incrementally when edge weights change.
+        The returned tree is shared with the cache and must not be modified.
+
+        Required Arguments:
+
+        - origin_node (Node): The node to root the tree at.
+        - graph (Literal['cashflow', 'time']): The type of graph to use for path calculation.
+
+        Returns:
+
+        - dict: The shortest path tree.
+            - 'origin_id': The graph ID the tree is rooted at (the inbound graph ID of the origin node).
+            - 'predecessor': An array with the previous graph ID on the shortest path to each graph ID (-1 for the origin and unreachable graph IDs).
+            - 'distance': An array with the shortest distance to each graph ID (inf for unreachable graph IDs).
+        """
+        graph = "cashflow" if graph == "cashflow" else "time"
+        trees = self.__tree_cache__[graph]
+        tree = trees.get(origin_node.inbound_graph_id)
+        if tree is not None:
+            trees.move_to_end(origin_node.inbound_graph_id)
+            return tree
+        tree = shortest_path_tree(
+            self.__compact__(), graph, origin_node.inbound_graph_id
         )
-        return graph_obj.dijkstra(
+        if self.__tree_cache_size__ > 0:
+            trees[origin_node.inbound_graph_id] = tree
+            if len(trees) > self.__tree_cache_size__:
+                trees.popitem(last=False)
+        return tree
+
+    def get_tree_path(self, tree: dict, destination_node: Node) -> list[int]:
+        """
+        Extracts the path to the specified destination node from a shortest path tree.
+
+        Required Arguments:
+
+        - tree (dict): A shortest path tree as returned by `get_shortest_path_tree`.
+        - destination_node (Node): The node to extract the path to.
+
+        Raises:
+
+        - ValueError: If the destination node is not reachable from the root of the tree.
+
+        Returns:
+
+        - list[int]: A list of graph IDs representing the path.
+        """
+        return tree_path(tree, destination_node.inbound_graph_id)
+
+    def get_optimal_paths(
+        self,
+        origin_node: Node,
+        destination_nodes: list[Node],
+        graph: Literal["cashflow", "time"],
+    ) -> list[list[int]]:
+        """
+        Calculates the optimal paths from one origin node to many destination nodes with a single shortest path tree.
+
+        Required Arguments:
+
+        - origin_node (Node): The starting node for the paths.
+        - destination_nodes (list[Node]): The ending nodes for the paths.
+        - graph (Literal['cashflow', 'time']): The type of graph to use for path calculation.
+
+        Raises:
+
+        - ValueError: If a destination node is not reachable from the origin node.
+
+        Returns:
+
+        - list[list[int]]: A list of graph ID paths in the same order as destination_nodes.
+        """
+        tree = self.get_shortest_path_tree(origin_node, graph)
+        return [
+            tree_path(tree, destination_node.inbound_graph_id)
+            for destination_node in destination_nodes
+        ]
+
+    def get_k_shortest_paths(
+        self,
+        origin_node: Node,
+        destination_node: Node,
+        k: int,
+        graph: Literal["cashflow", "time"],
+    ) -> list[list[int]]:
+        """
+        Calculates up to k loopless shortest paths between the specified origin and destination nodes using Yen's algorithm.
+
+        Required Arguments:
+
+        - origin_node (Node): The starting node for the paths.
+        - destination_node (Node): The ending node for the paths.
+        - k (int): The maximum number of paths to return.
+        - graph (Literal['cashflow', 'time']): The type of graph to use for path calculation.
+
+        Returns:
+
+        - list[list[int]]: Up to k graph ID paths ordered from best to worst. Empty if the nodes are not connected.
+        """
+        return [
+            path
+            for _, path in k_shortest_paths(
+                self.__compact__(),
+                "cashflow" if graph == "cashflow" else "time",
+                origin_node.inbound_graph_id,
+                destination_node.inbound_graph_id,
+                k,
+            )
+        ]
+
+    def get_path_entity_ids(self, path: list[int]) -> frozenset:
+        """
+        Finds the simulation ids of the Nodes and Arcs a path passes through.
+
+        Required Arguments:
+
+        - path (list[int]): A list of graph IDs representing the path.
+
+        Returns:
+
+        - frozenset: The simulation ids of the Nodes and Arcs used by the path.
+        """
+        entity_ids = {self.__node_objs__[graph_id].id for graph_id in path}
+        for origin_id, destination_id in zip(path, path[1:]):
+            arc = self.get_arc(origin_id, destination_id)
+            if arc is not None:
+                entity_ids.add(arc.id)
+        return frozenset(entity_ids)
+
+    def get_route_set(
+        self,
+        origin_node: Node,
+        destination_node: Node,
+        k: int,
+        graph: Literal["cashflow", "time"],
+    ) -> list[dict]:
+        """
+        Gets the set of up to k alternative paths between the specified origin and destination nodes together with the entities each path uses.
+
+        Route sets are computed once per lane with `get_k_shortest_paths` and cached. They are kept when edge weights change and only cleared when new edges are added, so the paths in a route set are candidates rather than guaranteed optimal paths.
+        The returned list is shared with the cache and must not be modified.
+
+        Required Arguments:
+
+        - origin_node (Node): The starting node for the paths.
+        - destination_node (Node): The ending node for the paths.
+        - k (int): The maximum number of paths in the route set.
+        - graph (Literal['cashflow', 'time']): The type of graph to use for path calculation.
+
+        Returns:
+
+        - list[dict]: The route set ordered from best to worst when it was computed.
+            - 'path': The graph IDs of the path.
+            - 'entity_ids': A frozenset with the simulation ids of the Nodes and Arcs used by the path.
+        """
+        graph = "cashflow" if graph == "cashflow" else "time"
+        key = (
             origin_node.inbound_graph_id,
             destination_node.inbound_graph_id,
-        )["path"]
+            k,
+        )
+        route_sets = self.__route_sets__[graph]
+        route_set = route_sets.get(key)
+        if route_set is not None:
+            route_sets.move_to_end(key)
+            return route_set
+        route_set = [
+            {"path": path, "entity_ids": self.get_path_entity_ids(path)}
+            for path in self.get_k_shortest_paths(
+                origin_node, destination_node, k, graph
+            )
+        ]
+        if self.__path_cache_size__ > 0:
+            route_sets[key] = route_set
+            if len(route_sets) > self.__path_cache_size__:
+                route_sets.popitem(last=False)
+        return route_set
+
+    def get_alternative_path(
+        self,
+        origin_node: Node,
+        destination_node: Node,
+        graph: Literal["cashflow", "time"],
+        k: int = 3,
+        exclude_entity_ids: set | frozenset | None = None,
+    ) -> list[int] | None:
+        """
+        Picks the best path between the specified origin and destination nodes from the lane's cached route set (see `get_route_set`) without running a new search.
+
+        Paths are compared using the current edge weights and paths that use any excluded entity (i.e. a disrupted Node or Arc) are skipped.
+
+        Required Arguments:
+
+        - origin_node (Node): The starting node for the path.
+        - destination_node (Node): The ending node for the path.
+        - graph (Literal['cashflow', 'time']): The type of graph to use for path comparison.
+
+        Optional Arguments:
+
+        - k (int): The maximum number of paths in the route set.
+            - Default: 3
+        - exclude_entity_ids (set | frozenset | None): Simulation ids of Nodes and Arcs the path may not use.
+            - Default: None
+
+        Returns:
+
+        - list[int] | None: A copy of the best remaining path, or None if every path in the route set is excluded.
+        """
+        best_path = None
+        best_weight = INF
+        for route in self.get_route_set(
+            origin_node, destination_node, k, graph
+        ):
+            if exclude_entity_ids and not route["entity_ids"].isdisjoint(
+                exclude_entity_ids
+            ):
+                continue
+            weight = abs(self.get_path_weight(route["path"], graph))
+            if weight < best_weight:
+                best_path = route["path"]
+                best_weight = weight
+        return list(best_path) if best_path is not None else None
+
+    def get_pareto_paths(
+        self,
+        origin_node: Node,
+        destination_node: Node,
+        max_time: float | None = None,
+        min_cashflow: float | None = None,
+    ) -> list[dict]:
+        """
+        Calculates the Pareto frontier of time and cashflow trade-offs between the specified origin and destination nodes with a single search over both graphs (see `scar_sim.routing.pareto_paths`).
+
+        A path is on the frontier if no other path is both at least as fast and at least as cheap.
+
+        Required Arguments:
+
+        - origin_node (Node): The starting node for the paths.
+        - destination_node (Node): The ending node for the paths.
+
+        Optional Arguments:
+
+        - max_time (float | None): The maximum total time of a path.
+            - Default: None (no limit)
+        - min_cashflow (float | None): The minimum total cashflow of a path (i.e. a budget expressed as a negative cashflow such as -100).
+            - Default: None (no limit)
+
+        Returns:
+
+        - list[dict]: The frontier paths ordered from fastest (and most expensive) to cheapest (and slowest), each with 'path', 'time' and 'cashflow' keys. Empty if no path meets the constraints.
+        """
+        return [
+            {"path": path, "time": time, "cashflow": -cost}
+            for time, cost, path in pareto_paths(
+                self.__compact__(),
+                origin_node.inbound_graph_id,
+                destination_node.inbound_graph_id,
+                max_time=max_time,
+                max_cost=None if min_cashflow is None else -min_cashflow,
+            )
+        ]
+
+    def get_weighted_path(
+        self,
+        origin_node: Node,
+        destination_node: Node,
+        time_weight: float,
+        cashflow_weight: float,
+        max_time: float | None = None,
+        min_cashflow: float | None = None,
+    ) -> dict | None:
+        """
+        Finds the path between the specified origin and destination nodes that minimizes a weighted blend of time and cost.
+
+        The best path for any non negative weights lies on the Pareto frontier, so it is picked from `get_pareto_paths` rather than solved separately for each set of weights.
+
+        Required Arguments:
+
+        - origin_node (Node): The starting node for the path.
+        - destination_node (Node): The ending node for the path.
+        - time_weight (float): The weight applied to the path time.
+        - cashflow_weight (float): The weight applied to the path cost (the negated cashflow).
+
+        Optional Arguments:
+
+        - max_time (float | None): The maximum total time of the path.
+            - Default: None (no limit)
+        - min_cashflow (float | None): The minimum total cashflow of the path.
+            - Default: None (no limit)
+
+        Returns:
+
+        - dict | None: The path with 'path', 'time' and 'cashflow' keys, or None if no path meets the constraints.
+        """
+        frontier = self.get_pareto_paths(
+            origin_node,
+            destination_node,
+            max_time=max_time,
+            min_cashflow=min_cashflow,
+        )
+        if not frontier:
+            return None
+        return min(
+            frontier,
+            key=lambda option: time_weight * option["time"]
+            - cashflow_weight * option["cashflow"],
+        )
 
     def get_route_options(
         self, origin_node: Node, destination_node: Node
@@ -144,11 +1009,17 @@ class Graph:
         """
         Calculates route options between the specified origin and destination nodes.
 
+        Both options are the end points of the Pareto frontier found by a single search (see `get_pareto_paths`).
+
         Required Arguments:
 
         - origin_node (Node): The starting node for the route.
         - destination_node (Node): The ending node for the route.
 
+        Raises:
+
+        - ValueError: If the origin and destination nodes are not connected.
+
         Returns:
 
         - dict: A dictionary containing route options for minimum cashflow and minimum time paths, each with their respective path, time, and cashflow values.
@@ -168,21 +1039,109 @@ class Graph:
             }
             ```
         """
-        min_time_path = self.get_optimal_path(
-            origin_node, destination_node, "time"
-        )
-        min_cashflow_path = self.get_optimal_path(
-            origin_node, destination_node, "cashflow"
-        )
+        frontier = self.get_pareto_paths(origin_node, destination_node)
+        if not frontier:
+            raise ValueError(
+                "The origin and destination nodes are not connected in the graph"
+            )
         return {
-            "min_cashflow": {
-                "path": min_cashflow_path,
-                "time": self.get_path_weight(min_cashflow_path, "time"),
-                "cashflow": self.get_path_weight(min_cashflow_path, "cashflow"),
-            },
-            "min_time": {
-                "path": min_time_path,
-                "time": self.get_path_weight(min_time_path, "time"),
-                "cashflow": self.get_path_weight(min_time_path, "cashflow"),
-            },
+            "min_cashflow": frontier[-1],
+            "min_time": frontier[0],
         }
+
+    def get_route_options_batch(
+        self,
+        pairs: Iterable[tuple[Node, Node]],
+        workers: int | None = None,
+    ) -> Iterator[tuple[Node, Node, dict | None]]:
+        """
+        Calculates route options for many (origin, destination) node pairs, optionally across a pool of worker processes.
+
+        A read only copy of the CSR arrays of the graph (see `get_csr`) is taken once and sent to each worker process when the pool starts, not with each task.
+        Consecutive pairs with the same origin node are grouped into one task so that each group only needs one shortest path tree per graph type. Pairs should be ordered by origin to get the most reuse.
+        Results are yielded lazily in the same order as the pairs and only a bounded number of tasks is in flight at a time, so memory use does not grow with the number of pairs.
+
+        Edge weight changes made while the iterator is being consumed are not reflected in its results.
+
+        Required Arguments:
+
+        - pairs (Iterable[tuple[Node, Node]]): The (origin_node, destination_node) pairs to calculate route options for.
+
+        Optional Arguments:
+
+        - workers (int | None): The number of worker processes to use.
+            - If None or 1, route options are calculated in the current process.
+            - Default: None
+
+        Returns:
+
+        - Iterator[tuple[Node, Node, dict | None]]: Yields (origin_node, destination_node, route_options) for each pair.
+            - route_options has the same format as `get_route_options`, or is None if the destination node is not reachable from the origin node.
+        """
+        snapshot = {key: value[:] for key, value in self.__compact__().items()}
+        groups = (
+            (origin_node, [destination for _, destination in group])
+            for origin_node, group in groupby(pairs, key=lambda pair: pair[0])
+        )
+        if workers is None or workers <= 1:
+            for origin_node, destination_nodes in groups:
+                options = route_options_from_origin(
+                    snapshot,
+                    origin_node.inbound_graph_id,
+                    [node.inbound_graph_id for node in destination_nodes],
+                )
+                for destination_node, route_options in zip(
+                    destination_nodes, options
+                ):
+                    yield origin_node, destination_node, route_options
+            return
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_route_worker,
+            initargs=(snapshot,),
+        ) as executor:
+            pending = deque()
+            try:
+                for origin_node, destination_nodes in groups:
+                    pending.append(
+                        (
+                            origin_node,
+                            destination_nodes,
+                            executor.submit(
+                                route_options_task,
+                                origin_node.inbound_graph_id,
+                                [
+                                    node.inbound_graph_id
+                                    for node in destination_nodes
+                                ],
+                            ),
+                        )
+                    )
+                    # Keep a bounded number of tasks in flight
+                    while len(pending) > 2 * workers:
+                        yield from self.__batch_results__(*pending.popleft())
+                while pending:
+                    yield from self.__batch_results__(*pending.popleft())
+            finally:
+                executor.shutdown(cancel_futures=True)
+
+    def __batch_results__(
+        self, origin_node: Node, destination_nodes: list[Node], future
+    ) -> Iterator[tuple[Node, Node, dict | None]]:
+        """
+        An internal method to yield the results of a batch route options task.
+
+        Required Arguments:
+
+        - origin_node (Node): The origin node of the task.
+        - destination_nodes (list[Node]): The destination nodes of the task.
+        - future (Future): The future of the task.
+
+        Returns:
+
+        - Iterator[tuple[Node, Node, dict | None]]: Yields (origin_node, destination_node, route_options) for each destination node.
+        """
+        for destination_node, route_options in zip(
+            destination_nodes, future.result()
+        ):
+            yield origin_node, destination_node, route_options
@@ -0,0 +1,810 @@
+from array import array
+from bisect import bisect_right
+from copy import copy
+from scar_sim.entity import SimulationEntity
+from scar_sim.order import COMPLETED, ORDER_STATUSES, STARTED
+from scar_sim.sinks import HistorySink, SinkWriter
+from typing import Iterator, Literal
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HISTORY_COLUMNS = (
+    "__time__",
+    "__time_delta__",
+    "__order_id__",
+    "__current_obj_id__",
+    "__status__",
+    "__cashflow__",
+    "__meta_snapshot__",
+    "__prev__",
+    "__tails__",
+)
+"""The names of the typed array columns of a HistoryStore."""
+ROW_COLUMNS = HISTORY_COLUMNS[:-1] + ("__meta__",)
+"""The names of the columns of a HistoryStore that hold one value per row."""
+HISTORY_LEVELS = {
+    "full": tuple(range(len(ORDER_STATUSES))),
+    "summary": (STARTED, COMPLETED),
+    "none": (),
+}
+"""Maps each history level to the Order status codes it records."""
+
+
+class HistoryStore:
+    def __init__(
+        self,
+        metadata_mode: Literal["copy", "intern"] = "copy",
+        metadata_keys: list[str] | None = None,
+        level: Literal["full", "summary", "none"] = "full",
+        sink: HistorySink | None = None,
+        batch_size: int = 10000,
+        drop_completed: bool = False,
+    ):
+        """
+        Initializes a simulation wide, columnar store of Order history entries.
+
+        Each history entry is a row spread across typed arrays (time, time_delta, order_id, current_obj_id, status code and cashflow) plus metadata columns.
+        Rows of the same Order are chained together so that each Order's history can be read back without storing a list per Order.
+
+        Optional Arguments:
+
+        - metadata_mode (Literal['copy', 'intern']): How entity metadata is stored with each entry.
+            - 'copy': Each entry stores the dictionary returned by `entity.get_metadata(**order.inject_metadata())`.
+            - 'intern': Each entry stores only a reference to shared copies of the injected Order metadata and of a snapshot of the entity's metadata.
+                - A new snapshot is taken whenever the entity's metadata version changes (see `SimulationEntity.update_metadata`), so later changes do not rewrite earlier entries.
+                - Entity and injected metadata are joined when entries are read or exported.
+            - Default: 'copy'
+        - metadata_keys (list[str] | None): If provided, only these metadata keys are kept in the history.
+            - Default: None (keep all keys)
+        - level (Literal['full', 'summary', 'none']): Which Order status changes are recorded.
+            - 'full': Every status change (each hop of every Order).
+            - 'summary': Only the 'started' and 'completed' entries of each Order. The 'time_delta' of a 'completed' entry is then the Order's lead time. Per hop cashflows are not recorded (use `scar_sim.metrics.Metrics` for cashflow totals).
+            - 'none': No entries. Use `scar_sim.metrics.Metrics` for KPIs.
+            - Default: 'full'
+        - sink (HistorySink | None): If provided, entries are also streamed to this sink (see `scar_sim.sinks`) in batches while the simulation runs.
+            - Batches are written by a background thread, so the simulation only waits when the sink falls several batches behind.
+            - Call `close` when done to write the remaining entries and close the sink.
+            - Default: None (keep entries in memory only)
+        - batch_size (int): The number of new entries that triggers a flush to the sink.
+            - A batch is handed over when the next entry is recorded, so the cashflow an Order sets right after recording an entry is included. Cashflows changed after an entry was flushed are not written to the sink.
+            - Default: 10000
+        - drop_completed (bool): If True, the entries of completed Orders are removed from memory once they have been flushed, so memory stays bounded by the Orders in flight regardless of the horizon.
+            - Dropped Orders have an empty history and exports (`to_columns`, `iter_chunks` and so on) only include the entries still in memory.
+            - Requires a sink.
+            - Default: False
+
+        Raises:
+
+        - ValueError: If the metadata mode or history level is not recognized.
+        - ValueError: If drop_completed is set without a sink or batch_size is not positive.
+        """
+        if metadata_mode not in ("copy", "intern"):
+            raise ValueError(f"Unknown metadata mode: {metadata_mode}")
+        if level not in HISTORY_LEVELS:
+            raise ValueError(f"Unknown history level: {level}")
+        if drop_completed and sink is None:
+            raise ValueError("Completed Orders can only be dropped with a sink")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be a positive integer")
+        self.metadata_mode = metadata_mode
+        self.level = level
+        # Whether each Order status code is recorded at this level
+        self.__recorded__ = tuple(
+            code in HISTORY_LEVELS[level] for code in range(len(ORDER_STATUSES))
+        )
+        self.metadata_keys = (
+            tuple(metadata_keys) if metadata_keys is not None else None
+        )
+        self.__time__ = array("d")
+        self.__time_delta__ = array("d")
+        self.__order_id__ = array("q")
+        self.__current_obj_id__ = array("q")
+        self.__status__ = array("b")
+        self.__cashflow__ = array("d")
+        # Full metadata ('copy') or injected Order metadata ('intern')
+        self.__meta__ = []
+        # The entity metadata snapshot of each row (-1 when not interned)
+        self.__meta_snapshot__ = array("q")
+        self.__snapshots__ = []
+        # Maps entity ids to their (metadata version, snapshot index)
+        self.__snapshot_index__ = {}
+        # Shared copies of repeated injected metadata ('intern' mode)
+        self.__injected_index__ = {}
+        # The previous row of the same Order (-1 for the first row)
+        self.__prev__ = array("q")
+        # The latest row of each Order indexed by Order.order_id (-1 if none)
+        self.__tails__ = array("q")
+        # Rows recorded before a fork, shared with the forked stores (see `fork`)
+        self.__frozen__ = []
+        # The first row of each frozen segment and the number of frozen rows
+        self.__starts__ = []
+        self.__offset__ = 0
+        # Frozen segments whose cashflows this store already copied
+        self.__owned__ = set()
+        # True while the columns are read only memory views of a snapshot
+        self.__shared__ = False
+        # The background writer of the sink (None without a sink)
+        self.__writer__ = SinkWriter(sink) if sink is not None else None
+        self.__batch_size__ = batch_size
+        self.drop_completed = drop_completed
+        # The number of rows in memory that were already flushed
+        self.__flushed__ = 0
+        # Orders with rows in memory and Orders completed since the last flush ('drop_completed' only)
+        self.__open__ = set()
+        self.__completed__ = []
+
+    def __project__(self, metadata: dict) -> dict:
+        """
+        An internal method to keep only the configured metadata keys.
+
+        Required Arguments:
+
+        - metadata (dict): The metadata to project.
+
+        Returns:
+
+        - dict: The projected metadata. The input itself is returned when no projection is configured.
+        """
+        if self.metadata_keys is None:
+            return metadata
+        return {
+            key: metadata[key] for key in self.metadata_keys if key in metadata
+        }
+
+    def __intern_injected__(self, injected_metadata: dict) -> dict:
+        """
+        An internal method to share one dictionary between all rows with equal injected metadata.
+
+        Required Arguments:
+
+        - injected_metadata (dict): The injected Order metadata of a row.
+
+        Returns:
+
+        - dict: The shared (projected) dictionary. Metadata with unhashable values is projected but not shared.
+        """
+        try:
+            key = tuple(injected_metadata.items())
+            shared = self.__injected_index__.get(key)
+        except TypeError:
+            return self.__project__(injected_metadata)
+        if shared is None:
+            shared = self.__injected_index__[key] = self.__project__(
+                injected_metadata
+            )
+        return shared
+
+    def __snapshot__(self, entity: SimulationEntity) -> int:
+        """
+        An internal method to get the snapshot index of an entity's current metadata, taking a new snapshot if its metadata version changed.
+
+        Required Arguments:
+
+        - entity (SimulationEntity): The entity to snapshot.
+
+        Returns:
+
+        - int: The index of the snapshot in the snapshot table.
+        """
+        cached = self.__snapshot_index__.get(entity.id)
+        if cached is not None and cached[0] == entity.__metadata_version__:
+            return cached[1]
+        snapshot = len(self.__snapshots__)
+        self.__snapshots__.append(self.__project__(dict(entity.get_metadata())))
+        self.__snapshot_index__[entity.id] = (
+            entity.__metadata_version__,
+            snapshot,
+        )
+        return snapshot
+
+    def __len__(self) -> int:
+        return self.__offset__ + len(self.__time__)
+
+    def fork(self) -> "HistoryStore":
+        """
+        Creates a copy of the store that shares the entries recorded so far.
+
+        The rows recorded so far are frozen into a segment that both stores read but never extend, and each store records its later entries in new columns of its own, so neither sees the other's later entries.
+        Forking copies no rows, so N forks of a long history cost the new rows of each branch rather than N copies of the history.
+        Only the latest row of each Order and the metadata snapshot tables are copied per fork.
+        A store copies the cashflows of a frozen segment the first time it changes one of them (see `set_cashflow`), and merges its segments into new columns before dropping completed Orders (see `flush`).
+        The forked store does not write to the sink.
+
+        Returns:
+
+        - HistoryStore: The forked store.
+        """
+        if len(self.__time__):
+            self.__frozen__ = self.__frozen__ + [
+                {name: getattr(self, name) for name in ROW_COLUMNS}
+            ]
+            self.__starts__ = self.__starts__ + [self.__offset__]
+            self.__offset__ = len(self)
+            self.__new_rows__()
+        self.__owned__ = set()
+        forked = copy(self)
+        forked.__writer__ = None
+        forked.__new_rows__()
+        forked.__tails__ = array("q", self.__tails__)
+        for name in (
+            "__frozen__",
+            "__starts__",
+            "__owned__",
+            "__snapshots__",
+            "__snapshot_index__",
+            "__injected_index__",
+            "__open__",
+            "__completed__",
+        ):
+            setattr(forked, name, copy(getattr(self, name)))
+        return forked
+
+    def __new_rows__(self) -> None:
+        """
+        An internal method to start empty columns for the rows recorded from now on.
+
+        Returns:
+
+        - None
+        """
+        for name in ROW_COLUMNS:
+            column = getattr(self, name)
+            if name == "__meta__":
+                setattr(self, name, [])
+            elif isinstance(column, memoryview):
+                setattr(self, name, array(column.format))
+            else:
+                setattr(self, name, array(column.typecode))
+
+    def __locate__(self, row: int) -> tuple[dict, int]:
+        """
+        An internal method to find the columns that hold a row.
+
+        Required Arguments:
+
+        - row (int): The row index.
+
+        Returns:
+
+        - tuple[dict, int]: The columns by name (a frozen segment or the store's own attributes) and the index of the row in them.
+        """
+        if row >= self.__offset__:
+            return self.__dict__, row - self.__offset__
+        segment = bisect_right(self.__starts__, row) - 1
+        return self.__frozen__[segment], row - self.__starts__[segment]
+
+    def __column__(self, name: str, start: int = 0, stop: int | None = None):
+        """
+        An internal method to get a range of a row column across the frozen segments and the store's own rows.
+
+        Required Arguments:
+
+        - name (str): The column name. See `ROW_COLUMNS`.
+
+        Optional Arguments:
+
+        - start (int): The first row.
+            - Default: 0
+        - stop (int | None): The row after the last row.
+            - Default: None (the number of rows)
+
+        Returns:
+
+        - array | memoryview | list: The values of the rows. Without frozen segments this is the column itself for the full range.
+        """
+        column = getattr(self, name)
+        if not self.__frozen__:
+            return column if start == 0 and stop is None else column[start:stop]
+        stop = len(self) if stop is None else stop
+        if name == "__meta__":
+            values = []
+        elif isinstance(column, memoryview):
+            values = array(column.format)
+        else:
+            values = array(column.typecode)
+        for first, part in zip(
+            self.__starts__ + [self.__offset__],
+            [segment[name] for segment in self.__frozen__] + [column],
+        ):
+            if start < first + len(part) and first < stop:
+                values.extend(part[max(start - first, 0) : stop - first])
+        return values
+
+    def __thaw__(self) -> None:
+        """
+        An internal method to merge the frozen segments into new columns of the store's own.
+
+        Returns:
+
+        - None
+        """
+        if not self.__frozen__:
+            return
+        for name in ROW_COLUMNS:
+            setattr(self, name, self.__column__(name))
+        self.__frozen__ = []
+        self.__starts__ = []
+        self.__offset__ = 0
+        self.__owned__ = set()
+
+    def __own__(self) -> None:
+        """
+        An internal method to copy columns that are read only memory views of a snapshot (see `scar_sim.snapshot.read_snapshot`) into arrays before they are modified.
+
+        Metadata dictionaries are never modified after they are recorded, so they stay shared.
+
+        Returns:
+
+        - None
+        """
+        for name in HISTORY_COLUMNS:
+            column = getattr(self, name)
+            if isinstance(column, memoryview):
+                setattr(self, name, array(column.format, column))
+            else:
+                setattr(self, name, copy(column))
+        for name in (
+            "__meta__",
+            "__snapshots__",
+            "__snapshot_index__",
+            "__injected_index__",
+            "__open__",
+            "__completed__",
+        ):
+            setattr(self, name, copy(getattr(self, name)))
+        self.__shared__ = False
+
+    def __getstate__(self) -> dict:
+        # Sinks are not part of the simulation state and memory views can not be pickled, so store them as arrays
+        state = self.__dict__.copy()
+        state["__writer__"] = None
+        for name in HISTORY_COLUMNS:
+            column = state[name]
+            if isinstance(column, memoryview):
+                state[name] = array(column.format, column)
+        state["__frozen__"] = [
+            {
+                name: (
+                    array(column.format, column)
+                    if isinstance(column, memoryview)
+                    else column
+                )
+                for name, column in segment.items()
+            }
+            for segment in state["__frozen__"]
+        ]
+        return state
+
+    def add_order(self) -> int:
+        """
+        Registers a new Order with the store.
+
+        This is called by the Simulation when an Order is added and the returned index must match the Order's `order_id`.
+
+        Returns:
+
+        - int: The index of the registered Order.
+        """
+        if self.__shared__:
+            self.__own__()
+        self.__tails__.append(-1)
+        return len(self.__tails__) - 1
+
+    def add_orders(self, count: int) -> range:
+        """
+        Registers many new Orders with the store at once. See `add_order`.
+
+        Required Arguments:
+
+        - count (int): The number of Orders to register.
+
+        Returns:
+
+        - range: The indices of the registered Orders.
+        """
+        if self.__shared__:
+            self.__own__()
+        start = len(self.__tails__)
+        self.__tails__.extend(array("q", [-1]) * count)
+        return range(start, start + count)
+
+    def append(
+        self,
+        order_idx: int,
+        time: float,
+        time_delta: float,
+        order_id: int,
+        entity: SimulationEntity,
+        status: int,
+        injected_metadata: dict,
+        cashflow: float = 0.0,
+    ) -> int:
+        """
+        Records a history entry for an Order.
+
+        Required Arguments:
+
+        - order_idx (int): The `order_id` of the Order (its index in the Simulation's order list).
+        - time (float): The simulation time of the entry.
+        - time_delta (float): The time since the Order's previous entry.
+        - order_id (int): The simulation object id of the Order.
+        - entity (SimulationEntity): The entity the Order is at.
+        - status (int): The Order status code. See `scar_sim.order.ORDER_STATUSES`.
+        - injected_metadata (dict): The metadata injected by the Order (see `Order.inject_metadata`).
+
+        Optional Arguments:
+
+        - cashflow (float): The cashflow of the entry.
+            - Default: 0.0
+
+        Returns:
+
+        - int: The row index of the new entry.
+        """
+        if self.__writer__ is not None:
+            if len(self) - self.__flushed__ >= self.__batch_size__:
+                self.flush()
+            if self.drop_completed:
+                if status == COMPLETED:
+                    self.__completed__.append(order_idx)
+                self.__open__.add(order_idx)
+        if self.__shared__:
+            self.__own__()
+        row = len(self)
+        self.__time__.append(time)
+        self.__time_delta__.append(time_delta)
+        self.__order_id__.append(order_id)
+        self.__current_obj_id__.append(entity.id)
+        self.__status__.append(status)
+        self.__cashflow__.append(cashflow)
+        if self.metadata_mode == "intern":
+            self.__meta__.append(self.__intern_injected__(injected_metadata))
+            self.__meta_snapshot__.append(self.__snapshot__(entity))
+        else:
+            self.__meta__.append(
+                self.__project__(entity.get_metadata(**injected_metadata))
+            )
+            self.__meta_snapshot__.append(-1)
+        self.__prev__.append(self.__tails__[order_idx])
+        self.__tails__[order_idx] = row
+        return row
+
+    def set_cashflow(self, order_idx: int, cashflow: float) -> None:
+        """
+        Sets the cashflow of the most recent history entry of an Order in place.
+
+        Required Arguments:
+
+        - order_idx (int): The `order_id` of the Order.
+        - cashflow (float): The cashflow to set.
+
+        Raises:
+
+        - IndexError: If the Order has no history entries.
+
+        Returns:
+
+        - None
+        """
+        row = self.__tails__[order_idx]
+        if row < 0:
+            raise IndexError("Order has no history entries")
+        if row >= self.__offset__:
+            if self.__shared__:
+                self.__own__()
+            self.__cashflow__[row - self.__offset__] = cashflow
+            return
+        # Frozen segments are shared with forks, so copy their cashflows before the first change
+        segment = bisect_right(self.__starts__, row) - 1
+        if segment not in self.__owned__:
+            self.__frozen__[segment] = {
+                **self.__frozen__[segment],
+                "__cashflow__": array(
+                    "d", self.__frozen__[segment]["__cashflow__"]
+                ),
+            }
+            self.__owned__.add(segment)
+        self.__frozen__[segment]["__cashflow__"][
+            row - self.__starts__[segment]
+        ] = cashflow
+
+    def get_rows(self, order_idx: int) -> list[int]:
+        """
+        Returns the row indices of an Order's history entries in chronological order.
+
+        Required Arguments:
+
+        - order_idx (int): The `order_id` of the Order.
+
+        Returns:
+
+        - list[int]: The row indices of the Order's history entries.
+        """
+        rows = []
+        row = self.__tails__[order_idx]
+        prev = self.__prev__
+        offset = self.__offset__
+        while row >= 0:
+            rows.append(row)
+            if row >= offset:
+                row = prev[row - offset]
+            else:
+                columns, idx = self.__locate__(row)
+                row = columns["__prev__"][idx]
+        rows.reverse()
+        return rows
+
+    def get_meta(self, row: int) -> dict:
+        """
+        Builds the metadata dictionary of a row, joining the interned entity metadata snapshot with the injected Order metadata if needed.
+
+        Required Arguments:
+
+        - row (int): The row index.
+
+        Returns:
+
+        - dict: The metadata of the row.
+        """
+        columns, idx = self.__locate__(row)
+        snapshot = columns["__meta_snapshot__"][idx]
+        if snapshot < 0:
+            return columns["__meta__"][idx]
+        return {**self.__snapshots__[snapshot], **columns["__meta__"][idx]}
+
+    def get_row(self, row: int) -> dict:
+        """
+        Builds the history entry dictionary for a row.
+
+        Required Arguments:
+
+        - row (int): The row index.
+
+        Returns:
+
+        - dict: The history entry with 'time', 'time_delta', 'order_id', 'current_obj_id', 'meta', 'status' and 'cashflow' keys.
+        """
+        columns, idx = self.__locate__(row)
+        return {
+            "time": columns["__time__"][idx],
+            "time_delta": columns["__time_delta__"][idx],
+            "order_id": columns["__order_id__"][idx],
+            "current_obj_id": columns["__current_obj_id__"][idx],
+            "meta": self.get_meta(row),
+            "status": ORDER_STATUSES[columns["__status__"][idx]],
+            "cashflow": columns["__cashflow__"][idx],
+        }
+
+    def get_order_history(self, order_idx: int) -> list[dict]:
+        """
+        Builds the history entry dictionaries of an Order.
+
+        The dictionaries are built on each call, so modifying them does not change the store. Use `set_cashflow` to change cashflows.
+
+        Required Arguments:
+
+        - order_idx (int): The `order_id` of the Order.
+
+        Returns:
+
+        - list[dict]: The Order's history entries in chronological order.
+        """
+        return [self.get_row(row) for row in self.get_rows(order_idx)]
+
+    def to_columns(self) -> dict:
+        """
+        Exports all history entries as columns of python lists in the order they were recorded.
+
+        Returns:
+
+        - dict: A dictionary with 'time', 'time_delta', 'order_id', 'current_obj_id', 'meta', 'status' and 'cashflow' lists.
+        """
+        return self.__columns__(0, len(self))
+
+    def __columns__(self, start: int, stop: int) -> dict:
+        """
+        An internal method to build the columns of a range of rows.
+
+        Required Arguments:
+
+        - start (int): The first row.
+        - stop (int): The row after the last row.
+
+        Returns:
+
+        - dict: A dictionary with the same keys as `to_columns` holding the rows.
+        """
+        snapshots = self.__snapshots__
+        return {
+            "time": self.__column__("__time__", start, stop).tolist(),
+            "time_delta": self.__column__(
+                "__time_delta__", start, stop
+            ).tolist(),
+            "order_id": self.__column__("__order_id__", start, stop).tolist(),
+            "current_obj_id": self.__column__(
+                "__current_obj_id__", start, stop
+            ).tolist(),
+            "meta": [
+                meta if snapshot < 0 else {**snapshots[snapshot], **meta}
+                for snapshot, meta in zip(
+                    self.__column__("__meta_snapshot__", start, stop),
+                    self.__column__("__meta__", start, stop),
+                )
+            ],
+            "status": [
+                ORDER_STATUSES[code]
+                for code in self.__column__("__status__", start, stop)
+            ],
+            "cashflow": self.__column__("__cashflow__", start, stop).tolist(),
+        }
+
+    def iter_chunks(self, chunk_size: int = 100000) -> Iterator[dict]:
+        """
+        Yields all history entries as columns of python lists, a chunk of rows at a time, in the order they were recorded.
+
+        Only one chunk is materialized at a time, so this can be used to aggregate large histories with bounded memory.
+
+        Optional Arguments:
+
+        - chunk_size (int): The maximum number of rows per chunk.
+            - Default: 100000
+
+        Returns:
+
+        - Iterator[dict]: Dictionaries with the same keys as `to_columns` holding each chunk's rows.
+        """
+        for start in range(0, len(self), chunk_size):
+            yield self.__columns__(start, min(start + chunk_size, len(self)))
+
+    def flush(self) -> None:
+        """
+        Hands the entries recorded since the last flush to the sink's background writer and, with `drop_completed`, removes completed Orders from memory.
+
+        This is called automatically every `batch_size` entries and at the end of each `Simulation.run`. It does nothing without a sink.
+
+        Raises:
+
+        - Exception: Any error raised by the sink while writing an earlier batch.
+
+        Returns:
+
+        - None
+        """
+        if self.__writer__ is None:
+            return
+        if self.__shared__:
+            self.__own__()
+        if self.__flushed__ < len(self):
+            self.__writer__.submit(
+                self.__columns__(self.__flushed__, len(self))
+            )
+            self.__flushed__ = len(self)
+        if self.__completed__:
+            self.__drop__()
+
+    def __drop__(self) -> None:
+        """
+        An internal method to remove the (already flushed) rows of Orders completed since the last flush.
+
+        The remaining rows are moved to new columns and their chain links are renumbered. Frozen segments shared with forks are merged into the new columns first.
+
+        Returns:
+
+        - None
+        """
+        self.__thaw__()
+        tails = self.__tails__
+        dropped = set()
+        for order_idx in self.__completed__:
+            dropped.update(self.get_rows(order_idx))
+            tails[order_idx] = -1
+            self.__open__.discard(order_idx)
+        self.__completed__ = []
+        keep = [row for row in range(len(self)) if row not in dropped]
+        renumber = array("q", [-1]) * len(self)
+        for new_row, row in enumerate(keep):
+            renumber[row] = new_row
+        for name in (
+            "__time__",
+            "__time_delta__",
+            "__order_id__",
+            "__current_obj_id__",
+            "__status__",
+            "__cashflow__",
+            "__meta_snapshot__",
+        ):
+            column = getattr(self, name)
+            setattr(
+                self,
+                name,
+                array(column.typecode, [column[row] for row in keep]),
+            )
+        meta = self.__meta__
+        self.__meta__ = [meta[row] for row in keep]
+        prev = self.__prev__
+        self.__prev__ = array(
+            "q", [renumber[prev[row]] if prev[row] >= 0 else -1 for row in keep]
+        )
+        for order_idx in self.__open__:
+            tails[order_idx] = renumber[tails[order_idx]]
+        self.__flushed__ = len(keep)
+
+    def set_sink(self, sink: HistorySink) -> None:
+        """
+        Streams entries to a sink from now on, for example after restoring a simulation, since sinks are not part of the simulation state.
+
+        Entries already written to a previous sink are not written again.
+
+        Required Arguments:
+
+        - sink (HistorySink): The sink to write entries to.
+
+        Raises:
+
+        - ValueError: If the store already has a sink.
+
+        Returns:
+
+        - None
+        """
+        if self.__writer__ is not None:
+            raise ValueError("The history already has a sink")
+        self.__writer__ = SinkWriter(sink)
+
+    def close(self) -> None:
+        """
+        Flushes the remaining entries, waits for the background writer to write them and closes the sink. The store keeps working in memory afterwards.
+
+        Raises:
+
+        - Exception: Any error raised by the sink while writing.
+
+        Returns:
+
+        - None
+        """
+        if self.__writer__ is None:
+            return
+        self.flush()
+        writer = self.__writer__
+        self.__writer__ = None
+        writer.close()
+
+    def to_numpy(self) -> dict:
+        """
+        Exports the numeric history columns as NumPy arrays.
+
+        The arrays are copies so that the store can keep growing while they are in use.
+
+        Raises:
+
+        - ImportError: If NumPy is not installed.
+
+        Returns:
+
+        - dict: A dictionary with 'time', 'time_delta', 'order_id', 'current_obj_id', 'status_code' and 'cashflow' arrays and a 'status_names' tuple to decode 'status_code'.
+        """
+        if np is None:
+            raise ImportError("NumPy is required to export the history")
+        return {
+            "time": np.array(self.__column__("__time__"), dtype=np.float64),
+            "time_delta": np.array(
+                self.__column__("__time_delta__"), dtype=np.float64
+            ),
+            "order_id": np.array(
+                self.__column__("__order_id__"), dtype=np.int64
+            ),
+            "current_obj_id": np.array(
+                self.__column__("__current_obj_id__"), dtype=np.int64
+            ),
+            "status_code": np.array(
+                self.__column__("__status__"), dtype=np.int8
+            ),
+            "cashflow": np.array(
+                self.__column__("__cashflow__"), dtype=np.float64
+            ),
+            "status_names": ORDER_STATUSES,
+        }
@@ -0,0 +1,394 @@
+from bisect import insort
+from math import sqrt
+
+
+class Welford:
+    def __init__(self):
+        """
+        Initializes a streaming accumulator of the count, mean, variance, minimum and maximum of a series of values using Welford's algorithm.
+
+        Values are not stored, so memory use is constant no matter how many values are added.
+        """
+        self.count = 0
+        self.mean = 0.0
+        self.__m2__ = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value: float) -> None:
+        """
+        Adds a value to the accumulator.
+
+        Required Arguments:
+
+        - value (float): The value to add.
+
+        Returns:
+
+        - None
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.__m2__ += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: "Welford") -> None:
+        """
+        Adds all values of another accumulator to this one (for example to combine replications).
+
+        Required Arguments:
+
+        - other (Welford): The accumulator to merge in. It is not modified.
+
+        Returns:
+
+        - None
+        """
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.__m2__ += (
+            other.__m2__ + delta * delta * self.count * other.count / count
+        )
+        self.count = count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+
+    @property
+    def variance(self) -> float | None:
+        """
+        The sample variance of the added values (None with fewer than two values).
+        """
+        if self.count < 2:
+            return None
+        return self.__m2__ / (self.count - 1)
+
+    @property
+    def std(self) -> float | None:
+        """
+        The sample standard deviation of the added values (None with fewer than two values).
+        """
+        variance = self.variance
+        return None if variance is None else sqrt(variance)
+
+
+class P2Quantile:
+    def __init__(self, quantile: float):
+        """
+        Initializes a streaming estimator of a quantile using the P² algorithm of Jain and Chlamtac (1985).
+
+        Five markers are kept and adjusted with a piecewise parabolic fit as values are added, so memory use is constant. The estimate is exact for up to five values.
+
+        Required Arguments:
+
+        - quantile (float): The quantile to estimate, between 0 and 1.
+
+        Raises:
+
+        - ValueError: If the quantile is not between 0 and 1.
+        """
+        if not 0 <= quantile <= 1:
+            raise ValueError("quantile must be between 0 and 1")
+        self.quantile = quantile
+        self.count = 0
+        # Marker heights, actual positions, desired positions and desired position increments
+        self.__heights__ = []
+        self.__positions__ = [1, 2, 3, 4, 5]
+        self.__desired__ = [
+            1,
+            1 + 2 * quantile,
+            1 + 4 * quantile,
+            3 + 2 * quantile,
+            5,
+        ]
+        self.__increments__ = [0, quantile / 2, quantile, (1 + quantile) / 2, 1]
+
+    def add(self, value: float) -> None:
+        """
+        Adds a value to the estimator.
+
+        Required Arguments:
+
+        - value (float): The value to add.
+
+        Returns:
+
+        - None
+        """
+        self.count += 1
+        heights = self.__heights__
+        if self.count <= 5:
+            insort(heights, value)
+            return
+        positions = self.__positions__
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+        for idx in range(cell + 1, 5):
+            positions[idx] += 1
+        desired = self.__desired__
+        for idx, increment in enumerate(self.__increments__):
+            desired[idx] += increment
+        for idx in (1, 2, 3):
+            offset = desired[idx] - positions[idx]
+            if (offset >= 1 and positions[idx + 1] - positions[idx] > 1) or (
+                offset <= -1 and positions[idx - 1] - positions[idx] < -1
+            ):
+                step = 1 if offset > 0 else -1
+                height = self.__parabolic__(idx, step)
+                if not heights[idx - 1] < height < heights[idx + 1]:
+                    height = heights[idx] + step * (
+                        heights[idx + step] - heights[idx]
+                    ) / (positions[idx + step] - positions[idx])
+                heights[idx] = height
+                positions[idx] += step
+
+    def __parabolic__(self, idx: int, step: int) -> float:
+        """
+        An internal method to compute the piecewise parabolic (P²) prediction of a marker height after moving it by one position.
+
+        Required Arguments:
+
+        - idx (int): The marker to move (1 to 3).
+        - step (int): The direction to move it in (1 or -1).
+
+        Returns:
+
+        - float: The predicted height.
+        """
+        heights = self.__heights__
+        positions = self.__positions__
+        return heights[idx] + step / (
+            positions[idx + 1] - positions[idx - 1]
+        ) * (
+            (positions[idx] - positions[idx - 1] + step)
+            * (heights[idx + 1] - heights[idx])
+            / (positions[idx + 1] - positions[idx])
+            + (positions[idx + 1] - positions[idx] - step)
+            * (heights[idx] - heights[idx - 1])
+            / (positions[idx] - positions[idx - 1])
+        )
+
+    @property
+    def value(self) -> float | None:
+        """
+        The current quantile estimate (None if no values were added).
+        """
+        if self.count == 0:
+            return None
+        if self.count <= 5:
+            # Linear interpolation between the closest ranks
+            heights = self.__heights__
+            rank = self.quantile * (len(heights) - 1)
+            lower = int(rank)
+            upper = min(lower + 1, len(heights) - 1)
+            return heights[lower] + (rank - lower) * (
+                heights[upper] - heights[lower]
+            )
+        return self.__heights__[2]
+
+
+class StreamingStats:
+    def __init__(self, quantiles: tuple[float, ...] = (0.5, 0.9, 0.95)):
+        """
+        Initializes a streaming accumulator of summary statistics (see `Welford`) and quantile estimates (see `P2Quantile`) of a series of values.
+
+        Optional Arguments:
+
+        - quantiles (tuple[float, ...]): The quantiles to estimate.
+            - Default: (0.5, 0.9, 0.95)
+        """
+        self.moments = Welford()
+        """The count, mean, variance, minimum and maximum of the values."""
+        self.quantiles = {
+            quantile: P2Quantile(quantile) for quantile in quantiles
+        }
+        """The quantile estimators keyed by quantile."""
+
+    def add(self, value: float) -> None:
+        """
+        Adds a value to all accumulators.
+
+        Required Arguments:
+
+        - value (float): The value to add.
+
+        Returns:
+
+        - None
+        """
+        self.moments.add(value)
+        for estimator in self.quantiles.values():
+            estimator.add(value)
+
+    def summary(self) -> dict:
+        """
+        Returns the current statistics.
+
+        Returns:
+
+        - dict: A dictionary with 'count', 'mean', 'std', 'min' and 'max' keys and a 'p<percent>' key per quantile (for example 'p95' for 0.95).
+        """
+        moments = self.moments
+        return {
+            "count": moments.count,
+            "mean": moments.mean if moments.count else None,
+            "std": moments.std,
+            "min": moments.min,
+            "max": moments.max,
+            **{
+                f"p{quantile * 100:g}": estimator.value
+                for quantile, estimator in self.quantiles.items()
+            },
+        }
+
+
+class Metrics:
+    def __init__(
+        self,
+        group_keys: list[str] | None = None,
+        quantiles: tuple[float, ...] = (0.5, 0.9, 0.95),
+    ):
+        """
+        Initializes a collector of online KPIs that Orders update as they progress, without needing the Order history.
+
+        The following KPIs are collected:
+
+        - Total cashflow, per entity `cashflow_key` (for example 'node_cashflow' and 'arc_cashflow') and per entity id.
+        - Lead time (from `Order.start` to completion) statistics and quantile estimates per group.
+        - On time rate per group, for Orders with a `due_time`.
+
+        Groups are lanes (the origin and destination Node ids of the Order), optionally split further by values of the Order's injected metadata (see `Order.inject_metadata`).
+
+        Optional Arguments:
+
+        - group_keys (list[str] | None): Keys of the Order's injected metadata that further split each lane into groups. Missing keys group as None.
+            - Default: None (group by lane only)
+        - quantiles (tuple[float, ...]): The lead time quantiles to estimate.
+            - Default: (0.5, 0.9, 0.95)
+        """
+        self.group_keys = tuple(group_keys) if group_keys is not None else ()
+        self.quantiles = tuple(quantiles)
+        self.cashflow = 0.0
+        """The total cashflow of all Orders."""
+        self.cashflow_by_key = {}
+        """The total cashflow per entity `cashflow_key`."""
+        self.cashflow_by_entity = {}
+        """The total cashflow per entity id."""
+        self.lead_times = {}
+        """The lead time statistics (see `StreamingStats`) per group."""
+        self.on_time = {}
+        """The [completed Orders with a due time, Orders completed on time] counts per group."""
+
+    def get_group(self, order) -> tuple:
+        """
+        Returns the group key of an Order.
+
+        Required Arguments:
+
+        - order (Order): The Order.
+
+        Returns:
+
+        - tuple: The origin Node id, the destination Node id and the values of the configured group keys in the Order's injected metadata.
+        """
+        group = (order.origin_node.id, order.destination_node.id)
+        if self.group_keys:
+            metadata = order.inject_metadata()
+            group += tuple(metadata.get(key) for key in self.group_keys)
+        return group
+
+    def record_cashflow(self, entity, cashflow: float) -> None:
+        """
+        Records a cashflow of an Order at an entity. Called by `Order.set_current_cashflow` with the change to the cashflow of the Order's current history entry, so setting an entry's cashflow twice only counts its last value.
+
+        Required Arguments:
+
+        - entity (SimulationEntity): The entity the cashflow was incurred at.
+        - cashflow (float): The cashflow.
+
+        Returns:
+
+        - None
+        """
+        self.cashflow += cashflow
+        key = entity.cashflow_key
+        self.cashflow_by_key[key] = (
+            self.cashflow_by_key.get(key, 0.0) + cashflow
+        )
+        self.cashflow_by_entity[entity.id] = (
+            self.cashflow_by_entity.get(entity.id, 0.0) + cashflow
+        )
+
+    def record_completion(self, order, time: float) -> None:
+        """
+        Records the completion of an Order. Called by the Order when it completes.
+
+        Required Arguments:
+
+        - order (Order): The completed Order.
+        - time (float): The completion time.
+
+        Returns:
+
+        - None
+        """
+        group = self.get_group(order)
+        stats = self.lead_times.get(group)
+        if stats is None:
+            stats = self.lead_times[group] = StreamingStats(self.quantiles)
+        stats.add(time - order.start_time)
+        if order.due_time is not None:
+            counts = self.on_time.get(group)
+            if counts is None:
+                counts = self.on_time[group] = [0, 0]
+            counts[0] += 1
+            counts[1] += time <= order.due_time
+
+    def summary(self) -> dict:
+        """
+        Returns the current KPIs.
+
+        Returns:
+
+        - dict: A dictionary with the following keys.
+            - 'cashflow': The total cashflow.
+            - 'cashflow_by_key': The total cashflow per entity `cashflow_key`.
+            - 'cashflow_by_entity': The total cashflow per entity id.
+            - 'lead_time': The lead time statistics (see `StreamingStats.summary`) per group.
+            - 'on_time_rate': The share of completed Orders with a due time that completed on time per group, plus the overall rate under 'all' (None if there are no such Orders).
+        """
+        due = sum(counts[0] for counts in self.on_time.values())
+        return {
+            "cashflow": self.cashflow,
+            "cashflow_by_key": dict(self.cashflow_by_key),
+            "cashflow_by_entity": dict(self.cashflow_by_entity),
+            "lead_time": {
+                group: stats.summary()
+                for group, stats in self.lead_times.items()
+            },
+            "on_time_rate": {
+                **{
+                    group: counts[1] / counts[0]
+                    for group, counts in self.on_time.items()
+                },
+                "all": (
+                    sum(counts[1] for counts in self.on_time.values()) / due
+                    if due
+                    else None
+                ),
+            },
+        }
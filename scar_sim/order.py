@@ -1,4 +1,13 @@
-from scar_sim.entity import Arc, Node, SimulationObject
+from scar_sim.entity import Node, SimulationObject
+from typing import Literal
+
+ORDER_STATUSES = ("started", "shipped", "arrived", "completed")
+"""The Order lifecycle statuses. The index of each status is its integer status code."""
+STARTED, SHIPPED, ARRIVED, COMPLETED = range(len(ORDER_STATUSES))
+ORDER_STATUS_CODES = {
+    status: code for code, status in enumerate(ORDER_STATUSES)
+}
+"""Maps each Order status name to its integer status code."""
 
 
 class Order(SimulationObject):
@@ -8,6 +17,8 @@ class Order(SimulationObject):
         destination_node: Node,
         units: int,
         planned_path: list[int],
+        stream_key: str | None = None,
+        due_time: float | None = None,
     ):
         """
         Initializes an Order object representing a shipment from an origin to a destination.
@@ -18,25 +29,69 @@ class Order(SimulationObject):
         - destination_node (Node): The ending node for the order.
         - units (int): The number of units in the order.
         - planned_path (list[int]): The planned path for the order as a list of graph IDs.
+
+        Optional Arguments:
+
+        - stream_key (str | None): A stable key for the Order's random stream when the Simulation uses per-order random streams.
+            - Default: None (use the Order's order_id)
+        - due_time (float | None): The simulation time by which the Order should be completed. Used for the on time rate of the Simulation's metrics (see `scar_sim.metrics.Metrics`).
+            - Default: None
         """
         super().__init__()
         self.origin_node = origin_node
         self.destination_node = destination_node
         self.units = units
-
-        # History of the Order's progress
-        self.history = []
+        self.order_id = None
+        """The index of the Order in the Simulation's order list. Set when the Order is added to a Simulation."""
+        self.stream_key = stream_key
+        self.due_time = due_time
+        self.start_time = None
+        """The simulation time the Order was started. Set by `start`."""
 
         # Simulation and miscellaneous state
         self.__simulation__ = None
         self.__current_object__ = self.origin_node
         self.__started__ = False
         self.__prev_time__ = 0.0
+        # Whether the Order's latest status was recorded in the history (see the Simulation history_level)
+        self.__recorded__ = False
+        # The cashflow last set for the Order's latest status, so metrics only record the change when it is set again
+        self.__entry_cashflow__ = 0.0
+        # Whether consider_reroute is overridden and must be called at each Node (refined by `__detect_reroutes__` when the Order is added to a Simulation)
+        self.__detect_reroutes__()
 
         # Note: Planned path is in terms of graph IDs and not in terms of simulation ids
         self.__set_planned_path__(planned_path, initial=True)
         self.__current_path_idx__ = 0
 
+    def __detect_reroutes__(self) -> None:
+        """
+        An internal method to detect whether `consider_reroute` is overridden on the class or the instance, so Orders that never reroute can skip calling it at each Node.
+
+        This is called when the Order is created and again when it is added to a Simulation. Overrides set on the instance after that are not detected.
+
+        Returns:
+
+        - None
+        """
+        self.__reroutes__ = (
+            "consider_reroute" in self.__dict__
+            or self.__class__.consider_reroute is not Order.consider_reroute
+        )
+
+    @property
+    def history(self) -> list[dict]:
+        """
+        The history of the Order's progress as a list of entry dictionaries.
+
+        Entries are stored in the Simulation's `HistoryStore` and the dictionaries are built each time this is accessed.
+        Modifying them does not change the stored history. Use `set_current_cashflow` to change cashflows.
+        If the Simulation drops completed Orders from its history (see `Simulation` `history_drop_completed`), this is empty once the Order's entries were flushed.
+        """
+        if self.__simulation__ is None:
+            return []
+        return self.__simulation__.history.get_order_history(self.order_id)
+
     def start(self) -> None:
         """
         Starts the Order's processing within the simulation.
@@ -52,20 +107,33 @@ class Order(SimulationObject):
         if self.__started__:
             raise ValueError("Order has already been started")
         self.__started__ = True
-        self.__prev_time__ = self.__simulation__.current_time()
-        self.__next__(status="started")
+        self.start_time = self.__prev_time__ = (
+            self.__simulation__.current_time()
+        )
+        self.__next__(STARTED)
 
     def set_current_cashflow(self, cashflow: int | float) -> None:
         """
         Sets the cashflow for the most recent history entry of the Order.
 
+        The cashflow is written into the Simulation's history store in place (unless the Simulation's history level skips the entry) and recorded by the Simulation's metrics, if any.
+        Setting the cashflow again for the same entry replaces it, so the metrics only record the difference to the previously set cashflow.
+
         While designed to be used internally, this method can be overridden for custom cashflow handling.
 
         Required Arguments:
 
         - cashflow (int | float): The cashflow amount to set for the current history entry.
         """
-        self.history[-1]["cashflow"] = cashflow
+        simulation = self.__simulation__
+        if simulation.metrics is not None:
+            # The history keeps the last cashflow set for an entry, so only the change is added to the metrics
+            simulation.metrics.record_cashflow(
+                self.__current_object__, cashflow - self.__entry_cashflow__
+            )
+        self.__entry_cashflow__ = cashflow
+        if self.__recorded__:
+            simulation.history.set_cashflow(self.order_id, cashflow)
 
     def inject_metadata(self) -> dict:
         """
@@ -91,6 +159,43 @@ class Order(SimulationObject):
         """
         return (False, list())
 
+    def get_reroute_path(
+        self,
+        graph: Literal["cashflow", "time"] = "time",
+        k: int = 3,
+        exclude_entity_ids: set | frozenset | None = None,
+    ) -> list[int] | None:
+        """
+        Builds a new planned path from the Order's current Node to its destination using the cached alternative route sets of the graph (see `Graph.get_alternative_path`).
+
+        This is designed to be called from an overridden `consider_reroute` and does not run a new path search once the route set for the current lane is cached.
+
+        Optional Arguments:
+
+        - graph (Literal['cashflow', 'time']): The type of graph to use for path comparison.
+            - Default: 'time'
+        - k (int): The maximum number of alternative paths considered.
+            - Default: 3
+        - exclude_entity_ids (set | frozenset | None): Simulation ids of Nodes and Arcs the new path may not use.
+            - Default: None
+
+        Returns:
+
+        - list[int] | None: The full planned path (the path travelled so far followed by the best alternative), or None if no alternative avoids the excluded entities.
+        """
+        alternative = self.__simulation__.graph.get_alternative_path(
+            self.__current_object__,
+            self.destination_node,
+            graph,
+            k=k,
+            exclude_entity_ids=exclude_entity_ids,
+        )
+        if alternative is None:
+            return None
+        return (
+            self.__planned_path__[: self.__current_path_idx__] + alternative[1:]
+        )
+
     def __set_planned_path__(
         self, planned_path: list[int], initial=False
     ) -> None:
@@ -128,16 +233,35 @@ class Order(SimulationObject):
             planned_path[-1] == self.destination_node.inbound_graph_id
         ), "Planned path must end at destination node"
         self.__planned_path__ = planned_path
+        # The itinerary is compiled from the new path when it is next needed
+        self.__itinerary__ = None
 
-    def __next__(self, status: str) -> None:
+    def __compile_itinerary__(self) -> list[tuple]:
+        """
+        An internal method to compile the planned path into the itinerary of the Order (see `Graph.get_itinerary`).
+
+        The itinerary is compiled when first needed and again after each reroute.
+
+        Returns:
+
+        - list[tuple]: The (Arc, Node) steps of the planned path.
+        """
+        self.__itinerary__ = self.__simulation__.graph.get_itinerary(
+            self.__planned_path__
+        )
+        return self.__itinerary__
+
+    def __next__(self, status: int | str) -> None:
         """
         An internal method to progress the Order to the next status in its lifecycle.
 
         This method is expected to be stored as an event in the simulation's event queue and fired off at the appropriate times.
+        Events are scheduled with the integer status code so they can be dispatched without building keyword arguments.
+        Arcs are taken from the compiled itinerary of the planned path, Node hooks that are not overridden are skipped, and the Order completes as part of its final arrival without a separate event.
 
         Required Arguments:
 
-        - status (str): The current status of the Order. Must be one of "started", "shipped", "arrived", or "completed".
+        - status (int | str): The current status of the Order as a status code (see `ORDER_STATUS_CODES`) or name. Must be one of "started", "shipped", "arrived", or "completed".
 
         Raises:
 
@@ -147,104 +271,137 @@ class Order(SimulationObject):
 
         - None
         """
-        # Log this item into the Order history
-        self.history.append(
-            {
-                "time": self.__simulation__.current_time(),
-                "time_delta": round(
-                    self.__simulation__.current_time() - self.__prev_time__, 3
-                ),
-                "order_id": self.id,
-                "current_obj_id": self.__current_object__.id,
-                "meta": self.__current_object__.get_metadata(
-                    **self.inject_metadata()
-                ),
-                "status": status,
-                "cashflow": 0.0,
-            }
-        )
+        if status.__class__ is str:
+            if status not in ORDER_STATUS_CODES:
+                raise ValueError(f"Unknown status: {status}")
+            status = ORDER_STATUS_CODES[status]
+        elif not 0 <= status < len(ORDER_STATUSES):
+            raise ValueError(f"Unknown status: {status}")
+        # Log this item into the Order history if the history level records the status
+        current_time = self.__simulation__.current_time()
+        history = self.__simulation__.history
+        self.__recorded__ = history.__recorded__[status]
+        self.__entry_cashflow__ = 0.0
+        if self.__recorded__:
+            history.append(
+                self.order_id,
+                current_time,
+                round(current_time - self.__prev_time__, 3),
+                self.id,
+                self.__current_object__,
+                status,
+                self.inject_metadata(),
+            )
+            self.__prev_time__ = current_time
         self.__current_path_idx__ += 1
-        self.__prev_time__ = self.__simulation__.current_time()
-
-        if status == "started":
-            # Validate that we are at a Node that can process orders
-            if not isinstance(self.__current_object__, Node):
-                raise ValueError("Current object must be a Node when started")
-            # Perform any logic at the origin node to process the order (i.e., remove from capacity)
-            self.__current_object__.order_placed(self)
-            # Set up for shipping
-            next_status = "shipped"
-        elif status == "shipped":
-            # If the current object is a Node, we need to ship the order (i.e., remove from inventory)
-            if isinstance(self.__current_object__, Node):
-                self.__current_object__.order_shipped(self)
 
+        if status == SHIPPED:
+            node = self.__current_object__
+            # The Order is done being processed at the Node
+            if node.__constrained__:
+                node.__release__()
+            # Perform any logic at the Node to ship the order (i.e., remove from inventory)
+            if node.__hooks__[SHIPPED]:
+                node.order_shipped(self)
             # Pay for processing an order when it is shipped from a node
-            self.set_current_cashflow(
-                self.__current_object__.get_cashflow(units=self.units)
-            )
-            # Given the planned path, set the current object to the next planned Arc
-            next_graph_id = self.__planned_path__[self.__current_path_idx__]
-            self.__current_object__ = self.__simulation__.graph.arc_obj_graph[
-                self.__current_object__.outbound_graph_id
-            ][next_graph_id]
-            # Determine the next node given this arc (allowing for symmetic arcs)
-            if (
-                self.__current_object__.origin_node.inbound_graph_id
-                == next_graph_id
-            ):
-                self.__next_node__ = self.__current_object__.origin_node
-            else:
-                self.__next_node__ = self.__current_object__.destination_node
-            next_status = "arrived"
-        elif status == "arrived":
-            if not isinstance(self.__current_object__, Arc):
-                raise ValueError("Current object must be an Arc when arriving")
+            self.set_current_cashflow(node.get_cashflow(units=self.units))
+            # Move onto the next Arc of the compiled itinerary (allowing for symmetric arcs)
+            itinerary = self.__itinerary__
+            if itinerary is None:
+                itinerary = self.__compile_itinerary__()
+            self.__current_object__, self.__next_node__ = itinerary[
+                (self.__current_path_idx__ >> 1) - 1
+            ]
+            if self.__current_object__.__consolidates__:
+                # The arc schedules the arrival of the whole shipment the Order joins
+                self.__current_object__.__consolidate__(self)
+                return
+            next_status = ARRIVED
+        elif status == ARRIVED:
+            # The Order is done being processed on the Arc (shipments release the Arc themselves)
+            arc = self.__current_object__
+            if arc.__constrained__ and not arc.__consolidates__:
+                arc.__release__()
             # Pay for the transportation when a unit arrives at the destination node
             self.set_current_cashflow(
                 self.__current_object__.get_cashflow(units=self.units)
             )
             # Set the current object to the next Node (supports symmetric arcs)
-            self.__current_object__ = self.__next_node__
-            if not isinstance(self.__current_object__, Node):
-                raise ValueError("Next object must be a Node when arriving")
+            node = self.__current_object__ = self.__next_node__
             # Consider rerouting the order
-            should_reroute, new_path = self.consider_reroute()
-            if should_reroute:
-                self.__set_planned_path__(new_path)
-            if isinstance(self.__current_object__, Node):
-                # Only fire off the order arrived event if we are at a Node and a reroute has not changed the path away from this Node
-                # Fire off the order arrived event at the Node for processing (i.e., add to inventory)
-                if len(self.__planned_path__) == self.__current_path_idx__:
-                    # We are at the end of the path
-                    self.__current_object__.order_arrived(self)
-                elif (
-                    self.__planned_path__[self.__current_path_idx__ + 1]
-                    == self.__current_object__.outbound_graph_id
-                ):
-                    self.__current_object__.order_arrived(self)
-            next_status = (
-                "completed"
-                if self.__current_object__.id == self.destination_node.id
-                else "shipped"
-            )
-        elif status == "completed":
+            if self.__reroutes__:
+                should_reroute, new_path = self.consider_reroute()
+                if should_reroute:
+                    self.__set_planned_path__(new_path)
+            # Only fire off the order arrived event if a reroute has not changed the path away from this Node
+            # Fire off the order arrived event at the Node for processing (i.e., add to inventory)
+            if node.__hooks__[ARRIVED] and (
+                len(self.__planned_path__) == self.__current_path_idx__
+                or self.__planned_path__[self.__current_path_idx__ + 1]
+                == node.outbound_graph_id
+            ):
+                node.order_arrived(self)
+            if node is self.destination_node:
+                # Complete the Order as part of its final arrival instead of scheduling a zero delay event
+                self.__next__(COMPLETED)
+                return
+            next_status = SHIPPED
+        elif status == STARTED:
+            # Validate that we are at a Node that can process orders
+            if not isinstance(self.__current_object__, Node):
+                raise ValueError("Current object must be a Node when started")
+            # Perform any logic at the origin node to process the order (i.e., remove from capacity)
+            if self.__current_object__.__hooks__[STARTED]:
+                self.__current_object__.order_placed(self)
+            # Set up for shipping
+            next_status = SHIPPED
+        elif status == COMPLETED:
             # Validate that we are at a Node that can receive Orders
             if not isinstance(self.__current_object__, Node):
                 raise ValueError("Current object must be a Node when completed")
             # Fire off the order completed event at the Node for processing (i.e., add to capacity)
-            self.__current_object__.order_completed(self)
+            if self.__current_object__.__hooks__[COMPLETED]:
+                self.__current_object__.order_completed(self)
+            if self.__simulation__.metrics is not None:
+                self.__simulation__.metrics.record_completion(
+                    self, current_time
+                )
+            self.__simulation__.__release_order_stream__(self)
             # When called with "completed", we do not schedule any further events
             return
         else:
             raise ValueError(f"Unknown status: {status}")
 
+        # Wait in line if every server of a capacity constrained entity is busy
+        entity = self.__current_object__
+        if entity.__constrained__ and not entity.__acquire__(
+            self, self.__serve__, next_status
+        ):
+            return
+        self.__serve__(next_status)
+
+    def __serve__(self, next_status: int) -> None:
+        """
+        An internal method to start processing the Order at its current entity, scheduling its next status once the entity's service time has passed.
+
+        This is called when the Order gets to an entity and, for entities with a capacity, when a server frees up for the waiting Order.
+
+        Required Arguments:
+
+        - next_status (int): The status code of the Order once it is processed.
+
+        Returns:
+
+        - None
+        """
+        # Draws made while the Order is active use its stream in per-order random stream mode
+        self.__simulation__.__active_order__ = self
+        try:
+            time_delta = self.__current_object__.get_service_time(self.units)
+        finally:
+            self.__simulation__.__active_order__ = None
         self.__simulation__.add_event(
-            time_delta=(
-                self.__current_object__.get_processing_time()
-                if next_status != "completed"
-                else 0.0
-            ),
+            time_delta=time_delta,
             func=self.__next__,
-            kwargs={"status": next_status},
+            code=next_status,
         )
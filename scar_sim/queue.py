@@ -1,25 +1,412 @@
-from heapq import heappop, heappush
+from abc import ABC, abstractmethod
+from bisect import insort
+from heapq import heapify, heappop, heappush, nsmallest
+from typing import Literal
 from scar_sim.utils import hard_round
+from scar_sim.event_log import EventLog
+
+
+class QueueBackend(ABC):
+    """
+    The interface that event queue backends implement.
+
+    Backends must implement `push`, `pop`, `peek`, `entries`, `rebuild` and `__len__`. `push_many` and `pop_due` have default implementations that backends can override to be faster.
+
+    Entries are `(time, seq, event)` tuples where `seq` is unique per entry. Backends must always return the smallest entry first so that events at the same time are processed in the order they were scheduled.
+    """
+
+    @abstractmethod
+    def push(self, entry: tuple) -> None:
+        """
+        Adds an entry to the backend.
+
+        Required Arguments:
+
+        - entry (tuple): A (time, seq, event) entry.
+        """
+
+    def push_many(self, entries: list[tuple]) -> None:
+        """
+        Adds many entries to the backend at once.
+
+        Backends can override this to bulk load entries faster than pushing them one at a time.
+
+        Required Arguments:
+
+        - entries (list[tuple]): The (time, seq, event) entries to add.
+        """
+        for entry in entries:
+            self.push(entry)
+
+    @abstractmethod
+    def pop(self) -> tuple:
+        """
+        Removes and returns the smallest entry.
+
+        Raises:
+
+        - IndexError: If the backend is empty.
+        """
+
+    @abstractmethod
+    def peek(self) -> tuple:
+        """
+        Returns the smallest entry without removing it.
+
+        Raises:
+
+        - IndexError: If the backend is empty.
+        """
+
+    def pop_due(self, max_time: float) -> tuple | None:
+        """
+        Removes and returns the smallest entry if its time is at or before max_time.
+
+        Required Arguments:
+
+        - max_time (float): The latest time an entry may have to be returned.
+
+        Returns:
+
+        - tuple | None: The smallest entry, or None if the backend is empty or the smallest entry is after max_time.
+        """
+        if len(self) and self.peek()[0] <= max_time:
+            return self.pop()
+        return None
+
+    @abstractmethod
+    def entries(self) -> list[tuple]:
+        """
+        Returns all stored entries in no particular order.
+        """
+
+    @abstractmethod
+    def rebuild(self, entries: list[tuple]) -> None:
+        """
+        Replaces all stored entries with the provided entries.
+
+        Required Arguments:
+
+        - entries (list[tuple]): The (time, seq, event) entries to keep.
+        """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """
+        Returns the number of stored entries.
+        """
+
+
+class HeapBackend(QueueBackend):
+    def __init__(self):
+        """
+        A binary heap backend with O(log n) pushes and pops.
+        """
+        self.__heap__ = []
+
+    def push(self, entry: tuple) -> None:
+        heappush(self.__heap__, entry)
+
+    def push_many(self, entries: list[tuple]) -> None:
+        heap = self.__heap__
+        # A single O(n) heapify beats O(k log n) pushes unless the batch is small
+        if 8 * len(entries) < len(heap):
+            for entry in entries:
+                heappush(heap, entry)
+        else:
+            heap.extend(entries)
+            heapify(heap)
+
+    def pop(self) -> tuple:
+        return heappop(self.__heap__)
+
+    def peek(self) -> tuple:
+        return self.__heap__[0]
+
+    def pop_due(self, max_time: float) -> tuple | None:
+        heap = self.__heap__
+        if heap and heap[0][0] <= max_time:
+            return heappop(heap)
+        return None
+
+    def entries(self) -> list[tuple]:
+        return list(self.__heap__)
+
+    def rebuild(self, entries: list[tuple]) -> None:
+        self.__heap__ = list(entries)
+        heapify(self.__heap__)
+
+    def __len__(self) -> int:
+        return len(self.__heap__)
+
+
+class CalendarBackend(QueueBackend):
+    def __init__(self, bucket_count: int = 2, bucket_width: float = 1.0):
+        """
+        An adaptive calendar queue (bucketed timing wheel) backend with amortized O(1) pushes and pops when event times are tightly clustered.
+
+        Each entry is stored in the bucket `floor(time / bucket_width) % bucket_count`, kept sorted within the bucket.
+        The calendar doubles or halves its bucket count as the number of entries grows or shrinks, re-estimating the bucket width from the spacing of the earliest entries each time.
+
+        Optional Arguments:
+
+        - bucket_count (int): The initial number of buckets.
+            - Default: 2
+        - bucket_width (float): The initial time span covered by each bucket.
+            - Default: 1.0
+        """
+        self.__size__ = 0
+        self.__min_bucket_count__ = max(int(bucket_count), 1)
+        self.__resize__(self.__min_bucket_count__, bucket_width, [])
+
+    def __resize__(
+        self, bucket_count: int, bucket_width: float, entries: list[tuple]
+    ) -> None:
+        """
+        An internal method to redistribute entries over a new set of buckets.
+
+        Required Arguments:
+
+        - bucket_count (int): The new number of buckets.
+        - bucket_width (float): The new time span covered by each bucket.
+        - entries (list[tuple]): The entries to redistribute.
+        """
+        self.__bucket_count__ = bucket_count
+        self.__bucket_width__ = bucket_width
+        self.__buckets__ = [[] for _ in range(bucket_count)]
+        self.__grow_at__ = 2 * bucket_count
+        self.__shrink_at__ = (
+            bucket_count // 2
+            if bucket_count > self.__min_bucket_count__
+            else -1
+        )
+        for entry in entries:
+            self.__buckets__[
+                int(entry[0] // bucket_width) % bucket_count
+            ].append(entry)
+        for bucket in self.__buckets__:
+            bucket.sort()
+        if entries:
+            self.__current__ = int(min(entries)[0] // bucket_width)
+        else:
+            self.__current__ = 0
+        self.__head_bucket__ = None
+
+    def __estimate_width__(self, entries: list[tuple]) -> float:
+        """
+        An internal method to estimate a bucket width from the average spacing of the earliest entries.
+
+        Following Brown (1988), spacings more than twice the initial average are ignored so that a few far future events do not dilute the estimate.
+
+        Required Arguments:
+
+        - entries (list[tuple]): The entries currently stored.
+
+        Returns:
+
+        - float: The new bucket width. Falls back to the current width if all sampled entries share the same time.
+        """
+        sample = nsmallest(25, entries)
+        gaps = [
+            sample[idx + 1][0] - sample[idx][0]
+            for idx in range(len(sample) - 1)
+        ]
+        gaps = [gap for gap in gaps if gap > 0]
+        if not gaps:
+            return self.__bucket_width__
+        average = sum(gaps) / len(gaps)
+        gaps = [gap for gap in gaps if gap <= 2 * average]
+        return 3 * sum(gaps) / len(gaps)
+
+    def __rescale__(self, bucket_count: int) -> None:
+        """
+        An internal method to change the number of buckets and re-estimate their width.
+
+        Required Arguments:
+
+        - bucket_count (int): The new number of buckets.
+        """
+        entries = self.entries()
+        self.__resize__(bucket_count, self.__estimate_width__(entries), entries)
+
+    def push(self, entry: tuple) -> None:
+        virtual_bucket = int(entry[0] // self.__bucket_width__)
+        insort(self.__buckets__[virtual_bucket % self.__bucket_count__], entry)
+        self.__size__ += 1
+        if self.__size__ == 1 or virtual_bucket < self.__current__:
+            self.__current__ = virtual_bucket
+        if self.__head_bucket__ is not None and entry < self.__head_bucket__[0]:
+            self.__head_bucket__ = None
+        if self.__size__ > self.__grow_at__:
+            self.__rescale__(2 * self.__bucket_count__)
+
+    def __find__(self) -> list:
+        """
+        An internal method to locate the bucket holding the smallest entry, advancing the current position of the calendar.
+
+        Buckets are scanned for at most one full year (one pass over all buckets) before falling back to a direct search over every bucket head.
+        The result is cached until an entry is removed or a smaller entry is added.
+
+        Raises:
+
+        - IndexError: If the backend is empty.
+
+        Returns:
+
+        - list: The bucket whose first entry is the smallest entry.
+        """
+        if self.__head_bucket__ is not None:
+            return self.__head_bucket__
+        if self.__size__ == 0:
+            raise IndexError("pop from an empty calendar queue")
+        buckets = self.__buckets__
+        bucket_count = self.__bucket_count__
+        bucket_width = self.__bucket_width__
+        current = self.__current__
+        for _ in range(bucket_count):
+            bucket = buckets[current % bucket_count]
+            if bucket and int(bucket[0][0] // bucket_width) == current:
+                self.__current__ = current
+                self.__head_bucket__ = bucket
+                return bucket
+            current += 1
+        bucket = min(
+            (bucket for bucket in buckets if bucket), key=lambda b: b[0]
+        )
+        self.__current__ = int(bucket[0][0] // bucket_width)
+        self.__head_bucket__ = bucket
+        return bucket
+
+    def pop(self) -> tuple:
+        entry = self.__find__().pop(0)
+        self.__head_bucket__ = None
+        self.__size__ -= 1
+        if self.__size__ < self.__shrink_at__:
+            self.__rescale__(self.__bucket_count__ // 2)
+        return entry
+
+    def peek(self) -> tuple:
+        return self.__find__()[0]
+
+    def pop_due(self, max_time: float) -> tuple | None:
+        if self.__size__ and self.__find__()[0][0] <= max_time:
+            return self.pop()
+        return None
+
+    def entries(self) -> list[tuple]:
+        return [entry for bucket in self.__buckets__ for entry in bucket]
+
+    def push_many(self, entries: list[tuple]) -> None:
+        # Rebuilding also re-estimates the bucket width for the new entries
+        if 8 * len(entries) < self.__size__:
+            for entry in entries:
+                self.push(entry)
+        else:
+            self.rebuild(self.entries() + list(entries))
+
+    def rebuild(self, entries: list[tuple]) -> None:
+        entries = list(entries)
+        self.__size__ = len(entries)
+        bucket_count = self.__min_bucket_count__
+        while 2 * bucket_count < self.__size__:
+            bucket_count *= 2
+        self.__resize__(bucket_count, self.__estimate_width__(entries), entries)
+
+    def __len__(self) -> int:
+        return self.__size__
+
+
+QUEUE_BACKENDS = {
+    "heap": HeapBackend,
+    "calendar": CalendarBackend,
+}
+"""Maps backend names accepted by `Queue` to their backend classes."""
+
+
+class Event:
+    __slots__ = ("time", "seq", "func", "args", "kwargs", "code")
+
+    def __init__(
+        self,
+        time: float,
+        seq: int,
+        func,
+        args: tuple | None = None,
+        kwargs: dict | None = None,
+        code: int | None = None,
+    ):
+        """
+        A compact record for a scheduled event. Instances are stored directly in the queue entries and double as the handle returned by `Queue.add`.
+
+        Required Arguments:
+
+        - time (float): The time at which the event is scheduled.
+        - seq (int): The sequence number of the queue entry that currently holds this event. Set to None once the event is processed or cancelled.
+        - func (callable): The function to be called when the event is processed.
+
+        Optional Arguments:
+
+        - args (tuple | None): Positional arguments to pass to the function.
+        - kwargs (dict | None): Keyword arguments to pass to the function.
+        - code (int | None): An integer event code passed as the only positional argument to the function.
+            - This skips building `*args` and `**kwargs` when the event is processed.
+        """
+        self.time = time
+        self.seq = seq
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.code = code
+
+    def __repr__(self) -> str:
+        return (
+            f"Event(time={self.time}, seq={self.seq}, "
+            f"func={getattr(self.func, '__name__', self.func)})"
+        )
 
 
 class Queue:
-    def __init__(self, log_events: bool = False, precision: int = 4):
+    def __init__(
+        self,
+        log_events: bool = False,
+        precision: int = 4,
+        backend: Literal["heap", "calendar"] | QueueBackend = "heap",
+        log_capacity: int | None = None,
+    ):
         """
         Initializes a priority queue for managing simulation events.
 
         Optional Arguments:
 
-        - log_events (bool): If True, logs each event processed for debugging or analysis. Default is False.
+        - log_events (bool): If True, logs the time, id and function name of each event processed for debugging or analysis. Default is False.
+            - See `scar_sim.event_log.EventLog` for the storage format and export options.
         - precision (int): The number of decimal places to round time values to, ensuring numerical stability.
             - Default: 4
+        - backend (Literal['heap', 'calendar'] | QueueBackend): The data structure used to order pending events.
+            - 'heap': A binary heap with O(log n) scheduling.
+            - 'calendar': An adaptive calendar queue with amortized O(1) scheduling for tightly clustered event times.
+            - A QueueBackend instance can also be passed for custom backends.
+            - Both built in backends process events at the same time in the order they were scheduled.
+            - Default: 'heap'
+        - log_capacity (int | None): If set, only the most recent `log_capacity` events are kept in the event log.
+            - Default: None (keep all logged events)
+
+        Raises:
+
+        - ValueError: If the backend name is not recognized.
         """
-        self.__queue__ = []
+        if isinstance(backend, str):
+            if backend not in QUEUE_BACKENDS:
+                raise ValueError(f"Unknown queue backend: {backend}")
+            backend = QUEUE_BACKENDS[backend]()
+        self.__queue__ = backend
         self.__current_time__ = 0.0
-        self.__log__ = []
-        self.__event_dict__ = {}
+        self.__log__ = EventLog(capacity=log_capacity)
+        self.__live__ = 0
         self.__event_id__ = 0
         self.__log_events__ = log_events
         self.__precision__ = precision
+        self.__factor__ = 10**precision
 
     def add(
         self,
@@ -27,7 +414,8 @@ class Queue:
         func,
         args: tuple = None,
         kwargs: dict = None,
-    ) -> None:
+        code: int = None,
+    ) -> Event:
         """
         Schedules a new event in the queue to be executed after a specified time delta.
 
@@ -42,22 +430,201 @@ class Queue:
             - Default: tuple()
         - kwargs (dict): Keyword arguments to pass to the function when called.
             - Default: dict()
+        - code (int): An integer event code to pass as the only argument to the function when called.
+            - This is the fastest way to dispatch an event and cannot be combined with args or kwargs.
+            - Default: None
+
+        Returns:
+
+        - Event: A handle for the scheduled event that can be passed to `cancel` or `reschedule`.
         """
-        args = args if args is not None else tuple()
-        kwargs = kwargs if kwargs is not None else dict()
         if time_delta < 0:
             raise ValueError("Cannot schedule events in the past")
+        if code is not None and (args or kwargs):
+            raise ValueError("An event code cannot be combined with args")
+        seq = self.__event_id__ = self.__event_id__ + 1
+        # Inline equivalent of hard_round to keep scheduling cheap
+        next_time = (
+            round((self.__current_time__ + time_delta) * self.__factor__)
+            / self.__factor__
+        )
+        event = Event(next_time, seq, func, args or None, kwargs or None, code)
+        self.__live__ += 1
+        self.__queue__.push((next_time, seq, event))
+        return event
+
+    def add_many(
+        self,
+        time_deltas: list[float],
+        funcs: list,
+        codes: list[int] | None = None,
+    ) -> list[Event]:
+        """
+        Schedules many events at once, each after its own time delta.
+
+        The events are bulk loaded into the backend (a single heapify for the heap backend) instead of being pushed one at a time.
+        Events with equal times are processed in the order they are listed, after any events already scheduled for that time.
+
+        Required Arguments:
+
+        - time_deltas (list[float]): The time delay after which each event should be executed. Must be non-negative.
+        - funcs (list[callable]): The function to be called when each event is processed.
+
+        Optional Arguments:
+
+        - codes (list[int] | None): An integer event code per event to pass as the only argument to its function (see `add`).
+            - Default: None (call the functions without arguments)
+
+        Raises:
+
+        - ValueError: If the inputs have different lengths or a time delta is negative.
+
+        Returns:
+
+        - list[Event]: The handles of the scheduled events in the order they were listed.
+        """
+        if len(time_deltas) != len(funcs) or (
+            codes is not None and len(codes) != len(funcs)
+        ):
+            raise ValueError("All event inputs must have the same length")
+        if time_deltas and min(time_deltas) < 0:
+            raise ValueError("Cannot schedule events in the past")
+        if codes is None:
+            codes = [None] * len(funcs)
+        current_time = self.__current_time__
+        factor = self.__factor__
+        seq = self.__event_id__
+        events = []
+        entries = []
+        for time_delta, func, code in zip(time_deltas, funcs, codes):
+            seq += 1
+            next_time = round((current_time + time_delta) * factor) / factor
+            event = Event(next_time, seq, func, None, None, code)
+            events.append(event)
+            entries.append((next_time, seq, event))
+        self.__event_id__ = seq
+        self.__live__ += len(events)
+        self.__queue__.push_many(entries)
+        return events
+
+    def cancel(self, handle: Event) -> bool:
+        """
+        Cancels a scheduled event so that it will never be processed.
+
+        The event's queue entry is left behind as a tombstone that is skipped when it reaches the top of the queue.
+        The queue is compacted whenever tombstones outnumber live events.
+
+        Required Arguments:
+
+        - handle (Event): The handle returned by `add` when the event was scheduled.
+
+        Returns:
+
+        - bool: True if the event was pending and is now cancelled, False if it was already processed or cancelled.
+        """
+        if handle.seq is None:
+            return False
+        handle.seq = None
+        self.__live__ -= 1
+        self.__compact__()
+        return True
+
+    def reschedule(self, handle: Event, new_delta: float) -> Event:
+        """
+        Moves a scheduled event to a new time measured from the current simulation time.
+
+        The event keeps its function and arguments but is ordered as if it were scheduled now when ties occur. Its previous queue entry becomes a tombstone.
+
+        Required Arguments:
+
+        - handle (Event): The handle returned by `add` when the event was scheduled.
+        - new_delta (float): The new time delay from the current simulation time. Must be non-negative.
+
+        Raises:
+
+        - ValueError: If new_delta is negative.
+        - KeyError: If the event is not pending (already processed or cancelled).
+
+        Returns:
+
+        - Event: The handle of the rescheduled event (the same handle that was passed in).
+        """
+        if new_delta < 0:
+            raise ValueError("Cannot schedule events in the past")
+        if handle.seq is None:
+            raise KeyError(f"{handle} is not pending")
         self.__event_id__ += 1
-        self.__event_dict__[self.__event_id__] = (
-            self.__event_id__,
-            func,
-            args,
-            kwargs,
+        handle.time = hard_round(
+            self.__current_time__ + new_delta, self.__precision__
         )
-        next_time = hard_round(
-            self.__current_time__ + time_delta, self.__precision__
+        handle.seq = self.__event_id__
+        self.__queue__.push((handle.time, handle.seq, handle))
+        self.__compact__()
+        return handle
+
+    def is_pending(self, handle: Event) -> bool:
+        """
+        Checks whether an event is still waiting to be processed.
+
+        Required Arguments:
+
+        - handle (Event): The handle returned by `add` when the event was scheduled.
+
+        Returns:
+
+        - bool: True if the event is scheduled and has not been processed or cancelled.
+        """
+        return handle.seq is not None
+
+    def __compact__(self) -> None:
+        """
+        An internal method to rebuild the queue without tombstones once they outnumber the live events.
+
+        This keeps the queue at most twice the size of the live event count so pops stay O(log n).
+
+        Returns:
+
+        - None
+        """
+        if len(self.__queue__) - self.__live__ <= self.__live__:
+            return
+        self.__queue__.rebuild(
+            [
+                entry
+                for entry in self.__queue__.entries()
+                if entry[2].seq == entry[1]
+            ]
         )
-        heappush(self.__queue__, (next_time, self.__event_id__))
+
+    def __fire__(self, time: float, event: Event) -> None:
+        """
+        An internal method to advance the clock to an event and call its function.
+
+        Required Arguments:
+
+        - time (float): The time of the event.
+        - event (Event): The live event to process.
+
+        Returns:
+
+        - None
+        """
+        event_id = event.seq
+        event.seq = None
+        self.__live__ -= 1
+        self.__current_time__ = time
+        func = event.func
+        if event.code is not None:
+            func(event.code)
+        elif event.kwargs is not None:
+            func(*(event.args or ()), **event.kwargs)
+        elif event.args is not None:
+            func(*event.args)
+        else:
+            func()
+
+        if self.__log_events__:
+            self.__log__.append(time, event_id, func.__name__)
 
     def process(self) -> None:
         """
@@ -73,22 +640,12 @@ class Queue:
 
         - None
         """
-        if not self.__queue__:
-            raise IndexError("No events to process in the queue")
-        self.__current_time__, event_id = heappop(self.__queue__)
-        event_id, func, args, kwargs = self.__event_dict__.pop(event_id)
-        func(*args, **kwargs)
-
-        if self.__log_events__:
-            self.__log__.append(
-                {
-                    "event_id": event_id,
-                    "time": self.__current_time__,
-                    "func": func.__name__,
-                    "args": args,
-                    "kwargs": kwargs,
-                }
-            )
+        while self.__queue__:
+            time, seq, event = self.__queue__.pop()
+            if event.seq == seq:
+                self.__fire__(time, event)
+                return
+        raise IndexError("No events to process in the queue")
 
     def run(self, max_time: float) -> None:
         """
@@ -112,6 +669,9 @@ class Queue:
             raise ValueError(
                 "max_time cannot be less than the current simulation time"
             )
-        while self.__queue__ and self.__queue__[0][0] <= max_time:
-            self.process()
+        pop_due = self.__queue__.pop_due
+        fire = self.__fire__
+        while (entry := pop_due(max_time)) is not None:
+            if entry[2].seq == entry[1]:
+                fire(entry[0], entry[2])
         self.__current_time__ = max_time
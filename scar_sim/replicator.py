@@ -0,0 +1,259 @@
+from scar_sim.simulation import Simulation
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from copy import deepcopy
+from typing import Any, Callable, Iterator
+
+
+def summarize_simulation(simulation: Simulation) -> dict:
+    """
+    Builds the default summary of a finished replication.
+
+    If the simulation collects metrics (see `scar_sim.metrics.Metrics`), the cashflow and lead times are taken from them. Otherwise they are computed from the Order history, which must then hold every entry.
+
+    Required Arguments:
+
+    - simulation (Simulation): The finished simulation.
+
+    Raises:
+
+    - ValueError: If the simulation has no metrics and its history does not hold every entry (a history_level other than 'full' or history_drop_completed).
+
+    Returns:
+
+    - dict: A dictionary with the following keys.
+        - 'orders': The number of Orders in the simulation.
+        - 'completed_orders': The number of Orders that completed.
+        - 'history_rows': The number of Order history entries held in memory.
+        - 'total_cashflow': The sum of all Order cashflows.
+        - 'mean_lead_time': The mean time from start to completion of completed Orders (None if no Order completed).
+    """
+    history = simulation.history
+    metrics = simulation.metrics
+    if metrics is not None:
+        lead_times = [stats.moments for stats in metrics.lead_times.values()]
+        completed = sum(moments.count for moments in lead_times)
+        return {
+            "orders": len(simulation.orders),
+            "completed_orders": completed,
+            "history_rows": len(history),
+            "total_cashflow": metrics.cashflow,
+            "mean_lead_time": (
+                sum(moments.mean * moments.count for moments in lead_times)
+                / completed
+                if completed
+                else None
+            ),
+        }
+    if history.level != "full" or history.drop_completed:
+        raise ValueError(
+            "Summarizing a simulation without metrics requires a full history that keeps completed Orders"
+        )
+    started = {}
+    lead_times = []
+    total_cashflow = 0.0
+    for chunk in history.iter_chunks():
+        total_cashflow += sum(chunk["cashflow"])
+        for order_id, status, time in zip(
+            chunk["order_id"], chunk["status"], chunk["time"]
+        ):
+            if status == "started":
+                started[order_id] = time
+            elif status == "completed":
+                lead_times.append(time - started.pop(order_id))
+    return {
+        "orders": len(simulation.orders),
+        "completed_orders": len(lead_times),
+        "history_rows": len(history),
+        "total_cashflow": total_cashflow,
+        "mean_lead_time": (
+            sum(lead_times) / len(lead_times) if lead_times else None
+        ),
+    }
+
+
+def run_replication(
+    builder: Callable[[int], Simulation],
+    seed: int,
+    max_time: float,
+    summarize: Callable[[Simulation], Any],
+    reducer: Callable[[Any, dict], Any] | None,
+    initial: Any,
+    chunk_size: int,
+) -> tuple[Any, Any]:
+    """
+    Builds, runs and summarizes a single replication, then closes the simulation so that its history sink is written. This is a module level function so that it can be sent to worker processes.
+
+    Required Arguments:
+
+    - builder (Callable[[int], Simulation]): Builds a ready to run simulation for a seed.
+    - seed (int): The seed of the replication.
+    - max_time (float): The time to run the simulation until.
+    - summarize (Callable[[Simulation], Any]): Builds the summary of the finished simulation.
+    - reducer (Callable[[Any, dict], Any] | None): Folds chunks of history columns (see `HistoryStore.iter_chunks`) into a state. None to skip history aggregation.
+    - initial (Any): The initial reducer state. A deep copy is used for each replication.
+    - chunk_size (int): The number of history rows passed to the reducer at a time.
+
+    Returns:
+
+    - tuple[Any, Any]: The summary and the reduced history state (None if no reducer is given).
+    """
+    simulation = builder(seed)
+    try:
+        simulation.run(max_time=max_time)
+        state = None
+        if reducer is not None:
+            state = deepcopy(initial)
+            for chunk in simulation.history.iter_chunks(chunk_size=chunk_size):
+                state = reducer(state, chunk)
+        return summarize(simulation), state
+    finally:
+        # Write any remaining history entries to the sink and close it
+        simulation.close()
+
+
+class Replicator:
+    def __init__(
+        self,
+        builder: Callable[[int], Simulation],
+        seeds: list[int],
+        max_time: float,
+        workers: int | None = None,
+        summarize: Callable[[Simulation], Any] = summarize_simulation,
+    ):
+        """
+        Initializes a runner for Monte Carlo replications of a simulation model.
+
+        Each replication builds a fresh simulation with `builder(seed)`, runs it to `max_time` and summarizes it.
+        Replications only depend on their seed, so results do not depend on the number of workers or on the order in which replications finish.
+
+        Required Arguments:
+
+        - builder (Callable[[int], Simulation]): Builds a ready to run simulation (with its Orders and events scheduled) for a seed.
+            - Must be a module level function (or another picklable callable) when workers are used.
+        - seeds (list[int]): The seed of each replication.
+        - max_time (float): The time to run each replication until.
+
+        Optional Arguments:
+
+        - workers (int | None): The number of worker processes to run replications on.
+            - If None or 1, replications run in the current process.
+            - Default: None
+        - summarize (Callable[[Simulation], Any]): Builds the summary of each finished replication. Must be picklable when workers are used.
+            - Default: `summarize_simulation`
+        """
+        self.builder = builder
+        self.seeds = list(seeds)
+        self.max_time = max_time
+        self.workers = workers
+        self.summarize = summarize
+
+    def run(
+        self,
+        reducer: Callable[[Any, dict], Any] | None = None,
+        initial: Any = None,
+        chunk_size: int = 100000,
+    ) -> Iterator[dict]:
+        """
+        Runs the replications and yields each result as soon as it finishes.
+
+        With workers, at most two replications per worker are queued at a time, and only summaries and reduced history states are sent back, so memory use does not grow with the number of seeds.
+        If the iteration is interrupted (including by KeyboardInterrupt) or stopped early, queued replications are cancelled and the worker pool is shut down.
+
+        Optional Arguments:
+
+        - reducer (Callable[[Any, dict], Any] | None): Folds chunks of each replication's history columns into a state with `state = reducer(state, chunk)`, where chunks are dictionaries as returned by `HistoryStore.iter_chunks`.
+            - Default: None (no history aggregation)
+        - initial (Any): The initial reducer state of each replication.
+            - Default: None
+        - chunk_size (int): The number of history rows passed to the reducer at a time.
+            - Default: 100000
+
+        Returns:
+
+        - Iterator[dict]: Yields one dictionary per replication with 'index' (the position of its seed), 'seed', 'summary' and 'history' (the reduced history state or None) keys.
+        """
+        args = (
+            self.max_time,
+            self.summarize,
+            reducer,
+            initial,
+            chunk_size,
+        )
+        if self.workers is None or self.workers <= 1:
+            for index, seed in enumerate(self.seeds):
+                summary, state = run_replication(self.builder, seed, *args)
+                yield {
+                    "index": index,
+                    "seed": seed,
+                    "summary": summary,
+                    "history": state,
+                }
+            return
+        executor = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            pending = {}
+            tasks = iter(enumerate(self.seeds))
+            while True:
+                # Keep a bounded number of replications queued
+                for index, seed in tasks:
+                    future = executor.submit(
+                        run_replication, self.builder, seed, *args
+                    )
+                    pending[future] = (index, seed)
+                    if len(pending) >= 2 * self.workers:
+                        break
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=lambda item: pending[item][0]):
+                    index, seed = pending.pop(future)
+                    summary, state = future.result()
+                    yield {
+                        "index": index,
+                        "seed": seed,
+                        "summary": summary,
+                        "history": state,
+                    }
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def aggregate(
+        self,
+        reducer: Callable[[Any, dict], Any],
+        initial: Any,
+        combine: Callable[[Any, Any], Any],
+        chunk_size: int = 100000,
+    ) -> tuple[list, Any]:
+        """
+        Runs the replications and aggregates their histories.
+
+        Each replication's history is folded with `reducer` in its own process (see `run`), and the per-replication states are then combined in seed order with `total = combine(total, state)`, so the result does not depend on the number of workers.
+        Out of order results are only held until the results before them arrive.
+
+        Required Arguments:
+
+        - reducer (Callable[[Any, dict], Any]): Folds chunks of history columns into a state. See `run`.
+        - initial (Any): The initial state of each replication and of the combined total. A deep copy is used each time.
+        - combine (Callable[[Any, Any], Any]): Combines a replication's state into the running total.
+
+        Optional Arguments:
+
+        - chunk_size (int): The number of history rows passed to the reducer at a time.
+            - Default: 100000
+
+        Returns:
+
+        - tuple[list, Any]: The summaries in seed order and the combined history state.
+        """
+        summaries = []
+        total = deepcopy(initial)
+        waiting = {}
+        for result in self.run(
+            reducer=reducer, initial=initial, chunk_size=chunk_size
+        ):
+            waiting[result["index"]] = result
+            while len(summaries) in waiting:
+                result = waiting.pop(len(summaries))
+                summaries.append(result["summary"])
+                total = combine(total, result["history"])
+        return summaries, total
@@ -0,0 +1,767 @@
+from array import array
+from heapq import heappop, heappush
+
+INF = float("inf")
+
+# All functions in this module work on graphs in compressed sparse row (CSR) form. See `build_csr`.
+
+
+def build_csr(size: int, edges: list[tuple]) -> dict:
+    """
+    Builds a graph in compressed sparse row (CSR) form.
+
+    Required Arguments:
+
+    - size (int): The number of graph IDs.
+    - edges (list[tuple]): The edges as (origin_id, destination_id, time, cashflow, arc) tuples where arc is an index into the caller's Arc list or -1 if the edge does not belong to an Arc.
+
+    Returns:
+
+    - dict: The CSR graph.
+        - 'indptr': The outgoing edges of graph ID `i` are stored at positions `indptr[i]` to `indptr[i + 1]`.
+        - 'indices': The graph ID each edge ends at.
+        - 'time': The time weight of each edge.
+        - 'cashflow': The cashflow weight of each edge (costs are stored as positive values).
+        - 'arc': The Arc index of each edge (-1 if none).
+    """
+    counts = array("q", [0]) * (size + 1)
+    for edge in edges:
+        counts[edge[0] + 1] += 1
+    for graph_id in range(size):
+        counts[graph_id + 1] += counts[graph_id]
+    indptr = array("q", counts)
+    indices = array("q", [0]) * len(edges)
+    time = array("d", [0.0]) * len(edges)
+    cashflow = array("d", [0.0]) * len(edges)
+    arc = array("q", [0]) * len(edges)
+    for origin_id, destination_id, edge_time, edge_cashflow, edge_arc in edges:
+        position = counts[origin_id]
+        counts[origin_id] += 1
+        indices[position] = destination_id
+        time[position] = edge_time
+        cashflow[position] = edge_cashflow
+        arc[position] = edge_arc
+    return {
+        "indptr": indptr,
+        "indices": indices,
+        "time": time,
+        "cashflow": cashflow,
+        "arc": arc,
+    }
+
+
+def edge_position(csr: dict, origin_id: int, destination_id: int) -> int:
+    """
+    Finds the position of an edge in a CSR graph.
+
+    Required Arguments:
+
+    - csr (dict): A CSR graph as returned by `build_csr`.
+    - origin_id (int): The graph ID the edge starts at.
+    - destination_id (int): The graph ID the edge ends at.
+
+    Returns:
+
+    - int: The position of the edge in the edge arrays, or -1 if the edge does not exist.
+    """
+    indptr = csr["indptr"]
+    if origin_id + 1 >= len(indptr):
+        return -1
+    indices = csr["indices"]
+    for position in range(indptr[origin_id], indptr[origin_id + 1]):
+        if indices[position] == destination_id:
+            return position
+    return -1
+
+
+def shortest_path_tree(
+    csr: dict, weight: str, origin_id: int, other_weight: str | None = None
+) -> dict:
+    """
+    Calculates the shortest path tree rooted at an origin using Dijkstra's algorithm.
+
+    Required Arguments:
+
+    - csr (dict): A CSR graph as returned by `build_csr`.
+    - weight (str): The edge weight to minimize ('time' or 'cashflow').
+    - origin_id (int): The graph ID to root the tree at.
+
+    Optional Arguments:
+
+    - other_weight (str | None): A second edge weight ('time' or 'cashflow') to accumulate along the tree.
+        - Default: None
+
+    Returns:
+
+    - dict: The shortest path tree.
+        - 'origin_id': The graph ID the tree is rooted at.
+        - 'predecessor': An array with the previous graph ID on the shortest path to each graph ID (-1 for the origin and unreachable graph IDs).
+        - 'distance': An array with the shortest distance to each graph ID (inf for unreachable graph IDs).
+        - 'other_distance': An array with the accumulated other weight along the tree to each graph ID. Only included if other_weight is provided.
+    """
+    indptr = csr["indptr"]
+    indices = csr["indices"]
+    weights = csr[weight]
+    size = len(indptr) - 1
+    distance = array("d", [INF]) * size
+    predecessor = array("q", [-1]) * size
+    distance[origin_id] = 0.0
+    if other_weight is not None:
+        other_weights = csr[other_weight]
+        other_distance = array("d", [INF]) * size
+        other_distance[origin_id] = 0.0
+    open_leaves = [(0.0, origin_id)]
+    while open_leaves:
+        current_distance, current_id = heappop(open_leaves)
+        if current_distance > distance[current_id]:
+            continue
+        for position in range(indptr[current_id], indptr[current_id + 1]):
+            connected_id = indices[position]
+            possible_distance = current_distance + weights[position]
+            if possible_distance < distance[connected_id]:
+                distance[connected_id] = possible_distance
+                predecessor[connected_id] = current_id
+                if other_weight is not None:
+                    other_distance[connected_id] = (
+                        other_distance[current_id] + other_weights[position]
+                    )
+                heappush(open_leaves, (possible_distance, connected_id))
+    tree = {
+        "origin_id": origin_id,
+        "predecessor": predecessor,
+        "distance": distance,
+    }
+    if other_weight is not None:
+        tree["other_distance"] = other_distance
+    return tree
+
+
+def tree_path(tree: dict, destination_id: int) -> list[int]:
+    """
+    Extracts the path from the root of a shortest path tree to a destination.
+
+    Required Arguments:
+
+    - tree (dict): A shortest path tree as returned by `shortest_path_tree`.
+    - destination_id (int): The graph ID to extract the path to.
+
+    Raises:
+
+    - ValueError: If the destination is not reachable from the root of the tree.
+
+    Returns:
+
+    - list[int]: The graph IDs on the path from the root to the destination.
+    """
+    if tree["distance"][destination_id] == INF:
+        raise ValueError(
+            "The origin and destination nodes are not connected in the graph"
+        )
+    predecessor = tree["predecessor"]
+    path = [destination_id]
+    while path[-1] != tree["origin_id"]:
+        path.append(predecessor[path[-1]])
+    path.reverse()
+    return path
+
+
+def repair_tree_decrease(
+    csr: dict, weight: str, tree: dict, origin_id: int, destination_id: int
+) -> int:
+    """
+    Repairs a shortest path tree in place after the weight of an edge decreased (or a new edge was added).
+
+    Only graph IDs whose shortest distance improves through the changed edge are visited.
+
+    Required Arguments:
+
+    - csr (dict): The CSR graph the tree was built from, already holding the new edge weight.
+    - weight (str): The edge weight the tree minimizes ('time' or 'cashflow').
+    - tree (dict): A shortest path tree as returned by `shortest_path_tree`.
+    - origin_id (int): The graph ID the changed edge starts at.
+    - destination_id (int): The graph ID the changed edge ends at.
+
+    Returns:
+
+    - int: The number of graph IDs whose distance was updated.
+    """
+    indptr = csr["indptr"]
+    indices = csr["indices"]
+    weights = csr[weight]
+    distance = tree["distance"]
+    predecessor = tree["predecessor"]
+    new_distance = (
+        distance[origin_id]
+        + weights[edge_position(csr, origin_id, destination_id)]
+    )
+    if new_distance >= distance[destination_id]:
+        return 0
+    distance[destination_id] = new_distance
+    predecessor[destination_id] = origin_id
+    open_leaves = [(new_distance, destination_id)]
+    touched = 0
+    while open_leaves:
+        current_distance, current_id = heappop(open_leaves)
+        if current_distance > distance[current_id]:
+            continue
+        touched += 1
+        for position in range(indptr[current_id], indptr[current_id + 1]):
+            connected_id = indices[position]
+            possible_distance = current_distance + weights[position]
+            if possible_distance < distance[connected_id]:
+                distance[connected_id] = possible_distance
+                predecessor[connected_id] = current_id
+                heappush(open_leaves, (possible_distance, connected_id))
+    return touched
+
+
+def repair_tree_increase(
+    csr: dict,
+    weight: str,
+    in_edges: list[set],
+    tree: dict,
+    origin_id: int,
+    destination_id: int,
+) -> int:
+    """
+    Repairs a shortest path tree in place after the weight of an edge increased.
+
+    Following Ramalingam and Reps, only the subtree hanging below the changed edge can lose its shortest paths.
+    The subtree is detached, each of its graph IDs is reconnected through its best incoming edge from outside the subtree, and distances are then settled with Dijkstra's algorithm restricted to the subtree.
+    Nothing is done if the changed edge is not part of the tree.
+
+    Required Arguments:
+
+    - csr (dict): The CSR graph the tree was built from, already holding the new edge weight.
+    - weight (str): The edge weight the tree minimizes ('time' or 'cashflow').
+    - in_edges (list[set]): For each graph ID, the set of graph IDs with an edge into it.
+    - tree (dict): A shortest path tree as returned by `shortest_path_tree`.
+    - origin_id (int): The graph ID the changed edge starts at.
+    - destination_id (int): The graph ID the changed edge ends at.
+
+    Returns:
+
+    - int: The number of graph IDs in the repaired subtree.
+    """
+    indptr = csr["indptr"]
+    indices = csr["indices"]
+    weights = csr[weight]
+    distance = tree["distance"]
+    predecessor = tree["predecessor"]
+    if predecessor[destination_id] != origin_id:
+        return 0
+    # Collect the subtree by following tree edges down from the changed edge
+    subtree = [destination_id]
+    in_subtree = {destination_id}
+    for current_id in subtree:
+        for position in range(indptr[current_id], indptr[current_id + 1]):
+            connected_id = indices[position]
+            if (
+                predecessor[connected_id] == current_id
+                and connected_id not in in_subtree
+            ):
+                subtree.append(connected_id)
+                in_subtree.add(connected_id)
+    for current_id in subtree:
+        distance[current_id] = INF
+        predecessor[current_id] = -1
+    # Reconnect each subtree member through its best edge from outside the subtree
+    open_leaves = []
+    for current_id in subtree:
+        best_distance = INF
+        best_id = -1
+        for previous_id in in_edges[current_id]:
+            if previous_id in in_subtree:
+                continue
+            possible_distance = (
+                distance[previous_id]
+                + weights[edge_position(csr, previous_id, current_id)]
+            )
+            if possible_distance < best_distance:
+                best_distance = possible_distance
+                best_id = previous_id
+        if best_id >= 0:
+            distance[current_id] = best_distance
+            predecessor[current_id] = best_id
+            heappush(open_leaves, (best_distance, current_id))
+    # Settle distances within the subtree (nodes outside it can not improve)
+    while open_leaves:
+        current_distance, current_id = heappop(open_leaves)
+        if current_distance > distance[current_id]:
+            continue
+        for position in range(indptr[current_id], indptr[current_id + 1]):
+            connected_id = indices[position]
+            if connected_id not in in_subtree:
+                continue
+            possible_distance = current_distance + weights[position]
+            if possible_distance < distance[connected_id]:
+                distance[connected_id] = possible_distance
+                predecessor[connected_id] = current_id
+                heappush(open_leaves, (possible_distance, connected_id))
+    return len(subtree)
+
+
+def shortest_path(
+    csr: dict,
+    weight: str,
+    origin_id: int,
+    destination_id: int,
+    removed_ids: set | None = None,
+    removed_edges: set | None = None,
+) -> tuple[float, list[int]] | None:
+    """
+    Calculates the shortest path between two graph IDs using Dijkstra's algorithm, optionally ignoring some graph IDs and edges.
+
+    Required Arguments:
+
+    - csr (dict): A CSR graph as returned by `build_csr`.
+    - weight (str): The edge weight to minimize ('time' or 'cashflow').
+    - origin_id (int): The graph ID to start at.
+    - destination_id (int): The graph ID to end at.
+
+    Optional Arguments:
+
+    - removed_ids (set | None): Graph IDs the path may not pass through.
+        - Default: None
+    - removed_edges (set | None): (origin, destination) edges the path may not use.
+        - Default: None
+
+    Returns:
+
+    - tuple[float, list[int]] | None: The length and graph IDs of the shortest path, or None if the destination can not be reached.
+    """
+    indptr = csr["indptr"]
+    indices = csr["indices"]
+    weights = csr[weight]
+    removed_ids = removed_ids or set()
+    removed_edges = removed_edges or set()
+    distance = {origin_id: 0.0}
+    predecessor = {}
+    open_leaves = [(0.0, origin_id)]
+    while open_leaves:
+        current_distance, current_id = heappop(open_leaves)
+        if current_id == destination_id:
+            path = [destination_id]
+            while path[-1] != origin_id:
+                path.append(predecessor[path[-1]])
+            path.reverse()
+            return current_distance, path
+        if current_distance > distance[current_id]:
+            continue
+        for position in range(indptr[current_id], indptr[current_id + 1]):
+            connected_id = indices[position]
+            if (
+                connected_id in removed_ids
+                or (current_id, connected_id) in removed_edges
+            ):
+                continue
+            possible_distance = current_distance + weights[position]
+            if possible_distance < distance.get(connected_id, INF):
+                distance[connected_id] = possible_distance
+                predecessor[connected_id] = current_id
+                heappush(open_leaves, (possible_distance, connected_id))
+    return None
+
+
+def path_weight(csr: dict, weight: str, path: list[int]) -> float:
+    """
+    Calculates the total weight of a path.
+
+    Required Arguments:
+
+    - csr (dict): A CSR graph as returned by `build_csr`.
+    - weight (str): The edge weight to sum ('time' or 'cashflow').
+    - path (list[int]): A list of graph IDs representing the path.
+
+    Raises:
+
+    - KeyError: If an edge of the path does not exist in the graph.
+
+    Returns:
+
+    - float: The total weight of the path.
+    """
+    weights = csr[weight]
+    weight_sum = 0.0
+    for idx in range(len(path) - 1):
+        position = edge_position(csr, path[idx], path[idx + 1])
+        if position < 0:
+            raise KeyError((path[idx], path[idx + 1]))
+        weight_sum += weights[position]
+    return weight_sum
+
+
+def k_shortest_paths(
+    csr: dict, weight: str, origin_id: int, destination_id: int, k: int
+) -> list[tuple[float, list[int]]]:
+    """
+    Calculates up to k loopless shortest paths between two graph IDs in order of increasing length using Yen's algorithm.
+
+    Required Arguments:
+
+    - csr (dict): A CSR graph as returned by `build_csr`.
+    - weight (str): The edge weight to minimize ('time' or 'cashflow').
+    - origin_id (int): The graph ID to start at.
+    - destination_id (int): The graph ID to end at.
+    - k (int): The maximum number of paths to return.
+
+    Returns:
+
+    - list[tuple[float, list[int]]]: The (length, path) of each path found. Fewer than k paths are returned if no more loopless paths exist.
+    """
+    first = shortest_path(csr, weight, origin_id, destination_id)
+    if first is None or k <= 0:
+        return []
+    paths = [first]
+    candidates = []
+    seen = {tuple(first[1])}
+    while len(paths) < k:
+        previous_path = paths[-1][1]
+        for spur_idx in range(len(previous_path) - 1):
+            spur_id = previous_path[spur_idx]
+            root_path = previous_path[: spur_idx + 1]
+            # Remove the next edge of every accepted path sharing this root
+            removed_edges = {
+                (path[spur_idx], path[spur_idx + 1])
+                for _, path in paths
+                if len(path) > spur_idx + 1
+                and path[: spur_idx + 1] == root_path
+            }
+            spur = shortest_path(
+                csr,
+                weight,
+                spur_id,
+                destination_id,
+                removed_ids=set(root_path[:-1]),
+                removed_edges=removed_edges,
+            )
+            if spur is None:
+                continue
+            path = root_path[:-1] + spur[1]
+            if tuple(path) in seen:
+                continue
+            seen.add(tuple(path))
+            root_length = path_weight(csr, weight, root_path)
+            heappush(candidates, (root_length + spur[0], path))
+        if not candidates:
+            break
+        paths.append(heappop(candidates))
+    return paths
+
+
+def pareto_paths(
+    csr: dict,
+    origin_id: int,
+    destination_id: int,
+    max_time: float | None = None,
+    max_cost: float | None = None,
+) -> list[tuple[float, float, list[int]]]:
+    """
+    Calculates the Pareto frontier of (time, cost) paths between two graph IDs with a single bi-criteria label setting search.
+
+    Labels are settled in lexicographic (time, cost) order, so a label is only kept if its cost is lower than the cost of every label already settled at its graph ID.
+    Labels that can not beat the cheapest path already found to the destination, or that break a constraint, are pruned.
+
+    Required Arguments:
+
+    - csr (dict): A CSR graph as returned by `build_csr`. Its 'cashflow' weights are the (non negative) costs.
+    - origin_id (int): The graph ID to start at.
+    - destination_id (int): The graph ID to end at.
+
+    Optional Arguments:
+
+    - max_time (float | None): The maximum total time of a path.
+        - Default: None (no limit)
+    - max_cost (float | None): The maximum total cost of a path.
+        - Default: None (no limit)
+
+    Returns:
+
+    - list[tuple[float, float, list[int]]]: The (time, cost, path) of each non dominated path, ordered by increasing time (and so by decreasing cost). Empty if no path meets the constraints.
+    """
+    indptr = csr["indptr"]
+    indices = csr["indices"]
+    times = csr["time"]
+    costs = csr["cashflow"]
+    max_time = INF if max_time is None else max_time
+    max_cost = INF if max_cost is None else max_cost
+    # The lowest cost settled at each graph ID so far
+    min_cost = {}
+    # Settled labels as (graph ID, parent label index)
+    labels = []
+    frontier = []
+    open_labels = [(0.0, 0.0, origin_id, -1)]
+    while open_labels:
+        time, cost, current_id, parent = heappop(open_labels)
+        if cost >= min_cost.get(current_id, INF):
+            continue
+        if cost >= min_cost.get(destination_id, INF):
+            continue
+        min_cost[current_id] = cost
+        label = len(labels)
+        labels.append((current_id, parent))
+        if current_id == destination_id:
+            path = []
+            while label >= 0:
+                path.append(labels[label][0])
+                label = labels[label][1]
+            path.reverse()
+            frontier.append((time, cost, path))
+            continue
+        for position in range(indptr[current_id], indptr[current_id + 1]):
+            connected_id = indices[position]
+            possible_time = time + times[position]
+            possible_cost = cost + costs[position]
+            if (
+                possible_time <= max_time
+                and possible_cost <= max_cost
+                and possible_cost < min_cost.get(connected_id, INF)
+            ):
+                heappush(
+                    open_labels,
+                    (possible_time, possible_cost, connected_id, label),
+                )
+    return frontier
+
+
+def reverse_csr(csr: dict) -> dict:
+    """
+    Builds the reverse of a CSR graph (every edge pointing the other way).
+
+    Required Arguments:
+
+    - csr (dict): A CSR graph as returned by `build_csr`.
+
+    Returns:
+
+    - dict: The reversed CSR graph.
+    """
+    indptr = csr["indptr"]
+    indices = csr["indices"]
+    return build_csr(
+        len(indptr) - 1,
+        [
+            (
+                indices[position],
+                origin_id,
+                csr["time"][position],
+                csr["cashflow"][position],
+                csr["arc"][position],
+            )
+            for origin_id in range(len(indptr) - 1)
+            for position in range(indptr[origin_id], indptr[origin_id + 1])
+        ],
+    )
+
+
+def landmark_tables(
+    csr: dict, weight: str, candidate_ids: list[int], count: int
+) -> dict:
+    """
+    Selects landmarks and calculates the ALT (A*, landmarks and triangle inequality) distance tables for them.
+
+    Landmarks are picked greedily, each one as far as possible from the landmarks already picked, starting from the first candidate.
+
+    Required Arguments:
+
+    - csr (dict): A CSR graph as returned by `build_csr`.
+    - weight (str): The edge weight to use ('time' or 'cashflow').
+    - candidate_ids (list[int]): The graph IDs landmarks may be picked from.
+    - count (int): The maximum number of landmarks.
+
+    Returns:
+
+    - dict: The landmark tables.
+        - 'landmarks': The graph IDs of the landmarks.
+        - 'forward': For each landmark, an array with the shortest distance from the landmark to each graph ID.
+        - 'backward': For each landmark, an array with the shortest distance from each graph ID to the landmark.
+    """
+    reverse = reverse_csr(csr)
+    size = len(csr["indptr"]) - 1
+    landmarks = []
+    forward = []
+    backward = []
+    # The distance from the closest picked landmark to each graph ID
+    closest = array("d", [INF]) * size
+    landmark_id = candidate_ids[0] if candidate_ids else None
+    while landmark_id is not None and len(landmarks) < count:
+        landmarks.append(landmark_id)
+        forward.append(shortest_path_tree(csr, weight, landmark_id)["distance"])
+        backward.append(
+            shortest_path_tree(reverse, weight, landmark_id)["distance"]
+        )
+        landmark_id = None
+        best_distance = 0.0
+        for graph_id in candidate_ids:
+            distance = min(closest[graph_id], forward[-1][graph_id])
+            closest[graph_id] = distance
+            if best_distance < distance < INF:
+                best_distance = distance
+                landmark_id = graph_id
+    return {"landmarks": landmarks, "forward": forward, "backward": backward}
+
+
+def astar_path(
+    csr: dict,
+    weight: str,
+    tables: dict,
+    origin_id: int,
+    destination_id: int,
+) -> tuple[float, list[int], int] | None:
+    """
+    Calculates the shortest path between two graph IDs with A* search guided by ALT landmark lower bounds.
+
+    By the triangle inequality, `max(d(L, t) - d(L, v), d(v, L) - d(t, L))` over all landmarks L is a lower bound on the distance from v to the destination t.
+    The bounds stay valid when edge weights increase, but may overestimate (and so give suboptimal paths) after weights decrease.
+
+    Required Arguments:
+
+    - csr (dict): A CSR graph as returned by `build_csr`.
+    - weight (str): The edge weight to minimize ('time' or 'cashflow').
+    - tables (dict): Landmark tables as returned by `landmark_tables`.
+    - origin_id (int): The graph ID to start at.
+    - destination_id (int): The graph ID to end at.
+
+    Returns:
+
+    - tuple[float, list[int], int] | None: The length and graph IDs of the shortest path and the number of graph IDs settled by the search, or None if the destination can not be reached.
+    """
+    indptr = csr["indptr"]
+    indices = csr["indices"]
+    weights = csr[weight]
+    # Only landmarks that reach (or are reached from) the destination give bounds
+    forward = [
+        (table, table[destination_id])
+        for table in tables["forward"]
+        if table[destination_id] < INF
+    ]
+    backward = [
+        (table, table[destination_id])
+        for table in tables["backward"]
+        if table[destination_id] < INF
+    ]
+    potentials = {}
+
+    def potential(graph_id: int) -> float:
+        bound = potentials.get(graph_id)
+        if bound is None:
+            bound = 0.0
+            for table, to_destination in forward:
+                distance = table[graph_id]
+                if distance < INF and to_destination - distance > bound:
+                    bound = to_destination - distance
+            for table, from_destination in backward:
+                distance = table[graph_id]
+                if distance < INF and distance - from_destination > bound:
+                    bound = distance - from_destination
+            potentials[graph_id] = bound
+        return bound
+
+    distance = {origin_id: 0.0}
+    predecessor = {}
+    settled = 0
+    open_leaves = [(potential(origin_id), 0.0, origin_id)]
+    while open_leaves:
+        _, current_distance, current_id = heappop(open_leaves)
+        if current_distance > distance[current_id]:
+            continue
+        settled += 1
+        if current_id == destination_id:
+            path = [destination_id]
+            while path[-1] != origin_id:
+                path.append(predecessor[path[-1]])
+            path.reverse()
+            return current_distance, path, settled
+        for position in range(indptr[current_id], indptr[current_id + 1]):
+            connected_id = indices[position]
+            possible_distance = current_distance + weights[position]
+            if possible_distance < distance.get(connected_id, INF):
+                distance[connected_id] = possible_distance
+                predecessor[connected_id] = current_id
+                heappush(
+                    open_leaves,
+                    (
+                        possible_distance + potential(connected_id),
+                        possible_distance,
+                        connected_id,
+                    ),
+                )
+    return None
+
+
+def route_options_from_origin(
+    csr: dict, origin_id: int, destination_ids: list[int]
+) -> list[dict | None]:
+    """
+    Calculates minimum time and minimum cashflow route options from one origin to many destinations using one shortest path tree per weight.
+
+    Required Arguments:
+
+    - csr (dict): A CSR graph as returned by `build_csr`.
+    - origin_id (int): The origin graph ID.
+    - destination_ids (list[int]): The destination graph IDs.
+
+    Returns:
+
+    - list[dict | None]: The route options for each destination in the same format as `Graph.get_route_options`, or None if the destination is not reachable.
+    """
+    time_tree = shortest_path_tree(csr, "time", origin_id, "cashflow")
+    cashflow_tree = shortest_path_tree(csr, "cashflow", origin_id, "time")
+    output = []
+    for destination_id in destination_ids:
+        if time_tree["distance"][destination_id] == INF:
+            output.append(None)
+            continue
+        output.append(
+            {
+                "min_cashflow": {
+                    "path": tree_path(cashflow_tree, destination_id),
+                    "time": cashflow_tree["other_distance"][destination_id],
+                    "cashflow": -cashflow_tree["distance"][destination_id],
+                },
+                "min_time": {
+                    "path": tree_path(time_tree, destination_id),
+                    "time": time_tree["distance"][destination_id],
+                    "cashflow": -time_tree["other_distance"][destination_id],
+                },
+            }
+        )
+    return output
+
+
+# The CSR graph held by each worker process of a batch routing pool
+__worker_csr__ = None
+
+
+def init_route_worker(csr: dict) -> None:
+    """
+    Stores the CSR graph in a worker process. Used as the initializer of batch routing process pools so the graph is sent once per worker rather than once per task.
+
+    Required Arguments:
+
+    - csr (dict): A CSR graph as returned by `build_csr`.
+
+    Returns:
+
+    - None
+    """
+    global __worker_csr__
+    __worker_csr__ = csr
+
+
+def route_options_task(
+    origin_id: int, destination_ids: list[int]
+) -> list[dict | None]:
+    """
+    Calculates route options in a worker process using the CSR graph stored by `init_route_worker`.
+
+    Required Arguments:
+
+    - origin_id (int): The origin graph ID.
+    - destination_ids (list[int]): The destination graph IDs.
+
+    Returns:
+
+    - list[dict | None]: See `route_options_from_origin`.
+    """
+    return route_options_from_origin(__worker_csr__, origin_id, destination_ids)
@@ -0,0 +1,257 @@
+import csv
+import json
+import threading
+from abc import ABC, abstractmethod
+from queue import Queue
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+SINK_COLUMNS = (
+    "time",
+    "time_delta",
+    "order_id",
+    "current_obj_id",
+    "status",
+    "cashflow",
+    "meta",
+)
+"""The history columns passed to sinks, in the order file sinks write them."""
+
+
+class HistorySink(ABC):
+    """
+    The interface that history sinks implement.
+
+    Sinks must implement `write`. `close` does nothing by default.
+
+    Sinks receive batches of Order history entries as dictionaries of columns (see `scar_sim.history.HistoryStore.iter_chunks`) from a background writer thread, in the order the entries were recorded.
+    """
+
+    @abstractmethod
+    def write(self, columns: dict) -> None:
+        """
+        Writes a batch of history entries.
+
+        Required Arguments:
+
+        - columns (dict): A dictionary with 'time', 'time_delta', 'order_id', 'current_obj_id', 'meta', 'status' and 'cashflow' lists.
+
+        Returns:
+
+        - None
+        """
+
+    def close(self) -> None:
+        """
+        Releases any resources held by the sink. Called once after the last batch is written.
+
+        Returns:
+
+        - None
+        """
+
+
+class MemorySink(HistorySink):
+    def __init__(self):
+        """
+        A sink that keeps every written history entry in memory as columns of python lists.
+
+        This is mostly useful with `drop_completed` to collect the flattened history of completed Orders, or for testing.
+        """
+        self.columns = {key: [] for key in SINK_COLUMNS}
+        """The written history entries as a dictionary of column lists."""
+
+    def write(self, columns: dict) -> None:
+        for key, values in self.columns.items():
+            values.extend(columns[key])
+
+
+class JSONLSink(HistorySink):
+    def __init__(self, filename: str):
+        """
+        A sink that writes each history entry as a JSON object on its own line.
+
+        Required Arguments:
+
+        - filename (str): The file path to write to. The file is overwritten.
+        """
+        self.filename = filename
+        self.__file__ = open(filename, "w")
+
+    def write(self, columns: dict) -> None:
+        self.__file__.write(
+            "".join(
+                json.dumps(dict(zip(SINK_COLUMNS, row))) + "\n"
+                for row in zip(*(columns[key] for key in SINK_COLUMNS))
+            )
+        )
+
+    def close(self) -> None:
+        self.__file__.close()
+
+
+class CSVSink(HistorySink):
+    def __init__(self, filename: str):
+        """
+        A sink that writes history entries as CSV rows with a header row. Metadata is written as a JSON object in the 'meta' column.
+
+        Required Arguments:
+
+        - filename (str): The file path to write to. The file is overwritten.
+        """
+        self.filename = filename
+        self.__file__ = open(filename, "w", newline="")
+        self.__writer__ = csv.writer(self.__file__)
+        self.__writer__.writerow(SINK_COLUMNS)
+
+    def write(self, columns: dict) -> None:
+        self.__writer__.writerows(
+            zip(
+                *(columns[key] for key in SINK_COLUMNS[:-1]),
+                map(json.dumps, columns["meta"]),
+            )
+        )
+
+    def close(self) -> None:
+        self.__file__.close()
+
+
+class ParquetSink(HistorySink):
+    def __init__(self, filename: str):
+        """
+        A sink that writes history entries to a Parquet file, one row group per batch. Metadata is written as a JSON string column.
+
+        Required Arguments:
+
+        - filename (str): The file path to write to. The file is overwritten.
+
+        Raises:
+
+        - ImportError: If pyarrow is not installed.
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for the Parquet sink")
+        self.filename = filename
+        self.__schema__ = pa.schema(
+            [
+                ("time", pa.float64()),
+                ("time_delta", pa.float64()),
+                ("order_id", pa.int64()),
+                ("current_obj_id", pa.int64()),
+                ("status", pa.string()),
+                ("cashflow", pa.float64()),
+                ("meta", pa.string()),
+            ]
+        )
+        self.__writer__ = pq.ParquetWriter(filename, self.__schema__)
+
+    def write(self, columns: dict) -> None:
+        self.__writer__.write_table(
+            pa.table(
+                {
+                    **{key: columns[key] for key in SINK_COLUMNS[:-1]},
+                    "meta": [json.dumps(meta) for meta in columns["meta"]],
+                },
+                schema=self.__schema__,
+            )
+        )
+
+    def close(self) -> None:
+        self.__writer__.close()
+
+
+class SinkWriter:
+    def __init__(self, sink: HistorySink, max_pending: int = 4):
+        """
+        Writes batches to a history sink on a background thread so the simulation does not wait on I/O.
+
+        At most `max_pending` batches wait to be written. Submitting more blocks until the writer catches up, which keeps memory bounded when the sink is slower than the simulation.
+
+        Required Arguments:
+
+        - sink (HistorySink): The sink to write to.
+
+        Optional Arguments:
+
+        - max_pending (int): The maximum number of batches waiting to be written.
+            - Default: 4
+        """
+        self.sink = sink
+        self.__pending__ = Queue(maxsize=max_pending)
+        self.__error__ = None
+        self.__thread__ = threading.Thread(target=self.__run__, daemon=True)
+        self.__thread__.start()
+
+    def __run__(self) -> None:
+        """
+        An internal method that writes submitted batches until it receives None.
+
+        After an error, later batches are discarded and the error is raised by the next call to `submit` or `close`.
+
+        Returns:
+
+        - None
+        """
+        while (columns := self.__pending__.get()) is not None:
+            if self.__error__ is None:
+                try:
+                    self.sink.write(columns)
+                except Exception as error:
+                    self.__error__ = error
+
+    def __raise__(self) -> None:
+        """
+        An internal method to raise an error from the writer thread in the calling thread.
+
+        Raises:
+
+        - Exception: The first error raised by the sink.
+
+        Returns:
+
+        - None
+        """
+        if self.__error__ is not None:
+            raise self.__error__
+
+    def submit(self, columns: dict) -> None:
+        """
+        Queues a batch to be written.
+
+        Required Arguments:
+
+        - columns (dict): The batch. It must not be modified after it is submitted.
+
+        Raises:
+
+        - Exception: Any error raised by the sink while writing an earlier batch.
+
+        Returns:
+
+        - None
+        """
+        self.__raise__()
+        self.__pending__.put(columns)
+
+    def close(self) -> None:
+        """
+        Waits for all queued batches to be written, stops the writer thread and closes the sink.
+
+        Raises:
+
+        - Exception: Any error raised by the sink while writing.
+
+        Returns:
+
+        - None
+        """
+        if self.__thread__.is_alive():
+            self.__pending__.put(None)
+            self.__thread__.join()
+            self.sink.close()
+        self.__raise__()
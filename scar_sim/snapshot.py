@@ -0,0 +1,641 @@
+from array import array
+from scar_sim.entity import SimulationObject
+from scar_sim.event_log import EventLog
+from scar_sim.history import HISTORY_COLUMNS, HistoryStore
+from scar_sim.order import Order
+from scar_sim.queue import QUEUE_BACKENDS, Event
+from scar_sim.sinks import HistorySink
+import dill
+import io
+import lzma
+import mmap
+import pickle
+import struct
+import sys
+import zlib
+
+SNAPSHOT_MAGIC = b"SCARSNAP"
+"""The bytes every snapshot starts with."""
+SNAPSHOT_VERSION = 1
+"""The snapshot format version written by `write_snapshot`."""
+SNAPSHOT_COMPRESSIONS = (None, "zlib", "lzma")
+"""The compression methods of snapshot sections. The index of each method is its code in the snapshot header."""
+
+# Magic, format version, compression code, byte order (0 little, 1 big) and section count
+HEADER = struct.Struct("<8sHBBI")
+# Section name, kind (an array typecode, 'P' for pickle or 'D' for dill), offset, stored size and raw size
+SECTION = struct.Struct("<32sc7xQQQ")
+# The Simulation attributes stored in their own sections
+SECTION_ATTRIBUTES = (
+    "objects",
+    "orders",
+    "__queue__",
+    "graph",
+    "normal_generator",
+    "__streams__",
+    "history",
+)
+
+
+def is_snapshot(data: bytes) -> bool:
+    """
+    Checks whether serialized data is a snapshot (rather than a legacy dill pickle).
+
+    Required Arguments:
+
+    - data (bytes): The serialized data or at least its first 8 bytes.
+
+    Returns:
+
+    - bool: True if the data starts with `SNAPSHOT_MAGIC`.
+    """
+    return bytes(data[: len(SNAPSHOT_MAGIC)]) == SNAPSHOT_MAGIC
+
+
+def dump_object(
+    obj, simulation, inline: bool = False, events: dict | None = None
+) -> tuple[bytes, bytes]:
+    """
+    Pickles an object for a snapshot section, storing references to the simulation and its objects by id and handles of scheduled events by sequence number.
+
+    `pickle` is used when possible and `dill` otherwise (for example for lambdas).
+
+    Required Arguments:
+
+    - obj (Any): The object to pickle.
+    - simulation (Simulation): The simulation being written.
+
+    Optional Arguments:
+
+    - inline (bool): If True, simulation objects are pickled in full rather than by id (used for the objects section itself).
+        - Default: False
+    - events (dict | None): The scheduled events of the simulation's queue keyed by sequence number. Handles of these events are stored by reference so they stay attached to the rebuilt events.
+        - Default: None
+
+    Returns:
+
+    - tuple[bytes, bytes]: The section kind (b'P' or b'D') and the pickled data.
+    """
+
+    def persistent_id(item):
+        if item is simulation:
+            return "simulation"
+        if (
+            not inline
+            and isinstance(item, SimulationObject)
+            and item.__simulation__ is simulation
+        ):
+            return item.id
+        if events and isinstance(item, Event) and events.get(item.seq) is item:
+            return ("event", item.seq)
+        return None
+
+    for kind, pickler_type in ((b"P", pickle.Pickler), (b"D", dill.Pickler)):
+        buffer = io.BytesIO()
+        pickler = pickler_type(buffer, protocol=pickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = persistent_id
+        try:
+            pickler.dump(obj)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            if kind == b"D":
+                raise
+            continue
+        return kind, buffer.getvalue()
+
+
+def load_object(
+    kind: bytes, data, simulation, objects: list, events: dict | None = None
+):
+    """
+    Unpickles an object written by `dump_object`.
+
+    Required Arguments:
+
+    - kind (bytes): The section kind (b'P' or b'D').
+    - data (bytes-like): The pickled data.
+    - simulation (Simulation): The simulation being read.
+    - objects (list): The simulation objects that references are resolved against.
+
+    Optional Arguments:
+
+    - events (dict | None): The rebuilt scheduled events keyed by sequence number that event references are resolved against.
+        - Default: None
+
+    Returns:
+
+    - Any: The unpickled object.
+    """
+
+    def persistent_load(pid):
+        if pid == "simulation":
+            return simulation
+        if isinstance(pid, tuple):
+            return events[pid[1]]
+        return objects[pid]
+
+    unpickler_type = dill.Unpickler if kind == b"D" else pickle.Unpickler
+    unpickler = unpickler_type(io.BytesIO(data))
+    unpickler.persistent_load = persistent_load
+    return unpickler.load()
+
+
+def write_snapshot(
+    simulation,
+    compression: str | None = None,
+    level: int | None = None,
+) -> bytes:
+    """
+    Serializes a simulation into the versioned binary snapshot format.
+
+    A snapshot is a header, a table of sections and the section data, with each section starting at an 8 byte aligned offset:
+
+    - 'simulation': The Simulation class.
+    - 'objects': The Nodes, Arcs and Orders with their live parameters and Order state.
+    - 'attributes': The remaining Simulation attributes (seed, random stream mode and so on).
+    - 'random': The shared generator and the substream generators, including their buffered variates.
+    - 'graph' and 'graph/*': The graph settings and landmark tables, plus its CSR arrays and the object ids of its Arcs and Nodes as raw arrays. Path caches are not stored.
+    - 'queue' and 'queue/*': The queue settings and its live events as raw arrays of time, sequence number, target object id, method name index and event code.
+        - Events whose function is a method of a simulation object (or of the simulation) are stored by reference. Other functions and any args or kwargs are pickled in 'queue/extras'.
+        - Handles of these events held anywhere else (for example by entities, Orders or event args) are pickled as references to them, so they still cancel or reschedule the rebuilt events.
+    - 'log' and 'log/*': The event log settings and columns.
+    - 'history' and 'history/*': The history settings and metadata and its numeric columns as raw arrays (see `read_snapshot` for memory mapped loading).
+
+    Pickled sections reference simulation objects by id and fall back to `dill` for objects `pickle` can not handle.
+
+    Required Arguments:
+
+    - simulation (Simulation): The simulation to serialize.
+
+    Optional Arguments:
+
+    - compression (str | None): How each section is compressed. One of `SNAPSHOT_COMPRESSIONS`.
+        - Compressed snapshots can not memory map their history.
+        - Default: None
+    - level (int | None): The compression level (zlib) or preset (lzma).
+        - Default: None (the library default)
+
+    Raises:
+
+    - ValueError: If the compression method is not recognized.
+
+    Returns:
+
+    - bytes: The snapshot.
+    """
+    if compression not in SNAPSHOT_COMPRESSIONS:
+        raise ValueError(f"Unknown compression: {compression}")
+    sections = []
+    queue = simulation.__queue__
+    backend = queue.__queue__
+    live = [entry for entry in backend.entries() if entry[2].seq == entry[1]]
+    events = {seq: event for _, seq, event in live}
+
+    def add_object(name, obj, inline=False):
+        sections.append((name, *dump_object(obj, simulation, inline, events)))
+
+    def add_array(name, column):
+        sections.append((name, column.typecode.encode(), column.tobytes()))
+
+    add_object("simulation", type(simulation))
+    add_object("objects", simulation.objects, inline=True)
+    add_object(
+        "attributes",
+        {
+            key: value
+            for key, value in simulation.__dict__.items()
+            if key not in SECTION_ATTRIBUTES
+        },
+    )
+    add_object("random", (simulation.normal_generator, simulation.__streams__))
+
+    graph = simulation.graph
+    csr = graph.get_csr()
+    add_object(
+        "graph",
+        {
+            "type": type(graph),
+            "version": graph.version,
+            "path_cache_size": graph.__path_cache_size__,
+            "tree_cache_size": graph.__tree_cache_size__,
+            "landmarks": graph.__landmarks__,
+        },
+    )
+    for key in ("indptr", "indices", "time", "cashflow", "arc"):
+        add_array(f"graph/{key}", csr[key])
+    add_array("graph/arcs", array("q", [arc.id for arc in graph.__arc_objs__]))
+    add_array(
+        "graph/nodes", array("q", [node.id for node in graph.__node_objs__])
+    )
+
+    backend_name = next(
+        (
+            name
+            for name, backend_type in QUEUE_BACKENDS.items()
+            if type(backend) is backend_type
+        ),
+        None,
+    )
+    columns = {
+        "time": array("d"),
+        "seq": array("q"),
+        "target": array("q"),
+        "method": array("q"),
+        "code": array("q"),
+        "has_code": array("b"),
+        "extra": array("q"),
+    }
+    methods = {}
+    extras = []
+    for time, seq, event in sorted(live, key=lambda entry: entry[:2]):
+        func = event.func
+        target = getattr(func, "__self__", None)
+        name = getattr(func, "__name__", None)
+        if target is simulation:
+            target_id = -1
+        elif (
+            isinstance(target, SimulationObject)
+            and target.__simulation__ is simulation
+        ):
+            target_id = target.id
+        else:
+            target_id = None
+        method = -1
+        extra = -1
+        # Methods are stored by name if looking the name up gives the same method
+        if target_id is None or getattr(target, name, None) != func:
+            target_id = -2
+            extra = len(extras)
+            extras.append((func, event.args, event.kwargs))
+        else:
+            method = methods.setdefault(name, len(methods))
+            if event.args is not None or event.kwargs is not None:
+                extra = len(extras)
+                extras.append((None, event.args, event.kwargs))
+        columns["time"].append(time)
+        columns["seq"].append(seq)
+        columns["target"].append(target_id)
+        columns["method"].append(method)
+        columns["code"].append(event.code if event.code is not None else 0)
+        columns["has_code"].append(event.code is not None)
+        columns["extra"].append(extra)
+    add_object(
+        "queue",
+        {
+            "type": type(queue),
+            "backend": backend_name or type(backend),
+            "current_time": queue.__current_time__,
+            "event_id": queue.__event_id__,
+            "log_events": queue.__log_events__,
+            "precision": queue.__precision__,
+            "methods": list(methods),
+        },
+    )
+    for key, column in columns.items():
+        add_array(f"queue/{key}", column)
+    add_object("queue/extras", extras)
+
+    log = queue.__log__
+    add_object(
+        "log",
+        {
+            "capacity": log.__capacity__,
+            "count": log.__count__,
+            "func_names": log.__func_names__,
+        },
+    )
+    for key in ("time", "event_id", "func_code"):
+        add_array(f"log/{key}", getattr(log, f"__{key}__"))
+
+    history = simulation.history
+    add_object(
+        "history",
+        {
+            "metadata_mode": history.metadata_mode,
+            "metadata_keys": history.metadata_keys,
+            "level": history.level,
+            "batch_size": history.__batch_size__,
+            "drop_completed": history.drop_completed,
+            "flushed": history.__flushed__,
+            "open": history.__open__,
+            "completed": history.__completed__,
+            "meta": history.__column__("__meta__"),
+            "snapshots": history.__snapshots__,
+            "snapshot_index": history.__snapshot_index__,
+            "injected_index": history.__injected_index__,
+        },
+    )
+    for name in HISTORY_COLUMNS:
+        # Rows shared with forks are written as one column (see `HistoryStore.fork`)
+        column = (
+            history.__tails__
+            if name == "__tails__"
+            else history.__column__(name)
+        )
+        if isinstance(column, memoryview):
+            sections.append((f"history/{name}", column.format.encode(), column))
+        else:
+            add_array(f"history/{name}", column)
+
+    compress = {
+        None: lambda data: data,
+        "zlib": lambda data: zlib.compress(
+            data, -1 if level is None else level
+        ),
+        "lzma": lambda data: lzma.compress(data, preset=level),
+    }[compression]
+    offset = HEADER.size + SECTION.size * len(sections)
+    table = []
+    blobs = []
+    for name, kind, data in sections:
+        stored = compress(data)
+        padding = -offset % 8
+        blobs.append(b"\0" * padding)
+        blobs.append(stored)
+        offset += padding
+        table.append(
+            SECTION.pack(
+                name.encode(),
+                kind,
+                offset,
+                len(stored),
+                memoryview(data).nbytes,
+            )
+        )
+        offset += len(stored)
+    return b"".join(
+        [
+            HEADER.pack(
+                SNAPSHOT_MAGIC,
+                SNAPSHOT_VERSION,
+                SNAPSHOT_COMPRESSIONS.index(compression),
+                sys.byteorder == "big",
+                len(sections),
+            ),
+            *table,
+            *blobs,
+        ]
+    )
+
+
+def read_snapshot(
+    data, memory_map: bool = False, history_sink: HistorySink | None = None
+):
+    """
+    Rebuilds a simulation from a snapshot written by `write_snapshot`.
+
+    Required Arguments:
+
+    - data (bytes-like): The snapshot. This can be a `mmap.mmap` of a snapshot file.
+
+    Optional Arguments:
+
+    - memory_map (bool): If True, the history columns of an uncompressed snapshot are read in place from `data` instead of being copied.
+        - The history copies its columns the first time it records or changes an entry (see `HistoryStore.fork`), so reading a large history does not load it into memory.
+        - Ignored for compressed snapshots or snapshots written on a machine with a different byte order.
+        - Default: False
+    - history_sink (HistorySink | None): If provided, history entries recorded after the snapshot (and any not yet written when it was taken) are streamed to this sink. See `HistoryStore.set_sink`.
+        - Required if the history drops completed Orders, since sinks are not part of the snapshot.
+        - Default: None
+
+    Raises:
+
+    - ValueError: If the data is not a snapshot or was written by a newer version of the format.
+    - ValueError: If the history drops completed Orders and no history_sink is provided.
+
+    Returns:
+
+    - Simulation: The rebuilt simulation.
+    """
+    view = memoryview(data)
+    if len(view) < HEADER.size or not is_snapshot(view):
+        raise ValueError("The data is not a simulation snapshot")
+    _, version, compression, big_endian, count = HEADER.unpack_from(view)
+    if version > SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {version}")
+    compression = SNAPSHOT_COMPRESSIONS[compression]
+    swap = big_endian != (sys.byteorder == "big")
+    decompress = {
+        None: lambda data: data,
+        "zlib": zlib.decompress,
+        "lzma": lzma.decompress,
+    }[compression]
+    sections = {}
+    for idx in range(count):
+        name, kind, offset, size, _ = SECTION.unpack_from(
+            view, HEADER.size + idx * SECTION.size
+        )
+        sections[name.rstrip(b"\0").decode()] = (
+            kind,
+            view[offset : offset + size],
+        )
+
+    def get_array(name):
+        kind, stored = sections[name]
+        column = array(kind.decode())
+        column.frombytes(decompress(stored))
+        if swap:
+            column.byteswap()
+        return column
+
+    def get_object(name):
+        kind, stored = sections[name]
+        return load_object(
+            kind, decompress(stored), simulation, objects, events
+        )
+
+    simulation = None
+    objects = []
+    # Scheduled events are created first so that handles held by objects resolve to them
+    columns = {
+        key: get_array(f"queue/{key}")
+        for key in (
+            "time",
+            "seq",
+            "target",
+            "method",
+            "code",
+            "has_code",
+            "extra",
+        )
+    }
+    events = {
+        seq: Event(time, seq, None, code=code if has_code else None)
+        for time, seq, code, has_code in zip(
+            columns["time"],
+            columns["seq"],
+            columns["code"],
+            columns["has_code"],
+        )
+    }
+    simulation_type = get_object("simulation")
+    simulation = simulation_type.__new__(simulation_type)
+    objects = get_object("objects")
+    simulation.objects = objects
+    simulation.orders = [obj for obj in objects if isinstance(obj, Order)]
+
+    simulation.__dict__.update(get_object("attributes"))
+
+    simulation.normal_generator, simulation.__streams__ = get_object("random")
+
+    settings = get_object("graph")
+    graph = simulation.graph = settings["type"](
+        path_cache_size=settings["path_cache_size"],
+        tree_cache_size=settings["tree_cache_size"],
+    )
+    csr = {
+        key: get_array(f"graph/{key}")
+        for key in ("indptr", "indices", "time", "cashflow", "arc")
+    }
+    graph.version = settings["version"]
+    graph.__csr__ = csr
+    graph.__landmarks__ = settings["landmarks"]
+    graph.__arc_objs__ = [objects[idx] for idx in get_array("graph/arcs")]
+    graph.__arc_index__ = {
+        arc.id: idx for idx, arc in enumerate(graph.__arc_objs__)
+    }
+    graph.__node_objs__ = [objects[idx] for idx in get_array("graph/nodes")]
+    graph.__in_edges__ = [set() for _ in graph.__node_objs__]
+    indptr = csr["indptr"]
+    for origin_id in range(len(indptr) - 1):
+        for position in range(indptr[origin_id], indptr[origin_id + 1]):
+            graph.__in_edges__[csr["indices"][position]].add(origin_id)
+
+    settings = get_object("queue")
+    backend = settings["backend"]
+    queue = simulation.__queue__ = settings["type"](
+        log_events=settings["log_events"],
+        precision=settings["precision"],
+        backend=backend if isinstance(backend, str) else backend(),
+    )
+    queue.__current_time__ = settings["current_time"]
+    queue.__event_id__ = settings["event_id"]
+    methods = settings["methods"]
+    extras = get_object("queue/extras")
+    entries = []
+    for time, seq, target_id, method, extra in zip(
+        columns["time"],
+        columns["seq"],
+        columns["target"],
+        columns["method"],
+        columns["extra"],
+    ):
+        func, args, kwargs = extras[extra] if extra >= 0 else (None, None, None)
+        if target_id != -2:
+            target = simulation if target_id == -1 else objects[target_id]
+            func = getattr(target, methods[method])
+        event = events[seq]
+        event.func = func
+        event.args = args
+        event.kwargs = kwargs
+        entries.append((time, seq, event))
+    queue.__queue__.rebuild(entries)
+    queue.__live__ = len(entries)
+
+    settings = get_object("log")
+    log = queue.__log__ = EventLog(capacity=settings["capacity"])
+    log.__count__ = settings["count"]
+    log.__func_names__ = settings["func_names"]
+    log.__func_codes__ = {
+        name: code for code, name in enumerate(settings["func_names"])
+    }
+    for key in ("time", "event_id", "func_code"):
+        setattr(log, f"__{key}__", get_array(f"log/{key}"))
+
+    settings = get_object("history")
+    history = simulation.history = HistoryStore(
+        metadata_mode=settings["metadata_mode"],
+        metadata_keys=settings["metadata_keys"],
+        level=settings["level"],
+        batch_size=settings["batch_size"],
+    )
+    # Completed Orders are only dropped once they were written to a sink
+    history.drop_completed = settings["drop_completed"]
+    history.__flushed__ = settings["flushed"]
+    history.__open__ = settings["open"]
+    history.__completed__ = settings["completed"]
+    history.__meta__ = settings["meta"]
+    history.__snapshots__ = settings["snapshots"]
+    history.__snapshot_index__ = settings["snapshot_index"]
+    history.__injected_index__ = settings["injected_index"]
+    memory_map = memory_map and compression is None and not swap
+    for name in HISTORY_COLUMNS:
+        if memory_map:
+            kind, stored = sections[f"history/{name}"]
+            setattr(history, name, stored.cast(kind.decode()))
+        else:
+            setattr(history, name, get_array(f"history/{name}"))
+    # Memory mapped columns are read only, so copy them before writing
+    history.__shared__ = memory_map
+    if history_sink is not None:
+        history.set_sink(history_sink)
+    elif history.drop_completed:
+        raise ValueError(
+            "A history_sink is required to restore a simulation that drops completed Orders"
+        )
+    return simulation
+
+
+def save_snapshot(
+    simulation,
+    filename: str,
+    compression: str | None = None,
+    level: int | None = None,
+) -> str:
+    """
+    Writes a simulation snapshot (see `write_snapshot`) to a file.
+
+    Required Arguments:
+
+    - simulation (Simulation): The simulation to serialize.
+    - filename (str): The file path to write to.
+
+    Optional Arguments:
+
+    - compression (str | None): How each section is compressed. One of `SNAPSHOT_COMPRESSIONS`.
+        - Default: None
+    - level (int | None): The compression level (zlib) or preset (lzma).
+        - Default: None (the library default)
+
+    Returns:
+
+    - str: The filename that was written.
+    """
+    with open(filename, "wb") as f:
+        f.write(
+            write_snapshot(simulation, compression=compression, level=level)
+        )
+    return filename
+
+
+def load_snapshot(
+    filename: str,
+    memory_map: bool = False,
+    history_sink: HistorySink | None = None,
+):
+    """
+    Reads a simulation snapshot (see `read_snapshot`) from a file.
+
+    Required Arguments:
+
+    - filename (str): The file path to read from.
+
+    Optional Arguments:
+
+    - memory_map (bool): If True, the file is memory mapped and the history columns of an uncompressed snapshot are read from the mapping on demand.
+        - The mapping stays open while the history uses it.
+        - Default: False
+    - history_sink (HistorySink | None): The sink to stream later history entries to. See `read_snapshot`.
+        - Default: None
+
+    Returns:
+
+    - Simulation: The rebuilt simulation.
+    """
+    with open(filename, "rb") as f:
+        if memory_map:
+            return read_snapshot(
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ),
+                memory_map=True,
+                history_sink=history_sink,
+            )
+        return read_snapshot(f.read(), history_sink=history_sink)
@@ -1,4 +1,33 @@
 import random
+from hashlib import sha256
+from math import cos, log, sin, sqrt, tau as TWO_PI
+from typing import Iterator, Literal
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def derive_seed(seed: int | None, *keys) -> int | None:
+    """
+    Derives an independent, reproducible seed for a substream from a root seed and a stream key.
+
+    Seeds are derived by hashing, so they do not depend on the order in which substreams are created and are stable across processes and Python sessions.
+
+    Required Arguments:
+
+    - seed (int | None): The root seed. If None, None is returned (an unseeded substream).
+    - keys: Hashable values (e.g. strings and integers) identifying the substream.
+
+    Returns:
+
+    - int | None: The derived 64 bit seed.
+    """
+    if seed is None:
+        return None
+    digest = sha256(repr((seed,) + keys).encode()).digest()
+    return int.from_bytes(digest[:8], "big")
 
 
 def hard_round(value: float, decimals: int = 2) -> float:
@@ -23,11 +52,146 @@ def hard_round(value: float, decimals: int = 2) -> float:
 
 
 class NormalGenerator:
-    def __init__(self, seed=None):
+    def __init__(
+        self,
+        seed: int | None = None,
+        block_size: int = 4096,
+        backend: Literal["auto", "numpy", "python"] = "auto",
+        antithetic: bool = False,
+        max_buffers: int = 64,
+    ):
+        """
+        Initializes a buffered generator of (optionally truncated and rounded) normal random variates.
+
+        Variates are drawn in blocks and each distinct (mean, sigma, min, precision) combination gets its own buffer.
+        The mean, sigma, minimum and rounding are applied to a whole block at refill time and each call only reads the next value from the buffer.
+        Buffers start small and double in size on each refill up to `block_size`, so rarely used parameter combinations do not hold large buffers.
+        At most `max_buffers` combinations are buffered at once. When a new one is needed, the combination refilled least recently is dropped with its remaining variates, so changing parameters over a long run does not grow memory.
+
+        The same seed, backend and sequence of calls always give the same values.
+
+        Optional Arguments:
+
+        - seed (int | None): The random seed.
+            - Default: None
+        - block_size (int): The maximum number of variates drawn per refill.
+            - Default: 4096
+        - backend (Literal['auto', 'numpy', 'python']): How blocks are drawn and transformed.
+            - 'numpy': Use NumPy's `Generator.standard_normal` and vectorised transforms.
+            - 'python': Use the standard library `random` module.
+            - 'auto': Use NumPy if it is installed, otherwise the standard library.
+            - Default: 'auto'
+        - antithetic (bool): If True, every standard normal draw is negated (`mean - sigma * z` instead of `mean + sigma * z`).
+            - A generator with the same seed and antithetic=True gives the antithetic pair of a generator with antithetic=False.
+            - Default: False
+        - max_buffers (int): The maximum number of parameter combinations buffered at once.
+            - Default: 64
+
+        Raises:
+
+        - ImportError: If the backend is 'numpy' and NumPy is not installed.
+        - ValueError: If the backend is not recognized or block_size or max_buffers is not positive.
+        """
+        if backend not in ("auto", "numpy", "python"):
+            raise ValueError(f"Unknown backend: {backend}")
+        if backend == "numpy" and np is None:
+            raise ImportError("NumPy is required for the numpy backend")
+        if block_size <= 0:
+            raise ValueError("block_size must be a positive integer")
+        if max_buffers <= 0:
+            raise ValueError("max_buffers must be a positive integer")
         self.random = random.Random(seed)
+        self.__numpy_random__ = (
+            np.random.default_rng(seed)
+            if np is not None and backend != "python"
+            else None
+        )
+        self.__block_size__ = block_size
+        self.__sign__ = -1.0 if antithetic else 1.0
+        self.__max_buffers__ = max_buffers
+        # Maps (mean, sigma, min, precision) to an iterator over its buffered variates, least recently refilled first
+        self.__buffers__ = {}
+        # Maps (mean, sigma, min, precision) to the size of its last block
+        self.__sizes__ = {}
+
+    def __refill__(self, key: tuple) -> Iterator[float]:
+        """
+        An internal method to draw and transform a new block of variates for a parameter combination.
+
+        Required Arguments:
+
+        - key (tuple): The (mean, sigma, min, precision) parameters.
+
+        Returns:
+
+        - Iterator[float]: An iterator over the new block, which is also stored as the buffer of the parameters.
+        """
+        mean, sigma, min, precision = key
+        buffers = self.__buffers__
+        # Refilled combinations move to the end so the first one is the least recently refilled
+        if (
+            buffers.pop(key, None) is None
+            and len(buffers) >= self.__max_buffers__
+        ):
+            evicted = next(iter(buffers))
+            del buffers[evicted]
+            del self.__sizes__[evicted]
+        sigma = self.__sign__ * sigma
+        size = self.__sizes__.get(key, 32) * 2
+        size = self.__block_size__ if size > self.__block_size__ else size
+        self.__sizes__[key] = size
+        if self.__numpy_random__ is not None:
+            values = mean + sigma * self.__numpy_random__.standard_normal(size)
+            if min is not None:
+                values = np.maximum(values, min)
+            values = np.round(values, precision).tolist()
+        else:
+            # Box-Muller transform on a block of uniform variates
+            rand = self.random.random
+            half = (size + 1) // 2
+            radii = [sqrt(-2.0 * log(1.0 - rand())) for _ in range(half)]
+            angles = [TWO_PI * rand() for _ in range(half)]
+            values = [
+                mean + sigma * radius * cos(angle)
+                for radius, angle in zip(radii, angles)
+            ] + [
+                mean + sigma * radius * sin(angle)
+                for radius, angle in zip(radii, angles)
+            ]
+            del values[size:]
+            if min is not None:
+                values = [min if value < min else value for value in values]
+            values = [round(value, precision) for value in values]
+        buffer = self.__buffers__[key] = iter(values)
+        return buffer
+
+    def __call__(
+        self,
+        mean: float,
+        sigma: float,
+        min: float | None = None,
+        precision: int = 6,
+    ) -> float:
+        """
+        Returns the next normal random variate for the given parameters.
+
+        Required Arguments:
+
+        - mean (float): The mean of the distribution.
+        - sigma (float): The standard deviation of the distribution.
+
+        Optional Arguments:
+
+        - min (float | None): The minimum value returned (lower values are raised to it).
+            - Default: None
+        - precision (int): The number of decimal places to round to.
+            - Default: 6
+
+        Returns:
 
-    def __call__(self, mean, sigma, min=None, precision=6):
-        output = self.random.gauss(mean, sigma)
-        if min is not None:
-            output = max(min, output)
-        return round(output, precision)
+        - float: The variate.
+        """
+        try:
+            return next(self.__buffers__[(mean, sigma, min, precision)])
+        except (KeyError, StopIteration):
+            return next(self.__refill__((mean, sigma, min, precision)))
@@ -0,0 +1,37 @@
+from scar_sim.queue import Queue
+
+fired = []
+
+queue = Queue()
+handles = [
+    queue.add(time_delta=float(i), func=fired.append, args=(i,))
+    for i in range(10)
+]
+
+passing = True
+err_msg = ""
+
+# Cancel every odd event and move event 2 to the end of the run
+for handle in handles[1::2]:
+    queue.cancel(handle)
+queue.reschedule(handles[2], 20.0)
+
+if len(queue.__queue__) > 2 * queue.__live__:
+    passing = False
+    err_msg = "Heap holds more tombstones than live events."
+if queue.cancel(handles[1]):
+    passing = False
+    err_msg = "Cancelling an already cancelled event should return False."
+
+queue.run(max_time=30.0)
+
+if fired != [0, 4, 6, 8, 2]:
+    passing = False
+    err_msg = f"Unexpected event order after cancel/reschedule: {fired}"
+if queue.is_pending(handles[2]):
+    passing = False
+    err_msg = "Processed events should no longer be pending."
+
+print("03: Cancel/Reschedule Test Passed:", passing)
+if not passing:
+    print("    -", err_msg)
@@ -0,0 +1,83 @@
+import random
+from bisect import insort
+from scar_sim.queue import Queue, QueueBackend
+
+
+def run_queue(backend):
+    rng = random.Random(7)
+    fired = []
+    queue = Queue(backend=backend)
+
+    def spawn(label):
+        fired.append((queue.__current_time__, label))
+        # Schedule clustered follow up events, including ties at the same time
+        if label < 5000:
+            for offset in range(2):
+                queue.add(
+                    time_delta=round(rng.choice([0.0, 0.5, rng.random()]), 2),
+                    func=spawn,
+                    args=(label * 2 + offset + 1,),
+                )
+
+    handles = [
+        queue.add(time_delta=rng.random() * 10, func=spawn, args=(i,))
+        for i in range(200)
+    ]
+    for handle in handles[::3]:
+        queue.cancel(handle)
+    for handle in handles[1::3]:
+        queue.reschedule(handle, rng.random() * 100)
+    queue.run(max_time=1000.0)
+    return fired
+
+
+class ListBackend(QueueBackend):
+    # A minimal custom backend relying on the default push_many and pop_due
+    def __init__(self):
+        self.items = []
+
+    def push(self, entry):
+        insort(self.items, entry)
+
+    def pop(self):
+        return self.items.pop(0)
+
+    def peek(self):
+        return self.items[0]
+
+    def entries(self):
+        return list(self.items)
+
+    def rebuild(self, entries):
+        self.items = sorted(entries)
+
+    def __len__(self):
+        return len(self.items)
+
+
+heap_events = run_queue("heap")
+calendar_events = run_queue("calendar")
+
+passing = True
+err_msg = ""
+if heap_events != calendar_events:
+    passing = False
+    err_msg = (
+        "Heap and calendar backends processed events in a different order."
+    )
+if run_queue(ListBackend()) != heap_events:
+    passing = False
+    err_msg = "Custom backends processed events in a different order."
+try:
+    QueueBackend()
+    passing = False
+    err_msg = "The QueueBackend interface should not be instantiable."
+except TypeError:
+    pass
+if heap_events != sorted(heap_events, key=lambda x: x[0]):
+    passing = False
+    err_msg = "Events were not processed in chronological order."
+
+print("04: Queue Backends Test Passed:", passing)
+if not passing:
+    print("    -", err_msg)
@@ -0,0 +1,41 @@
+from scar_sim.queue import Queue
+
+
+def tick():
+    pass
+
+
+def tock():
+    pass
+
+
+queue = Queue(log_events=True, log_capacity=5)
+for i in range(12):
+    queue.add(time_delta=float(i), func=tick if i % 2 == 0 else tock)
+queue.run(max_time=20.0)
+
+log = queue.__log__
+columns = log.to_columns()
+csv_text = "".join(log.iter_csv_chunks(chunk_size=2))
+
+passing = True
+err_msg = ""
+if len(log) != 5 or log.total_events != 12:
+    passing = False
+    err_msg = "Ring buffer did not keep only the most recent events."
+if columns["time"] != [7.0, 8.0, 9.0, 10.0, 11.0]:
+    passing = False
+    err_msg = f"Unexpected logged times: {columns['time']}"
+if columns["func"] != ["tock", "tick", "tock", "tick", "tock"]:
+    passing = False
+    err_msg = f"Unexpected logged functions: {columns['func']}"
+if log.bytes_per_event != 20:
+    passing = False
+    err_msg = "Unexpected number of bytes per logged event."
+if csv_text.splitlines()[:2] != ["event_id,time,func", "8,7.0,tock"]:
+    passing = False
+    err_msg = "Unexpected CSV export."
+
+print("05: Event Log Test Passed:", passing)
+if not passing:
+    print("    -", err_msg)
@@ -0,0 +1,164 @@
+from scar_sim.entity import Node, Arc
+from scar_sim.history import HistoryStore, np
+from scar_sim.order import ARRIVED, COMPLETED, SHIPPED, STARTED, Order
+from scar_sim.simulation import Simulation
+
+passing = True
+err_msg = ""
+
+nodes = [Node(metadata={"name": f"node_{idx}"}) for idx in range(2)]
+for idx, node in enumerate(nodes):
+    node.id = idx
+
+store = HistoryStore()
+indices = [store.add_order() for _ in range(3)]
+if indices != [0, 1, 2]:
+    passing = False
+    err_msg = f"Unexpected Order indices: {indices}"
+
+# Entries of different Orders are interleaved as they would be in a simulation
+entries = [
+    (0, 0.0, STARTED, 0),
+    (1, 0.5, STARTED, 0),
+    (0, 1.0, SHIPPED, 0),
+    (2, 1.5, STARTED, 1),
+    (1, 2.0, SHIPPED, 0),
+    (0, 3.0, ARRIVED, 1),
+    (2, 3.5, COMPLETED, 1),
+    (0, 3.0, COMPLETED, 1),
+]
+previous = {}
+for order_idx, time, status, node_idx in entries:
+    store.append(
+        order_idx=order_idx,
+        time=time,
+        time_delta=time - previous.get(order_idx, time),
+        order_id=10 + order_idx,
+        entity=nodes[node_idx],
+        status=status,
+        injected_metadata={"order": order_idx},
+    )
+    previous[order_idx] = time
+    # Only the latest entry of an Order gets the cashflow
+    store.set_cashflow(order_idx, -float(len(store)))
+
+expected_rows = {0: [0, 2, 5, 7], 1: [1, 4], 2: [3, 6]}
+for order_idx, rows in expected_rows.items():
+    if store.get_rows(order_idx) != rows:
+        passing = False
+        err_msg = f"Rows of Order {order_idx} are not chained: {store.get_rows(order_idx)}"
+history = store.get_order_history(0)
+if [entry["status"] for entry in history] != [
+    "started",
+    "shipped",
+    "arrived",
+    "completed",
+] or [entry["time_delta"] for entry in history] != [0.0, 1.0, 2.0, 0.0]:
+    passing = False
+    err_msg = "Unexpected history entries of Order 0."
+if history[1]["meta"] != {"name": "node_0", "order": 0}:
+    passing = False
+    err_msg = f"Unexpected history metadata: {history[1]['meta']}"
+
+columns = store.to_columns()
+if columns["cashflow"] != [-float(row + 1) for row in range(len(entries))]:
+    passing = False
+    err_msg = (
+        f"set_cashflow should only change the latest row: {columns['cashflow']}"
+    )
+if (
+    columns["order_id"] != [10 + entry[0] for entry in entries]
+    or columns["time"] != [entry[1] for entry in entries]
+    or columns["current_obj_id"] != [entry[3] for entry in entries]
+    or columns["status"][3] != "started"
+    or columns["meta"][3] != {"name": "node_1", "order": 2}
+):
+    passing = False
+    err_msg = "Columns should hold the entries in the order they were recorded."
+if [store.get_row(row) for row in range(len(store))] != [
+    dict(zip(columns, values)) for values in zip(*columns.values())
+]:
+    passing = False
+    err_msg = "Rows and columns should hold the same entries."
+
+if np is None:
+    try:
+        store.to_numpy()
+        passing = False
+        err_msg = (
+            "Exporting to NumPy without NumPy should raise an ImportError."
+        )
+    except ImportError:
+        pass
+else:
+    arrays = store.to_numpy()
+    if (
+        arrays["time"].tolist() != columns["time"]
+        or arrays["cashflow"].tolist() != columns["cashflow"]
+        or [arrays["status_names"][code] for code in arrays["status_code"]]
+        != columns["status"]
+    ):
+        passing = False
+        err_msg = "NumPy arrays should match the columns."
+    # The arrays are copies
+    arrays["time"][0] = 100.0
+    if store.to_columns()["time"][0] != 0.0:
+        passing = False
+        err_msg = "NumPy arrays should not share memory with the store."
+
+store.add_order()
+try:
+    store.set_cashflow(3, 1.0)
+    passing = False
+    err_msg = "Setting the cashflow of an Order without entries should raise an error."
+except IndexError:
+    pass
+
+# Order histories read through the chains match the columns of a simulation
+simulation = Simulation()
+sim_nodes = [
+    simulation.add_object(
+        Node(
+            processing_min_time=0.1,
+            processing_avg_time=1.0,
+            processing_sd_time=0.5,
+            processing_cashflow_per_unit=-1.0,
+        )
+    )
+    for _ in range(3)
+]
+for idx in range(2):
+    simulation.add_object(
+        Arc(
+            origin_node=sim_nodes[idx],
+            destination_node=sim_nodes[idx + 1],
+            processing_min_time=0.1,
+            processing_avg_time=2.0,
+            processing_sd_time=1.0,
+            processing_cashflow_per_unit=-3.0,
+        )
+    )
+path = simulation.graph.get_optimal_path(sim_nodes[0], sim_nodes[2], "time")
+for idx in range(20):
+    order = simulation.add_object(
+        Order(sim_nodes[0], sim_nodes[2], 1, list(path))
+    )
+    simulation.add_event(time_delta=idx * 0.2, func=order.start)
+simulation.run(max_time=100.0)
+columns = simulation.history.to_columns()
+for order in simulation.orders:
+    expected = [
+        dict(zip(columns, values))
+        for values in zip(*columns.values())
+        if values[2] == order.id
+    ]
+    if order.history != expected:
+        passing = False
+        err_msg = f"The history of Order {order.id} does not match the columns."
+if len(set(columns["order_id"][:20])) < 2:
+    passing = False
+    err_msg = "Expected the entries of different Orders to interleave."
+
+print(f"06: History Store Test Passed: {passing}")
+if not passing:
+    print(err_msg)
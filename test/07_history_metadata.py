@@ -0,0 +1,82 @@
+from scar_sim.entity import Node, Arc
+from scar_sim.order import Order
+from scar_sim.simulation import Simulation
+
+
+def build(**kwargs):
+    simulation = Simulation(**kwargs)
+    origin = simulation.add_object(
+        Node(
+            processing_avg_time=1.0,
+            processing_cashflow_per_unit=-5,
+            metadata={"loc": "origin", "otype": "node", "extra": 1},
+        )
+    )
+    destination = simulation.add_object(
+        Node(
+            processing_avg_time=1.0,
+            metadata={"loc": "destination", "otype": "node", "extra": 2},
+        )
+    )
+    simulation.add_object(
+        Arc(
+            origin_node=origin,
+            destination_node=destination,
+            processing_avg_time=2.0,
+            processing_cashflow_per_unit=-3,
+            metadata={"loc": "lane", "otype": "arc", "extra": 3},
+        )
+    )
+    for delay in [0.0, 5.0]:
+        order = simulation.add_object(
+            Order(
+                origin_node=origin,
+                destination_node=destination,
+                units=2,
+                planned_path=simulation.graph.get_optimal_path(
+                    origin, destination, "time"
+                ),
+            )
+        )
+        simulation.add_event(time_delta=delay, func=order.start)
+    # Relabel the origin between the two orders
+    simulation.add_event(
+        time_delta=2.0, func=origin.update_metadata, kwargs={"loc": "moved"}
+    )
+    simulation.run(max_time=20.0)
+    return simulation
+
+
+copied = build()
+interned = build(history_metadata="intern")
+projected = build(history_metadata="intern", history_metadata_keys=["loc"])
+
+passing = True
+err_msg = ""
+if copied.history.to_columns() != interned.history.to_columns():
+    passing = False
+    err_msg = "Interned metadata does not match copied metadata."
+if [row["meta"]["loc"] for row in interned.orders[0].history][:2] != [
+    "origin",
+    "origin",
+]:
+    passing = False
+    err_msg = "Metadata changes rewrote earlier history entries."
+if interned.orders[1].history[0]["meta"]["loc"] != "moved":
+    passing = False
+    err_msg = "Metadata changes were not picked up by later entries."
+if any(set(meta) != {"loc"} for meta in projected.history.to_columns()["meta"]):
+    passing = False
+    err_msg = "Metadata key projection was not applied."
+if [row["cashflow"] for row in copied.orders[0].history] != [
+    0.0,
+    -10.0,
+    -6.0,
+    0.0,
+]:
+    passing = False
+    err_msg = "Unexpected cashflows in the history store."
+
+print("07: History Metadata Test Passed:", passing)
+if not passing:
+    print("    -", err_msg)
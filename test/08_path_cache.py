@@ -0,0 +1,84 @@
+import random
+from scgraph import Graph as SCGraph
+from scar_sim.entity import Node, Arc
+from scar_sim.simulation import Simulation
+
+rng = random.Random(11)
+simulation = Simulation()
+nodes = [
+    simulation.add_object(
+        Node(
+            processing_avg_time=rng.uniform(0.1, 2),
+            processing_cashflow_per_unit=-rng.uniform(1, 20),
+        )
+    )
+    for _ in range(40)
+]
+arcs = []
+for idx, node in enumerate(nodes):
+    for other in rng.sample(nodes, 3) + [nodes[(idx + 1) % len(nodes)]]:
+        if other is not node:
+            arcs.append(
+                simulation.add_object(
+                    Arc(
+                        origin_node=node,
+                        destination_node=other,
+                        is_symmetric=rng.random() < 0.5,
+                        processing_avg_time=rng.uniform(0.5, 5),
+                        processing_cashflow_per_unit=-rng.uniform(1, 50),
+                    )
+                )
+            )
+
+graph = simulation.graph
+lanes = [tuple(rng.sample(nodes, 2)) for _ in range(60)]
+
+passing = True
+err_msg = ""
+for step in range(30):
+    for origin, destination in lanes:
+        for graph_type in ["time", "cashflow"]:
+            path = graph.get_optimal_path(origin, destination, graph_type)
+            expected = SCGraph(
+                graph.cashflow_graph
+                if graph_type == "cashflow"
+                else graph.time_graph
+            ).dijkstra(origin.inbound_graph_id, destination.inbound_graph_id)
+            weight = abs(graph.get_path_weight(path, graph_type))
+            if abs(weight - expected["length"]) > 1e-9:
+                passing = False
+                err_msg = f"Stale cached {graph_type} path at step {step}."
+    for origin in nodes[:5]:
+        for graph_type in ["time", "cashflow"]:
+            paths = graph.get_optimal_paths(origin, nodes, graph_type)
+            expected = SCGraph(
+                graph.cashflow_graph
+                if graph_type == "cashflow"
+                else graph.time_graph
+            ).get_shortest_path_tree(origin.inbound_graph_id)
+            for destination, path in zip(nodes, paths):
+                weight = abs(graph.get_path_weight(path, graph_type))
+                if (
+                    abs(
+                        weight
+                        - expected["distance_matrix"][
+                            destination.inbound_graph_id
+                        ]
+                    )
+                    > 1e-9
+                ):
+                    passing = False
+                    err_msg = f"Stale {graph_type} tree at step {step}."
+    # Disrupt or restore a few entities between rounds
+    for entity in rng.sample(arcs + nodes, 5):
+        if rng.random() < 0.5:
+            entity.change_processing_parameters(
+                processing_avg_time=rng.uniform(0.1, 10),
+                processing_cashflow_per_unit=-rng.uniform(1, 60),
+            )
+        else:
+            entity.reset_processing_parameters()
+
+print("08: Path Cache Test Passed:", passing)
+if not passing:
+    print("    -", err_msg)
@@ -0,0 +1,86 @@
+import random
+from scar_sim.entity import Node, Arc
+from scar_sim.routing import shortest_path_tree
+from scar_sim.simulation import Simulation
+
+rng = random.Random(29)
+simulation = Simulation()
+nodes = [
+    simulation.add_object(
+        Node(
+            processing_avg_time=rng.randint(0, 3),
+            processing_cashflow_per_unit=-rng.randint(0, 10),
+        )
+    )
+    for _ in range(60)
+]
+arcs = []
+for idx, node in enumerate(nodes):
+    # Sparse random arcs with small integer weights give many equal length paths
+    for other in rng.sample(nodes, 2):
+        if other is not node:
+            arcs.append(
+                simulation.add_object(
+                    Arc(
+                        origin_node=node,
+                        destination_node=other,
+                        is_symmetric=rng.random() < 0.3,
+                        processing_avg_time=rng.randint(1, 6),
+                        processing_cashflow_per_unit=-rng.randint(1, 20),
+                    )
+                )
+            )
+
+graph = simulation.graph
+origins = nodes[:8]
+
+passing = True
+err_msg = ""
+for step in range(200):
+    for origin in origins:
+        for graph_type in ("time", "cashflow"):
+            # Cached trees are repaired in place, fresh ones are built from scratch
+            tree = graph.get_shortest_path_tree(origin, graph_type)
+            fresh = shortest_path_tree(
+                graph.__compact__(), graph_type, origin.inbound_graph_id
+            )
+            if any(
+                abs(repaired - expected) > 1e-9
+                for repaired, expected in zip(
+                    tree["distance"], fresh["distance"]
+                )
+                if repaired != expected
+            ):
+                passing = False
+                err_msg = f"Repaired {graph_type} tree distances differ from a fresh tree at step {step}."
+            # Ties may pick other predecessors, but each tree path must have the tree distance
+            for destination in nodes:
+                distance = tree["distance"][destination.inbound_graph_id]
+                if distance == float("inf"):
+                    continue
+                path = graph.get_tree_path(tree, destination)
+                weight = abs(graph.get_path_weight(path, graph_type))
+                if abs(weight - distance) > 1e-9:
+                    passing = False
+                    err_msg = f"Repaired {graph_type} tree has a broken path at step {step}."
+    # Increase or decrease one entity's weights at a time, so both repairs run often
+    entity = rng.choice(arcs + nodes)
+    if rng.random() < 0.5:
+        entity.change_processing_parameters(
+            processing_avg_time=entity.processing_time_avg + rng.randint(1, 5),
+            processing_cashflow_per_unit=entity.processing_cashflow_per_unit
+            - rng.randint(1, 10),
+        )
+    else:
+        entity.change_processing_parameters(
+            processing_avg_time=max(
+                entity.processing_time_avg - rng.randint(1, 5), 0
+            ),
+            processing_cashflow_per_unit=min(
+                entity.processing_cashflow_per_unit + rng.randint(1, 10), 0
+            ),
+        )
+
+print(f"09: Tree Repair Test Passed: {passing}")
+if not passing:
+    print(err_msg)
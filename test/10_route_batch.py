@@ -0,0 +1,75 @@
+import random
+from scar_sim.entity import Node, Arc
+from scar_sim.simulation import Simulation
+
+rng = random.Random(5)
+simulation = Simulation()
+nodes = [
+    simulation.add_object(
+        Node(
+            processing_avg_time=rng.uniform(0.1, 2),
+            processing_cashflow_per_unit=-rng.uniform(1, 20),
+        )
+    )
+    for _ in range(30)
+]
+for idx, node in enumerate(nodes):
+    for other in rng.sample(nodes, 2) + [nodes[(idx + 1) % len(nodes)]]:
+        if other is not node:
+            simulation.add_object(
+                Arc(
+                    origin_node=node,
+                    destination_node=other,
+                    is_symmetric=rng.random() < 0.3,
+                    processing_avg_time=rng.uniform(0.5, 5),
+                    processing_cashflow_per_unit=-rng.uniform(1, 50),
+                )
+            )
+# An isolated node that can not be reached
+isolated = simulation.add_object(Node())
+
+graph = simulation.graph
+pairs = [
+    (origin, destination)
+    for origin in nodes[:8]
+    for destination in nodes + [isolated]
+    if destination is not origin
+]
+
+
+def check(results: list) -> str:
+    if len(results) != len(pairs):
+        return f"Expected {len(pairs)} results, got {len(results)}."
+    for (origin, destination), result in zip(pairs, results):
+        if result[0] is not origin or result[1] is not destination:
+            return "Results are not in the same order as the pairs."
+        if destination is isolated:
+            if result[2] is not None:
+                return "Unreachable destinations should give None."
+            continue
+        expected = graph.get_route_options(origin, destination)
+        for option in ["min_time", "min_cashflow"]:
+            got = result[2][option]
+            for key in ["time", "cashflow"]:
+                if (
+                    abs(got[key] - graph.get_path_weight(got["path"], key))
+                    > 1e-9
+                ):
+                    return f"Inconsistent {option} {key} for a batch result."
+            metric = "time" if option == "min_time" else "cashflow"
+            if abs(got[metric] - expected[option][metric]) > 1e-9:
+                return f"Suboptimal {option} path in batch results."
+    return ""
+
+
+if __name__ == "__main__":
+    passing = True
+    err_msg = check(list(graph.get_route_options_batch(pairs)))
+    if not err_msg:
+        err_msg = check(list(graph.get_route_options_batch(pairs, workers=2)))
+    if err_msg:
+        passing = False
+
+    print("10: Route Batch Test Passed:", passing)
+    if not passing:
+        print("    -", err_msg)
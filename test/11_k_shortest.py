@@ -0,0 +1,143 @@
+import random
+from scar_sim.entity import Node, Arc
+from scar_sim.order import Order
+from scar_sim.simulation import Simulation
+
+rng = random.Random(3)
+simulation = Simulation()
+nodes = [
+    simulation.add_object(
+        Node(
+            processing_avg_time=rng.uniform(0.1, 1),
+            processing_cashflow_per_unit=-rng.uniform(1, 5),
+        )
+    )
+    for _ in range(8)
+]
+arcs = {}
+for idx, node in enumerate(nodes):
+    for other in rng.sample(nodes, 3):
+        if other is not node and (node, other) not in arcs:
+            arcs[(node, other)] = simulation.add_object(
+                Arc(
+                    origin_node=node,
+                    destination_node=other,
+                    is_symmetric=False,
+                    processing_avg_time=rng.uniform(0.5, 5),
+                    processing_cashflow_per_unit=-rng.uniform(1, 50),
+                )
+            )
+graph = simulation.graph
+
+
+def all_path_lengths(graph_obj, origin_id, destination_id):
+    # Brute force every loopless path
+    lengths = []
+    stack = [(origin_id, [origin_id], 0.0)]
+    while stack:
+        current_id, path, length = stack.pop()
+        if current_id == destination_id:
+            lengths.append(length)
+            continue
+        for connected_id, weight in graph_obj[current_id].items():
+            if connected_id not in path:
+                stack.append(
+                    (connected_id, path + [connected_id], length + weight)
+                )
+    return sorted(lengths)
+
+
+passing = True
+err_msg = ""
+
+for origin in nodes:
+    for destination in nodes:
+        if origin is destination:
+            continue
+        for graph_type in ["time", "cashflow"]:
+            graph_obj = (
+                graph.time_graph
+                if graph_type == "time"
+                else graph.cashflow_graph
+            )
+            expected = all_path_lengths(
+                graph_obj, origin.inbound_graph_id, destination.inbound_graph_id
+            )[:5]
+            paths = graph.get_k_shortest_paths(
+                origin, destination, 5, graph_type
+            )
+            lengths = [abs(graph.get_path_weight(p, graph_type)) for p in paths]
+            if len(paths) != len(expected) or any(
+                abs(a - b) > 1e-9 for a, b in zip(lengths, expected)
+            ):
+                passing = False
+                err_msg = f"Unexpected k shortest {graph_type} paths."
+            if len(set(map(tuple, paths))) != len(paths):
+                passing = False
+                err_msg = "K shortest paths should be unique."
+
+# Route sets filter out paths through excluded entities
+origin, destination = nodes[0], nodes[5]
+route_set = graph.get_route_set(origin, destination, 4, "time")
+if graph.get_route_set(origin, destination, 4, "time") is not route_set:
+    passing = False
+    err_msg = "Route sets should be cached."
+best = graph.get_alternative_path(origin, destination, "time", k=4)
+if best != graph.get_optimal_path(origin, destination, "time"):
+    passing = False
+    err_msg = "The best alternative should be the optimal path."
+blocked = route_set[0]["entity_ids"] - {origin.id, destination.id}
+alternative = graph.get_alternative_path(
+    origin, destination, "time", k=4, exclude_entity_ids=blocked
+)
+for route in route_set:
+    if route["entity_ids"].isdisjoint(blocked):
+        if (
+            alternative is None
+            or graph.get_path_entity_ids(alternative) & blocked
+        ):
+            passing = False
+            err_msg = "Alternative path uses an excluded entity."
+        break
+
+
+# Orders reroute around a disrupted arc using the cached route sets
+class ReroutingOrder(Order):
+    def consider_reroute(self):
+        new_path = self.get_reroute_path(
+            graph="time", k=4, exclude_entity_ids=disrupted
+        )
+        if new_path is not None and new_path != self.__planned_path__:
+            return True, new_path
+        return False, list()
+
+
+path = graph.get_optimal_path(origin, destination, "time")
+disrupted = {
+    (
+        graph.arc_obj_graph[path[3]][path[4]].id
+        if len(path) > 4
+        else graph.arc_obj_graph[path[1]][path[2]].id
+    )
+}
+order = simulation.add_object(
+    ReroutingOrder(
+        origin_node=origin,
+        destination_node=destination,
+        units=1,
+        planned_path=path,
+    )
+)
+simulation.add_event(time_delta=0.0, func=order.start)
+simulation.run(max_time=1000.0)
+visited = {entry["current_obj_id"] for entry in order.history}
+if order.history[-1]["status"] != "completed":
+    passing = False
+    err_msg = "Rerouted Order did not complete."
+elif len(path) > 4 and visited & disrupted:
+    passing = False
+    err_msg = "Rerouted Order used the disrupted arc."
+
+print("11: K Shortest Paths Test Passed:", passing)
+if not passing:
+    print("    -", err_msg)
@@ -0,0 +1,144 @@
+import random
+from scar_sim.entity import Node, Arc
+from scar_sim.simulation import Simulation
+
+rng = random.Random(8)
+simulation = Simulation()
+nodes = [
+    simulation.add_object(
+        Node(
+            processing_avg_time=rng.uniform(0.1, 1),
+            processing_cashflow_per_unit=-rng.uniform(1, 5),
+        )
+    )
+    for _ in range(8)
+]
+for node in nodes:
+    for other in rng.sample(nodes, 3):
+        if other is not node:
+            # Faster arcs cost more so that time and cashflow conflict
+            speed = rng.uniform(0.5, 5)
+            simulation.add_object(
+                Arc(
+                    origin_node=node,
+                    destination_node=other,
+                    is_symmetric=rng.random() < 0.5,
+                    processing_avg_time=speed,
+                    processing_cashflow_per_unit=-50 / speed
+                    - rng.uniform(0, 10),
+                )
+            )
+graph = simulation.graph
+
+
+def all_paths(origin_id, destination_id):
+    # Brute force every loopless path as (time, cost)
+    output = []
+    stack = [(origin_id, [origin_id], 0.0, 0.0)]
+    while stack:
+        current_id, path, time, cost = stack.pop()
+        if current_id == destination_id:
+            output.append((time, cost))
+            continue
+        for connected_id, weight in graph.time_graph[current_id].items():
+            if connected_id not in path:
+                stack.append(
+                    (
+                        connected_id,
+                        path + [connected_id],
+                        time + weight,
+                        cost + graph.cashflow_graph[current_id][connected_id],
+                    )
+                )
+    return output
+
+
+def frontier_of(points):
+    return sorted(
+        {
+            (round(t, 9), round(c, 9))
+            for t, c in points
+            if not any(
+                (t2 <= t and c2 <= c) and (t2 < t or c2 < c)
+                for t2, c2 in points
+            )
+        }
+    )
+
+
+passing = True
+err_msg = ""
+frontier_sizes = []
+for origin in nodes:
+    for destination in nodes:
+        if origin is destination:
+            continue
+        points = all_paths(
+            origin.inbound_graph_id, destination.inbound_graph_id
+        )
+        frontier = graph.get_pareto_paths(origin, destination)
+        got = sorted(
+            (round(option["time"], 9), round(-option["cashflow"], 9))
+            for option in frontier
+        )
+        frontier_sizes.append(len(got))
+        if got != frontier_of(points):
+            passing = False
+            err_msg = "Pareto frontier does not match brute force."
+            continue
+        if not points:
+            continue
+        for option in frontier:
+            if (
+                abs(
+                    option["time"]
+                    - graph.get_path_weight(option["path"], "time")
+                )
+                > 1e-9
+            ):
+                passing = False
+                err_msg = "Frontier path time does not match its path."
+        # Constraints keep only the feasible part of the frontier
+        max_time = sorted(t for t, _ in points)[len(points) // 2]
+        constrained = graph.get_pareto_paths(
+            origin, destination, max_time=max_time
+        )
+        if sorted(
+            (round(o["time"], 9), round(-o["cashflow"], 9)) for o in constrained
+        ) != frontier_of([p for p in points if p[0] <= max_time]):
+            passing = False
+            err_msg = "Time constrained frontier does not match brute force."
+        budget = sorted(c for _, c in points)[len(points) // 2]
+        constrained = graph.get_pareto_paths(
+            origin, destination, min_cashflow=-budget
+        )
+        if sorted(
+            (round(o["time"], 9), round(-o["cashflow"], 9)) for o in constrained
+        ) != frontier_of([p for p in points if p[1] <= budget]):
+            passing = False
+            err_msg = "Budget constrained frontier does not match brute force."
+        # The weighted mode matches the best blend over all paths
+        weighted = graph.get_weighted_path(origin, destination, 3.0, 1.0)
+        best = min(3.0 * t + c for t, c in points)
+        if abs(3.0 * weighted["time"] - weighted["cashflow"] - best) > 1e-9:
+            passing = False
+            err_msg = "Weighted path is not optimal."
+        # Route options are the ends of the frontier
+        options = graph.get_route_options(origin, destination)
+        if (
+            abs(options["min_time"]["time"] - min(t for t, _ in points)) > 1e-9
+            or abs(
+                -options["min_cashflow"]["cashflow"] - min(c for _, c in points)
+            )
+            > 1e-9
+        ):
+            passing = False
+            err_msg = "Route options are not optimal."
+
+if max(frontier_sizes) < 2:
+    passing = False
+    err_msg = "Test graph has no time/cashflow trade-offs."
+
+print("12: Pareto Routing Test Passed:", passing)
+if not passing:
+    print("    -", err_msg)
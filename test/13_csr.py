@@ -0,0 +1,132 @@
+import random
+from scgraph import Graph as SCGraph
+from scar_sim.entity import Node, Arc
+from scar_sim.simulation import Simulation
+
+rng = random.Random(21)
+simulation = Simulation()
+graph = simulation.graph
+
+
+def add_node():
+    return simulation.add_object(
+        Node(
+            processing_avg_time=rng.uniform(0.1, 2),
+            processing_cashflow_per_unit=-rng.uniform(1, 20),
+        )
+    )
+
+
+def add_arc(origin, destination):
+    return simulation.add_object(
+        Arc(
+            origin_node=origin,
+            destination_node=destination,
+            is_symmetric=rng.random() < 0.5,
+            processing_avg_time=rng.uniform(0.5, 5),
+            processing_cashflow_per_unit=-rng.uniform(1, 50),
+        )
+    )
+
+
+nodes = [add_node() for _ in range(20)]
+arcs = [
+    add_arc(node, other)
+    for node in nodes
+    for other in rng.sample(nodes, 2)
+    if other is not node
+]
+
+passing = True
+err_msg = ""
+
+
+def check_csr(step):
+    csr = graph.get_csr()
+    indptr = csr["indptr"]
+    if len(indptr) - 1 != 2 * len(nodes):
+        return f"CSR has the wrong number of rows at step {step}."
+    for origin_id in range(len(indptr) - 1):
+        positions = range(indptr[origin_id], indptr[origin_id + 1])
+        for graph_type in ["time", "cashflow"]:
+            view = (
+                graph.time_graph
+                if graph_type == "time"
+                else graph.cashflow_graph
+            )
+            row = {csr["indices"][p]: csr[graph_type][p] for p in positions}
+            if row != view[origin_id]:
+                return (
+                    f"{graph_type} view does not match the CSR at step {step}."
+                )
+        for destination_id, arc in graph.arc_obj_graph[origin_id].items():
+            if graph.get_arc(origin_id, destination_id) is not arc:
+                return f"Arc lookup does not match the arc view at step {step}."
+    for arc in arcs:
+        if (
+            graph.get_arc(
+                arc.origin_node.outbound_graph_id,
+                arc.destination_node.inbound_graph_id,
+            )
+            is None
+        ):
+            return f"Missing arc at step {step}."
+    return ""
+
+
+def check_trees(step):
+    for origin in nodes[:4]:
+        for graph_type in ["time", "cashflow"]:
+            tree = graph.get_shortest_path_tree(origin, graph_type)
+            expected = SCGraph(
+                graph.time_graph
+                if graph_type == "time"
+                else graph.cashflow_graph
+            ).get_shortest_path_tree(origin.inbound_graph_id)
+            for graph_id, distance in enumerate(expected["distance_matrix"]):
+                if abs(tree["distance"][graph_id] - distance) > 1e-9 and not (
+                    distance == float("inf")
+                    and tree["distance"][graph_id] == distance
+                ):
+                    return f"Stale {graph_type} tree at step {step}."
+    return ""
+
+
+for step in range(10):
+    err_msg = check_csr(step) or check_trees(step)
+    if err_msg:
+        passing = False
+        break
+    # Weight changes are written into the existing arrays
+    csr = graph.get_csr()
+    entity = rng.choice(arcs + nodes)
+    entity.change_processing_parameters(
+        processing_avg_time=rng.uniform(0.1, 10),
+        processing_cashflow_per_unit=-rng.uniform(1, 60),
+    )
+    if graph.get_csr()["time"] is not csr["time"]:
+        passing = False
+        err_msg = "Weight changes should update the CSR arrays in place."
+        break
+    # New nodes and arcs are merged into new arrays while trees stay cached
+    nodes.append(add_node())
+    arcs.append(add_arc(rng.choice(nodes[:-1]), nodes[-1]))
+    arcs.append(add_arc(nodes[-1], rng.choice(nodes[:-1])))
+
+# Paths with a missing edge have no weight
+lonely = add_node()
+for graph_type in ("time", "cashflow"):
+    try:
+        graph.get_path_weight(
+            [nodes[0].inbound_graph_id, nodes[0].outbound_graph_id]
+            + [lonely.inbound_graph_id],
+            graph_type,
+        )
+        passing = False
+        err_msg = "A path with a missing edge should raise a KeyError."
+    except KeyError:
+        pass
+
+print("13: CSR Graph Test Passed:", passing)
+if not passing:
+    print("    -", err_msg)
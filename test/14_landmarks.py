@@ -0,0 +1,96 @@
+import random
+from scgraph import Graph as SCGraph
+from scar_sim.entity import Node, Arc
+from scar_sim.routing import astar_path
+from scar_sim.simulation import Simulation
+
+rng = random.Random(2)
+simulation = Simulation()
+size = 12
+grid = {}
+for x in range(size):
+    for y in range(size):
+        grid[(x, y)] = simulation.add_object(
+            Node(processing_avg_time=0.1, processing_cashflow_per_unit=-1)
+        )
+arcs = []
+for (x, y), node in grid.items():
+    for other in [(x + 1, y), (x, y + 1)]:
+        if other in grid:
+            arcs.append(
+                simulation.add_object(
+                    Arc(
+                        origin_node=node,
+                        destination_node=grid[other],
+                        processing_avg_time=rng.uniform(1, 2),
+                        processing_cashflow_per_unit=-rng.uniform(1, 2),
+                    )
+                )
+            )
+graph = simulation.graph
+graph.preprocess_landmarks(count=6)
+nodes = list(grid.values())
+
+passing = True
+err_msg = ""
+
+
+def check_paths(step):
+    for _ in range(40):
+        origin, destination = rng.sample(nodes, 2)
+        for graph_type in ["time", "cashflow"]:
+            path = graph.get_optimal_path(origin, destination, graph_type)
+            expected = SCGraph(
+                graph.time_graph
+                if graph_type == "time"
+                else graph.cashflow_graph
+            ).dijkstra(origin.inbound_graph_id, destination.inbound_graph_id)
+            weight = abs(graph.get_path_weight(path, graph_type))
+            if abs(weight - expected["length"]) > 1e-9:
+                return f"Suboptimal {graph_type} path at step {step}."
+    return ""
+
+
+# Landmark guided searches only settle part of the graph
+settled = []
+csr = graph.get_csr()
+tables = graph.__landmarks__["time"]
+for _ in range(40):
+    origin, destination = rng.sample(nodes, 2)
+    settled.append(
+        astar_path(
+            csr,
+            "time",
+            tables,
+            origin.inbound_graph_id,
+            destination.inbound_graph_id,
+        )[2]
+    )
+if sum(settled) / len(settled) > 0.25 * len(csr["indptr"]):
+    passing = False
+    err_msg = "Landmark guided searches settle too much of the graph."
+
+err_msg = err_msg or check_paths("preprocessed")
+# Increases keep the landmarks in use
+for arc in rng.sample(arcs, 10):
+    arc.change_processing_parameters(
+        processing_avg_time=arc.processing_time_avg * 3,
+        processing_cashflow_per_unit=arc.processing_cashflow_per_unit * 3,
+    )
+if not (graph.has_landmarks("time") and graph.has_landmarks("cashflow")):
+    err_msg = err_msg or "Weight increases should keep the landmarks."
+err_msg = err_msg or check_paths("increased")
+# Decreases fall back to Dijkstra until preprocessed again
+for arc in arcs:
+    arc.reset_processing_parameters()
+if graph.has_landmarks("time") or graph.has_landmarks("cashflow"):
+    err_msg = err_msg or "Weight decreases should drop the landmarks."
+err_msg = err_msg or check_paths("decreased")
+graph.preprocess_landmarks(count=6)
+err_msg = err_msg or check_paths("preprocessed again")
+if err_msg:
+    passing = False
+
+print("14: Landmarks Test Passed:", passing)
+if not passing:
+    print("    -", err_msg)
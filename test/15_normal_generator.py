@@ -0,0 +1,54 @@
+import statistics
+from scar_sim.utils import NormalGenerator, np
+
+passing = True
+err_msg = ""
+
+backends = ["python"] + (["numpy"] if np is not None else [])
+for backend in backends:
+    draws = []
+    for _ in range(2):
+        generator = NormalGenerator(7, block_size=256, backend=backend)
+        # Interleave several parameter combinations
+        draws.append(
+            [
+                (
+                    generator(mean=2.0, sigma=0.5, min=1.5, precision=3)
+                    if idx % 3
+                    else generator(mean=10.0, sigma=2.0)
+                )
+                for idx in range(3000)
+            ]
+        )
+    if draws[0] != draws[1]:
+        passing = False
+        err_msg = f"The {backend} backend is not reproducible for a seed."
+    truncated = [value for idx, value in enumerate(draws[0]) if idx % 3]
+    plain = [value for idx, value in enumerate(draws[0]) if not idx % 3]
+    if min(truncated) < 1.5 or any(round(v, 3) != v for v in truncated):
+        passing = False
+        err_msg = f"The {backend} backend ignores min or precision."
+    if (
+        abs(statistics.mean(plain) - 10.0) > 0.2
+        or abs(statistics.stdev(plain) - 2.0) > 0.2
+    ):
+        passing = False
+        err_msg = f"The {backend} backend has the wrong distribution."
+    if NormalGenerator(8, backend=backend)(10.0, 2.0) == draws[0][0]:
+        passing = False
+        err_msg = f"The {backend} backend ignores the seed."
+
+    # Buffers for many distinct parameter combinations are capped
+    generator = NormalGenerator(
+        7, block_size=16, backend=backend, max_buffers=4
+    )
+    for idx in range(100):
+        generator(mean=float(idx), sigma=1.0)
+        generator(mean=0.0, sigma=1.0)
+    if len(generator.__buffers__) > 4 or len(generator.__sizes__) > 4:
+        passing = False
+        err_msg = f"The {backend} backend keeps too many buffers."
+
+print("15: Normal Generator Test Passed:", passing)
+if not passing:
+    print("    -", err_msg)
@@ -0,0 +1,120 @@
+from scar_sim.entity import Node, Arc
+from scar_sim.order import Order
+from scar_sim.simulation import Simulation
+from scar_sim.utils import NormalGenerator
+
+
+def build(random_streams, extra_orders, antithetic=False, sd=0.5):
+    simulation = Simulation(
+        seed=3, random_streams=random_streams, antithetic=antithetic
+    )
+    if extra_orders:
+        # An extra Node (without a stream key) shifts all later simulation ids
+        simulation.add_object(Node(processing_avg_time=1.0))
+    nodes = [
+        simulation.add_object(
+            Node(
+                processing_min_time=0.0,
+                processing_avg_time=2.0,
+                processing_sd_time=sd,
+                stream_key=f"node_{idx}",
+            )
+        )
+        for idx in range(4)
+    ]
+    for idx in range(3):
+        simulation.add_object(
+            Arc(
+                origin_node=nodes[idx],
+                destination_node=nodes[idx + 1],
+                processing_avg_time=3.0,
+                processing_sd_time=sd,
+                stream_key=f"arc_{idx}",
+            )
+        )
+    lanes = [(nodes[0], nodes[3])] + [(nodes[1], nodes[2])] * extra_orders
+    for origin, destination in lanes:
+        order = simulation.add_object(
+            Order(
+                origin_node=origin,
+                destination_node=destination,
+                units=1,
+                planned_path=simulation.graph.get_optimal_path(
+                    origin, destination, "time"
+                ),
+            )
+        )
+        simulation.add_event(time_delta=0.0, func=order.start)
+    simulation.run(max_time=100.0)
+    return [entry["time"] for entry in simulation.orders[0].history]
+
+
+passing = True
+err_msg = ""
+
+# Other Orders shift the first Order's draws when the stream is shared
+if build("shared", 0) == build("shared", 3):
+    passing = False
+    err_msg = "Shared streams should be affected by other Orders."
+# Per-order streams isolate the first Order from the others
+if build("order", 0) != build("order", 3):
+    passing = False
+    err_msg = "Per-order streams should not depend on other Orders."
+# Per-entity streams give common random numbers on entities the other Orders do not use
+times = build("entity", 0)
+if times[:2] != build("entity", 3)[:2]:
+    passing = False
+    err_msg = "Per-entity streams should not depend on other entities."
+
+# Antithetic generators mirror the draws around the mean
+plain = NormalGenerator(5)
+mirrored = NormalGenerator(5, antithetic=True)
+for _ in range(1000):
+    if (
+        abs(
+            plain(10.0, 2.0, precision=9)
+            + mirrored(10.0, 2.0, precision=9)
+            - 20.0
+        )
+        > 1e-6
+    ):
+        passing = False
+        err_msg = "Antithetic draws should mirror the plain draws."
+        break
+if build("entity", 0, antithetic=True) == times:
+    passing = False
+    err_msg = "Antithetic simulations should differ from plain ones."
+
+
+# A failed draw does not leave its Order active for later draws
+class FailingNode(Node):
+    def get_service_time(self, units):
+        raise RuntimeError("Failed draw")
+
+
+simulation = Simulation(seed=3, random_streams="order")
+failing = simulation.add_object(FailingNode(processing_avg_time=1.0))
+other = simulation.add_object(Node(processing_avg_time=1.0))
+simulation.add_object(Arc(origin_node=failing, destination_node=other))
+order = simulation.add_object(
+    Order(
+        failing,
+        other,
+        1,
+        simulation.graph.get_optimal_path(failing, other, "time"),
+    )
+)
+simulation.add_event(time_delta=0.0, func=order.start)
+try:
+    simulation.run(max_time=10.0)
+    passing = False
+    err_msg = "The failed draw should raise its error."
+except RuntimeError:
+    pass
+if simulation.__active_order__ is not None:
+    passing = False
+    err_msg = "A failed draw should not leave its Order active."
+
+print("16: Random Streams Test Passed:", passing)
+if not passing:
+    print("    -", err_msg)
@@ -0,0 +1,161 @@
+from scar_sim.entity import Node, Arc
+from scar_sim.metrics import Metrics
+from scar_sim.order import Order
+from scar_sim.replicator import Replicator, summarize_simulation
+from scar_sim.simulation import Simulation
+from scar_sim.sinks import MemorySink
+
+
+class ClosingSink(MemorySink):
+    def __init__(self):
+        super().__init__()
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+sinks = []
+
+
+def build(seed: int, **kwargs) -> Simulation:
+    simulation = Simulation(seed=seed, **kwargs)
+    nodes = [
+        simulation.add_object(
+            Node(
+                processing_min_time=0.1,
+                processing_avg_time=1.0,
+                processing_sd_time=0.5,
+                processing_cashflow_per_unit=-2.0,
+            )
+        )
+        for _ in range(4)
+    ]
+    for idx in range(3):
+        simulation.add_object(
+            Arc(
+                origin_node=nodes[idx],
+                destination_node=nodes[idx + 1],
+                processing_min_time=0.1,
+                processing_avg_time=2.0,
+                processing_sd_time=1.0,
+                processing_cashflow_per_unit=-5.0,
+            )
+        )
+    for idx in range(5):
+        order = simulation.add_object(
+            Order(
+                origin_node=nodes[0],
+                destination_node=nodes[3],
+                units=idx + 1,
+                planned_path=simulation.graph.get_optimal_path(
+                    nodes[0], nodes[3], "time"
+                ),
+            )
+        )
+        simulation.add_event(time_delta=float(idx), func=order.start)
+    return simulation
+
+
+def build_streamed(seed: int) -> Simulation:
+    # Only metrics are kept in memory and the history is streamed to a sink
+    sinks.append(ClosingSink())
+    return build(
+        seed,
+        metrics=Metrics(),
+        history_sink=sinks[-1],
+        history_drop_completed=True,
+    )
+
+
+def reducer(state: dict, chunk: dict) -> dict:
+    state["rows"] += len(chunk["time"])
+    state["cashflow"] += sum(chunk["cashflow"])
+    return state
+
+
+def combine(total: dict, state: dict) -> dict:
+    total["rows"] += state["rows"]
+    total["cashflow"] += state["cashflow"]
+    return total
+
+
+if __name__ == "__main__":
+    seeds = list(range(10, 18))
+    initial = {"rows": 0, "cashflow": 0.0}
+
+    passing = True
+    err_msg = ""
+
+    serial = Replicator(build, seeds, max_time=100.0).aggregate(
+        reducer, initial, combine, chunk_size=7
+    )
+    parallel = Replicator(build, seeds, max_time=100.0, workers=3).aggregate(
+        reducer, initial, combine, chunk_size=7
+    )
+    if serial != parallel:
+        passing = False
+        err_msg = "Results should not depend on the number of workers."
+
+    summaries, total = serial
+    if [summary["completed_orders"] for summary in summaries] != [5] * len(
+        seeds
+    ):
+        passing = False
+        err_msg = "Every Order should complete in each replication."
+    if len({summary["mean_lead_time"] for summary in summaries}) < 2:
+        passing = False
+        err_msg = "Different seeds should give different replications."
+    if total["rows"] != sum(summary["history_rows"] for summary in summaries):
+        passing = False
+        err_msg = "Chunked history aggregation missed rows."
+    if (
+        abs(
+            total["cashflow"]
+            - sum(summary["total_cashflow"] for summary in summaries)
+        )
+        > 1e-6
+    ):
+        passing = False
+        err_msg = "Chunked history aggregation gave the wrong cashflow."
+
+    # Results are streamed as they finish and stopping early shuts the pool down
+    results = Replicator(build, seeds, max_time=100.0, workers=2).run()
+    first = next(results)
+    results.close()
+    if first["summary"] != summaries[first["index"]]:
+        passing = False
+        err_msg = "Streamed summaries should match the aggregated ones."
+
+    # Summaries use metrics when the history does not hold every entry
+    streamed = [
+        result["summary"]
+        for result in Replicator(build_streamed, seeds, max_time=100.0).run()
+    ]
+    for summary, expected in zip(streamed, summaries):
+        if (
+            summary["completed_orders"] != expected["completed_orders"]
+            or abs(summary["total_cashflow"] - expected["total_cashflow"])
+            > 1e-6
+            or abs(summary["mean_lead_time"] - expected["mean_lead_time"])
+            > 1e-9
+        ):
+            passing = False
+            err_msg = "Summaries from metrics should match the history."
+    # Each replication closes its simulation so the sink gets every entry
+    if len(sinks) != len(seeds) or any(
+        not sink.closed or len(sink.columns["time"]) != expected["history_rows"]
+        for sink, expected in zip(sinks, summaries)
+    ):
+        passing = False
+        err_msg = "Replications should close their history sinks."
+    try:
+        summarize_simulation(build(10, history_level="summary"))
+        passing = False
+        err_msg = "Summarizing an incomplete history should raise an error."
+    except ValueError:
+        pass
+
+    print("17: Replicator Test Passed:", passing)
+    if not passing:
+        print("    -", err_msg)
@@ -0,0 +1,133 @@
+from scar_sim.entity import Node, Arc
+from scar_sim.order import Order
+from scar_sim.simulation import Simulation
+
+simulation = Simulation(seed=7)
+nodes = [
+    simulation.add_object(
+        Node(
+            processing_min_time=0.1,
+            processing_avg_time=1.0,
+            processing_sd_time=0.3,
+            processing_cashflow_per_unit=-1.0,
+        )
+    )
+    for _ in range(5)
+]
+arcs = [
+    simulation.add_object(
+        Arc(
+            origin_node=nodes[idx],
+            destination_node=nodes[idx + 1],
+            processing_min_time=0.1,
+            processing_avg_time=2.0,
+            processing_sd_time=0.5,
+        )
+    )
+    for idx in range(4)
+]
+for idx in range(20):
+    order = simulation.add_object(
+        Order(
+            origin_node=nodes[0],
+            destination_node=nodes[4],
+            units=1,
+            planned_path=simulation.graph.get_optimal_path(
+                nodes[0], nodes[4], "time"
+            ),
+        )
+    )
+    simulation.add_event(time_delta=float(idx), func=order.start)
+simulation.run(max_time=10.0)
+recorded = len(simulation.history)
+
+
+def order_times(sim: Simulation) -> list[list[float]]:
+    return [[entry["time"] for entry in order.history] for order in sim.orders]
+
+
+passing = True
+err_msg = ""
+
+baseline, intervention = simulation.fork(2)
+if baseline.history.__frozen__[0][
+    "__time__"
+] is not simulation.history.__frozen__[0]["__time__"] or len(
+    baseline.history.__time__
+):
+    passing = False
+    err_msg = (
+        "Branches should share the recorded history instead of copying it."
+    )
+if baseline.objects[0].__simulation__ is not baseline:
+    passing = False
+    err_msg = "Branch objects should refer to their own branch."
+
+# Speed up the last Arc in one branch only
+intervention.objects[arcs[3].id].change_processing_parameters(
+    processing_avg_time=0.5
+)
+simulation.run(max_time=200.0)
+baseline.run(max_time=200.0)
+intervention.run(max_time=200.0)
+
+if order_times(baseline) != order_times(simulation):
+    passing = False
+    err_msg = "An unchanged branch should continue exactly like the original."
+if order_times(intervention) == order_times(simulation):
+    passing = False
+    err_msg = "Changes to one branch should not affect the original."
+if arcs[3].processing_time_avg != 2.0:
+    passing = False
+    err_msg = "Entity parameters should be copied per branch."
+if (
+    intervention.graph.get_path_weight(
+        simulation.graph.get_optimal_path(nodes[0], nodes[4], "time"), "time"
+    )
+    != simulation.graph.get_path_weight(
+        simulation.graph.get_optimal_path(nodes[0], nodes[4], "time"), "time"
+    )
+    - 1.5
+):
+    passing = False
+    err_msg = "Branch graph weights should follow branch entity parameters."
+if [len(sim.history) for sim in (simulation, baseline, intervention)] != [
+    len(simulation.history)
+] * 3 or len(simulation.history) <= recorded:
+    passing = False
+    err_msg = "Each branch should record its own history after forking."
+if any(
+    sim.history.__offset__ != recorded
+    or sim.history.__frozen__[0]["__time__"]
+    is not baseline.history.__frozen__[0]["__time__"]
+    for sim in (simulation, intervention)
+):
+    passing = False
+    err_msg = "Branches should only store the entries recorded after forking."
+
+# Forking again shares the entries recorded since the last fork as well
+(probe,) = simulation.fork()
+if probe.history.to_columns() != simulation.history.to_columns():
+    passing = False
+    err_msg = "A branch should read the same history as the original."
+probe.history.set_cashflow(0, 99.0)
+if (
+    probe.orders[0].history[-1]["cashflow"] != 99.0
+    or simulation.orders[0].history[-1]["cashflow"] == 99.0
+    or baseline.orders[0].history[-1]["cashflow"] == 99.0
+):
+    passing = False
+    err_msg = "Changing a shared entry should only affect its own branch."
+
+# Objects pickle can not handle are forked with dill
+fired = []
+simulation.add_event(time_delta=1.0, func=lambda: fired.append(True))
+(branch,) = simulation.fork()
+branch.run(max_time=300.0)
+if fired != [True] or not simulation.__queue__.__live__:
+    passing = False
+    err_msg = "Lambda events should be forked with the rest of the queue."
+
+print("18: Fork Test Passed:", passing)
+if not passing:
+    print("    -", err_msg)
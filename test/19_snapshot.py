@@ -0,0 +1,143 @@
+import os
+from scar_sim.entity import Node, Arc
+from scar_sim.order import Order
+from scar_sim.simulation import Simulation
+from scar_sim.snapshot import is_snapshot
+
+markers = []
+
+
+def build() -> Simulation:
+    simulation = Simulation(
+        seed=11,
+        random_streams="order",
+        log_events=True,
+        history_metadata="intern",
+    )
+    nodes = [
+        simulation.add_object(
+            Node(
+                processing_min_time=0.1,
+                processing_avg_time=1.0,
+                processing_sd_time=0.4,
+                processing_cashflow_per_unit=-3.0,
+                metadata={"node": idx},
+            )
+        )
+        for idx in range(6)
+    ]
+    for idx in range(5):
+        simulation.add_object(
+            Arc(
+                origin_node=nodes[idx],
+                destination_node=nodes[idx + 1],
+                processing_min_time=0.1,
+                processing_avg_time=2.0,
+                processing_sd_time=0.8,
+                processing_cashflow_per_unit=-7.0,
+            )
+        )
+    for idx in range(30):
+        order = simulation.add_object(
+            Order(
+                origin_node=nodes[0],
+                destination_node=nodes[5],
+                units=idx % 3 + 1,
+                planned_path=simulation.graph.get_optimal_path(
+                    nodes[0], nodes[5], "time"
+                ),
+            )
+        )
+        simulation.add_event(time_delta=float(idx), func=order.start)
+    # Events with arguments and a plain function are stored alongside the event codes
+    simulation.add_event(
+        time_delta=40.0,
+        func=nodes[2].change_processing_parameters,
+        kwargs={"processing_avg_time": 3.0},
+    )
+    simulation.add_event(time_delta=45.0, func=markers.append, args=(1,))
+    cancelled = simulation.add_event(time_delta=50.0, func=markers.append)
+    simulation.cancel_event(cancelled)
+    simulation.run(max_time=20.0)
+    return simulation
+
+
+def summarize(simulation: Simulation) -> tuple:
+    return (
+        simulation.history.to_columns(),
+        simulation.get_event_log().to_columns(),
+        simulation.graph.get_csr()["time"].tolist(),
+    )
+
+
+passing = True
+err_msg = ""
+
+original = build()
+expected = build()
+expected.run(max_time=200.0)
+expected = summarize(expected)
+
+for compression in [None, "zlib", "lzma"]:
+    data = original.export_state(compression=compression)
+    if not is_snapshot(data):
+        passing = False
+        err_msg = "Snapshots should start with the snapshot magic bytes."
+    imported = Simulation.import_state(data=data)
+    imported.run(max_time=200.0)
+    if summarize(imported) != expected:
+        passing = False
+        err_msg = (
+            f"A {compression} snapshot did not continue like the original."
+        )
+
+# Memory mapped history columns are copied on the first write
+filename = original.export_state(filename="test_simulation_state.snap")
+imported = Simulation.import_state(filename=filename, memory_map=True)
+if not isinstance(imported.history.__time__, memoryview):
+    passing = False
+    err_msg = "Uncompressed snapshot files should memory map their history."
+if imported.orders[0].history != original.orders[0].history:
+    passing = False
+    err_msg = "Memory mapped history entries should match the original."
+imported.run(max_time=200.0)
+if summarize(imported) != expected:
+    passing = False
+    err_msg = "A memory mapped snapshot did not continue like the original."
+del imported
+os.remove(filename)
+
+# Legacy dill exports are still detected and imported
+imported = Simulation.import_state(data=original.export_state(format="dill"))
+imported.run(max_time=200.0)
+if summarize(imported) != expected:
+    passing = False
+    err_msg = "Legacy dill exports should still be imported."
+
+# Handles of scheduled events held by objects or event args stay attached to the rebuilt events
+simulation = build()
+node = simulation.objects[1]
+node.pending_change = simulation.add_event(
+    time_delta=10.0,
+    func=node.change_processing_parameters,
+    kwargs={"processing_avg_time": 9.0},
+)
+node.pending_marker = simulation.add_event(
+    time_delta=12.0, func=markers.append, args=(2,)
+)
+simulation.add_event(
+    time_delta=5.0, func=simulation.cancel_event, args=(node.pending_change,)
+)
+imported = Simulation.import_state(data=simulation.export_state())
+node = imported.objects[1]
+if not imported.cancel_event(node.pending_marker):
+    passing = False
+    err_msg = "Handles held by objects should cancel the rebuilt events."
+imported.run(max_time=200.0)
+if node.processing_time_avg != 1.0:
+    passing = False
+    err_msg = "Handles in event args should cancel the rebuilt events."
+
+print("19: Snapshot Test Passed:", passing)
+if not passing:
+    print("    -", err_msg)
@@ -0,0 +1,160 @@
+import csv
+import json
+import os
+from scar_sim.entity import Node, Arc
+from scar_sim.order import Order
+from scar_sim.simulation import Simulation
+from scar_sim.sinks import CSVSink, HistorySink, JSONLSink, MemorySink
+
+
+def build(**kwargs) -> Simulation:
+    simulation = Simulation(seed=5, **kwargs)
+    nodes = [
+        simulation.add_object(
+            Node(
+                processing_min_time=0.1,
+                processing_avg_time=1.0,
+                processing_sd_time=0.3,
+                processing_cashflow_per_unit=-2.0,
+                metadata={"node": idx},
+            )
+        )
+        for idx in range(4)
+    ]
+    for idx in range(3):
+        simulation.add_object(
+            Arc(
+                origin_node=nodes[idx],
+                destination_node=nodes[idx + 1],
+                processing_min_time=0.1,
+                processing_avg_time=2.0,
+                processing_sd_time=0.5,
+                processing_cashflow_per_unit=-4.0,
+            )
+        )
+    for idx in range(200):
+        order = simulation.add_object(
+            Order(
+                origin_node=nodes[0],
+                destination_node=nodes[3],
+                units=1,
+                planned_path=simulation.graph.get_optimal_path(
+                    nodes[0], nodes[3], "time"
+                ),
+            )
+        )
+        simulation.add_event(time_delta=idx * 0.5, func=order.start)
+    return simulation
+
+
+passing = True
+err_msg = ""
+
+expected = build()
+expected.run(max_time=50.0)
+expected.run(max_time=500.0)
+expected = expected.history.to_columns()
+
+# A memory sink with dropped completed Orders receives the full history
+sink = MemorySink()
+simulation = build(
+    history_sink=sink, history_batch_size=50, history_drop_completed=True
+)
+simulation.run(max_time=50.0)
+peak = len(simulation.history)
+simulation.run(max_time=500.0)
+simulation.close()
+if sink.columns != expected:
+    passing = False
+    err_msg = "The sink should receive every history entry in order."
+if peak >= len(expected["time"]) // 2 or len(simulation.history):
+    passing = False
+    err_msg = "Completed Orders should be dropped from memory."
+if simulation.orders[0].history:
+    passing = False
+    err_msg = "Dropped Orders should have an empty history."
+
+# File sinks write the same entries
+for sink_type, filename in [
+    (JSONLSink, "test_history.jsonl"),
+    (CSVSink, "test_history.csv"),
+]:
+    simulation = build(history_sink=sink_type(filename), history_batch_size=64)
+    simulation.run(max_time=500.0)
+    simulation.close()
+    if simulation.history.to_columns() != expected:
+        passing = False
+        err_msg = "Without dropping, the history should stay in memory."
+    with open(filename) as f:
+        if sink_type is JSONLSink:
+            rows = [json.loads(line) for line in f]
+        else:
+            rows = list(csv.DictReader(f))
+    os.remove(filename)
+    if len(rows) != len(expected["time"]):
+        passing = False
+        err_msg = f"{sink_type.__name__} wrote the wrong number of rows."
+    elif [float(row["cashflow"]) for row in rows] != expected["cashflow"]:
+        passing = False
+        err_msg = f"{sink_type.__name__} wrote the wrong cashflows."
+    elif [
+        json.loads(row["meta"]) if sink_type is CSVSink else row["meta"]
+        for row in rows
+    ] != expected["meta"]:
+        passing = False
+        err_msg = f"{sink_type.__name__} wrote the wrong metadata."
+
+# Restored simulations keep dropping completed Orders into a new sink
+for format in ["snapshot", "dill"]:
+    first_sink = MemorySink()
+    simulation = build(
+        history_sink=first_sink,
+        history_batch_size=50,
+        history_drop_completed=True,
+    )
+    simulation.run(max_time=50.0)
+    data = simulation.export_state(format=format)
+    simulation.close()
+    try:
+        Simulation.import_state(data=data)
+        passing = False
+        err_msg = "Restoring a dropping history without a sink should fail."
+    except ValueError:
+        pass
+    second_sink = MemorySink()
+    restored = Simulation.import_state(data=data, history_sink=second_sink)
+    if (
+        not restored.history.drop_completed
+        or restored.history.__batch_size__ != 50
+    ):
+        passing = False
+        err_msg = "The history settings should be restored."
+    restored.run(max_time=500.0)
+    restored.close()
+    if len(restored.history):
+        passing = False
+        err_msg = "Restored histories should keep dropping completed Orders."
+    if {
+        key: first_sink.columns[key] + second_sink.columns[key]
+        for key in expected
+    } != expected:
+        passing = False
+        err_msg = "The two sinks should receive every history entry once."
+
+
+# Sinks without a write method fail when they are created, not in the writer thread
+class BrokenSink(HistorySink):
+    def close(self):
+        pass
+
+
+try:
+    BrokenSink()
+    passing = False
+    err_msg = "Sinks without a write method should not be instantiable."
+except TypeError:
+    pass
+
+print("20: History Sinks Test Passed:", passing)
+if not passing:
+    print("    -", err_msg)
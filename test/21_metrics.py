@@ -0,0 +1,190 @@
+import random
+import statistics
+from scar_sim.entity import Node, Arc
+from scar_sim.metrics import Metrics, P2Quantile, Welford
+from scar_sim.order import Order
+from scar_sim.simulation import Simulation
+
+passing = True
+err_msg = ""
+
+# Streaming accumulators against exact statistics
+rng = random.Random(3)
+values = [rng.expovariate(0.5) for _ in range(20000)]
+first, second = Welford(), Welford()
+estimators = {quantile: P2Quantile(quantile) for quantile in (0.5, 0.9, 0.99)}
+for idx, value in enumerate(values):
+    (first if idx % 3 else second).add(value)
+    for estimator in estimators.values():
+        estimator.add(value)
+first.merge(second)
+if (
+    abs(first.mean - statistics.fmean(values)) > 1e-9
+    or abs(first.variance - statistics.variance(values)) > 1e-6
+    or (first.min, first.max) != (min(values), max(values))
+):
+    passing = False
+    err_msg = "Merged Welford accumulators should match exact statistics."
+ordered = sorted(values)
+for quantile, estimator in estimators.items():
+    exact = ordered[int(quantile * len(values))]
+    if abs(estimator.value - exact) > 0.02 * exact:
+        passing = False
+        err_msg = f"The P2 estimate of the {quantile} quantile is off."
+small = P2Quantile(0.5)
+for value in [5.0, 1.0, 3.0]:
+    small.add(value)
+if small.value != 3.0:
+    passing = False
+    err_msg = "P2 estimates should be exact for a few values."
+
+
+def build(**kwargs) -> Simulation:
+    simulation = Simulation(seed=9, **kwargs)
+    nodes = [
+        simulation.add_object(
+            Node(
+                processing_min_time=0.1,
+                processing_avg_time=1.0,
+                processing_sd_time=0.3,
+                processing_cashflow_per_unit=-2.0,
+            )
+        )
+        for _ in range(4)
+    ]
+    for idx in range(3):
+        simulation.add_object(
+            Arc(
+                origin_node=nodes[idx],
+                destination_node=nodes[idx + 1],
+                processing_min_time=0.1,
+                processing_avg_time=2.0,
+                processing_sd_time=0.6,
+                processing_cashflow_per_unit=-5.0,
+            )
+        )
+    for idx in range(100):
+        destination = nodes[3] if idx % 2 else nodes[2]
+        order = simulation.add_object(
+            Order(
+                origin_node=nodes[0],
+                destination_node=destination,
+                units=idx % 4 + 1,
+                planned_path=simulation.graph.get_optimal_path(
+                    nodes[0], destination, "time"
+                ),
+                due_time=idx + 8.0,
+            )
+        )
+        simulation.add_event(time_delta=float(idx), func=order.start)
+    simulation.run(max_time=1000.0)
+    return simulation
+
+
+full = build(metrics=Metrics())
+summary = build(metrics=Metrics(), history_level="summary")
+none = build(metrics=Metrics(), history_level="none")
+
+# Metrics do not depend on the history level
+if not (
+    full.metrics.summary()
+    == summary.metrics.summary()
+    == none.metrics.summary()
+):
+    passing = False
+    err_msg = "Metrics should not depend on the history level."
+columns = full.history.to_columns()
+kpis = full.metrics.summary()
+if abs(kpis["cashflow"] - sum(columns["cashflow"])) > 1e-6:
+    passing = False
+    err_msg = "Metric cashflow totals should match the full history."
+if set(kpis["cashflow_by_key"]) != {"node_cashflow", "arc_cashflow"}:
+    passing = False
+    err_msg = "Cashflows should be grouped by cashflow key."
+lead_times = {}
+for order in full.orders:
+    lane = (order.origin_node.id, order.destination_node.id)
+    history = order.history
+    lead_times.setdefault(lane, []).append(
+        history[-1]["time"] - history[0]["time"]
+    )
+for lane, times in lead_times.items():
+    stats = kpis["lead_time"][lane]
+    if (
+        stats["count"] != len(times)
+        or abs(stats["mean"] - statistics.fmean(times)) > 1e-9
+    ):
+        passing = False
+        err_msg = "Lead time statistics per lane should match the history."
+on_time = [order.history[-1]["time"] <= order.due_time for order in full.orders]
+if abs(kpis["on_time_rate"]["all"] - sum(on_time) / len(on_time)) > 1e-12:
+    passing = False
+    err_msg = "The on time rate should match the history."
+
+# History levels
+if len(none.history) or len(summary.history) != 2 * len(summary.orders):
+    passing = False
+    err_msg = "History levels should skip per hop entries."
+completed = summary.orders[5].history[-1]
+if (
+    completed["status"] != "completed"
+    or abs(completed["time_delta"] - (full.orders[5].history[-1]["time"] - 5.0))
+    > 1e-3
+):
+    passing = False
+    err_msg = "Summary completed entries should carry the lead time."
+
+
+# Cashflows set more than once for the same entry are only counted once
+class Customer(Node):
+    def order_shipped(self, order):
+        # Replaced by the default processing cashflow when the Order ships
+        order.set_current_cashflow(100.0)
+
+    def order_completed(self, order):
+        order.set_current_cashflow(10.0)
+        order.set_current_cashflow(25.0)
+
+
+simulation = Simulation(seed=9, metrics=Metrics())
+nodes = [
+    simulation.add_object(
+        Customer(processing_avg_time=1.0, processing_cashflow_per_unit=-2.0)
+    )
+    for _ in range(2)
+]
+simulation.add_object(
+    Arc(
+        origin_node=nodes[0],
+        destination_node=nodes[1],
+        processing_avg_time=2.0,
+        processing_cashflow_per_unit=-5.0,
+    )
+)
+for idx in range(5):
+    order = simulation.add_object(
+        Order(
+            nodes[0],
+            nodes[1],
+            2,
+            simulation.graph.get_optimal_path(nodes[0], nodes[1], "time"),
+        )
+    )
+    simulation.add_event(time_delta=float(idx), func=order.start)
+simulation.run(max_time=100.0)
+columns = simulation.history.to_columns()
+by_entity = {}
+for obj_id, cashflow in zip(columns["current_obj_id"], columns["cashflow"]):
+    by_entity[obj_id] = by_entity.get(obj_id, 0.0) + cashflow
+kpis = simulation.metrics.summary()
+if (
+    kpis["cashflow"] != sum(columns["cashflow"])
+    or kpis["cashflow"] != 5 * (-4.0 - 10.0 + 25.0)
+    or kpis["cashflow_by_entity"] != by_entity
+):
+    passing = False
+    err_msg = "Metrics should only count the last cashflow set for an entry."
+
+print("21: Metrics Test Passed:", passing)
+if not passing:
+    print("    -", err_msg)
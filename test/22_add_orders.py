@@ -0,0 +1,165 @@
+import time
+from scar_sim.entity import Node, Arc
+from scar_sim.order import Order
+from scar_sim.queue import Queue
+from scar_sim.simulation import Simulation
+
+passing = True
+err_msg = ""
+
+# Bulk scheduled events keep the order they were listed in after existing events at the same time
+for backend in ("heap", "calendar"):
+    queue = Queue(backend=backend)
+    fired = []
+    queue.add(1.0, fired.append, args=("single",))
+    queue.add_many(
+        [2.0, 1.0, 0.5, 1.0],
+        [fired.append] * 4,
+        codes=[0, 1, 2, 3],
+    )
+    queue.add_many([1.5] * 20, [fired.append] * 20, codes=list(range(4, 24)))
+    queue.run(max_time=10.0)
+    if fired != [2, "single", 1, 3, *range(4, 24), 0]:
+        passing = False
+        err_msg = f"Bulk scheduled events fired out of order ({backend})."
+try:
+    Queue().add_many([1.0, -1.0], [print, print])
+    passing = False
+    err_msg = "Bulk scheduling in the past should raise an error."
+except ValueError:
+    pass
+
+
+def build(backend: str) -> tuple[Simulation, list[Node]]:
+    simulation = Simulation(seed=5, queue_backend=backend)
+    nodes = [
+        simulation.add_object(
+            Node(
+                processing_min_time=0.1,
+                processing_avg_time=0.5 + idx * 0.1,
+                processing_sd_time=0.2,
+                processing_cashflow_per_unit=-1.0,
+            )
+        )
+        for idx in range(5)
+    ]
+    for origin, destination, avg_time in [
+        (0, 1, 2.0),
+        (1, 2, 1.0),
+        (0, 2, 4.0),
+        (2, 3, 1.5),
+        (1, 3, 3.0),
+        (3, 4, 1.0),
+    ]:
+        simulation.add_object(
+            Arc(
+                origin_node=nodes[origin],
+                destination_node=nodes[destination],
+                processing_min_time=0.1,
+                processing_avg_time=avg_time,
+                processing_sd_time=0.3,
+                processing_cashflow_per_unit=-3.0,
+            )
+        )
+    return simulation, nodes
+
+
+lanes = [(0, 2), (0, 4), (1, 3), (0, 4), (2, 4)]
+for backend in ("heap", "calendar"):
+    # One Order at a time
+    single, nodes = build(backend)
+    for idx in range(300):
+        origin, destination = lanes[idx % len(lanes)]
+        order = single.add_object(
+            Order(
+                origin_node=nodes[origin],
+                destination_node=nodes[destination],
+                units=idx % 3 + 1,
+                planned_path=single.graph.get_optimal_path(
+                    nodes[origin], nodes[destination], "time"
+                ),
+                due_time=idx * 0.5 + 10.0,
+            )
+        )
+        single.add_event(time_delta=(idx * 7) % 40 * 0.5, func=order.start)
+    single.run(max_time=1000.0)
+
+    # All Orders at once
+    bulk, nodes = build(backend)
+    orders = bulk.add_orders(
+        origins=[nodes[lanes[idx % len(lanes)][0]] for idx in range(300)],
+        destinations=[nodes[lanes[idx % len(lanes)][1]] for idx in range(300)],
+        units=[idx % 3 + 1 for idx in range(300)],
+        start_times=[(idx * 7) % 40 * 0.5 for idx in range(300)],
+        due_times=[idx * 0.5 + 10.0 for idx in range(300)],
+    )
+    bulk.run(max_time=1000.0)
+    if [(order.id, order.order_id) for order in orders] != [
+        (order.id, order.order_id) for order in single.orders
+    ] or bulk.objects[-1] is not orders[-1]:
+        passing = False
+        err_msg = f"Bulk added Orders should get the same ids ({backend})."
+    if bulk.history.to_columns() != single.history.to_columns():
+        passing = False
+        err_msg = f"Bulk added Orders should match single Orders ({backend})."
+
+# Custom path policies are called once per lane
+simulation, nodes = build("heap")
+calls = []
+
+
+def policy(origin: Node, destination: Node) -> list[int]:
+    calls.append((origin.id, destination.id))
+    return simulation.graph.get_optimal_path(origin, destination, "cashflow")
+
+
+simulation.run(max_time=5.0)
+orders = simulation.add_orders(
+    origins=[nodes[0]] * 6 + [nodes[1]] * 6,
+    destinations=[nodes[4], nodes[2]] * 6,
+    units=[1] * 12,
+    path_policy=policy,
+)
+if len(calls) != 4 or len(set(calls)) != 4:
+    passing = False
+    err_msg = "The path policy should be called once per lane."
+if orders[0].__planned_path__ is orders[2].__planned_path__:
+    passing = False
+    err_msg = "Orders on the same lane should not share a planned path list."
+simulation.run(max_time=100.0)
+if any(order.__started__ is False for order in orders) or any(
+    order.start_time != 5.0 for order in orders
+):
+    passing = False
+    err_msg = "Orders without start times should start at the current time."
+try:
+    simulation.add_orders([nodes[0]], [nodes[4]], [1], start_times=[1.0])
+    passing = False
+    err_msg = "Starting Orders in the past should raise an error."
+except ValueError:
+    pass
+try:
+    simulation.add_orders([nodes[0]], [nodes[4], nodes[3]], [1])
+    passing = False
+    err_msg = "Inputs of different lengths should raise an error."
+except ValueError:
+    pass
+
+# Bulk loading scales to many Orders
+simulation, nodes = build("heap")
+count = 200000
+start = time.time()
+simulation.add_orders(
+    origins=[nodes[idx % 2] for idx in range(count)],
+    destinations=[nodes[4 - idx % 3] for idx in range(count)],
+    units=[1] * count,
+    start_times=[(idx * 7919) % count * 0.001 for idx in range(count)],
+)
+duration = time.time() - start
+if len(simulation.orders) != count or duration > 10.0:
+    passing = False
+    err_msg = f"Bulk adding {count} Orders took {duration:.2f}s."
+
+print(f"22: Add Orders Test Passed: {passing}")
+if not passing:
+    print(err_msg)
@@ -0,0 +1,138 @@
+from scar_sim.entity import Node, Arc
+from scar_sim.order import Order
+from scar_sim.simulation import Simulation
+
+passing = True
+err_msg = ""
+
+calls = []
+
+
+class TrackedNode(Node):
+    def order_placed(self, order):
+        calls.append(("placed", self.id))
+
+    def order_arrived(self, order):
+        calls.append(("arrived", self.id))
+
+    def order_completed(self, order):
+        calls.append(("completed", self.id))
+
+
+class ReroutingOrder(Order):
+    def consider_reroute(self):
+        if self.__current_object__.id != 1:
+            return (False, list())
+        # Avoid Node 2 once the Order reaches Node 1
+        return (True, self.get_reroute_path(exclude_entity_ids={2}))
+
+
+simulation = Simulation(seed=4, log_events=True)
+nodes = [
+    simulation.add_object(
+        (TrackedNode if idx != 3 else Node)(
+            processing_min_time=0.5,
+            processing_avg_time=1.0,
+            processing_sd_time=0.2,
+            processing_cashflow_per_unit=-1.0,
+        )
+    )
+    for idx in range(5)
+]
+# An instance level override is detected when the Node is added
+late = Node(processing_min_time=0.5, processing_avg_time=1.0)
+late.order_shipped = lambda order: calls.append(("shipped", late.id))
+simulation.add_object(late)
+for origin, destination, avg_time, symmetric in [
+    (0, 1, 1.0, False),
+    (2, 1, 1.0, True),
+    (2, 4, 1.0, False),
+    (1, 3, 4.0, False),
+    (3, 4, 1.0, False),
+    (4, 5, 1.0, False),
+]:
+    simulation.add_object(
+        Arc(
+            origin_node=nodes[origin] if origin < 5 else late,
+            destination_node=nodes[destination] if destination < 5 else late,
+            processing_min_time=0.5,
+            processing_avg_time=avg_time,
+            processing_sd_time=0.2,
+            processing_cashflow_per_unit=-2.0,
+            is_symmetric=symmetric,
+        )
+    )
+
+if nodes[0].__hooks__ != (True, False, True, True):
+    passing = False
+    err_msg = "Overridden Node hooks were not detected."
+if nodes[3].__hooks__ != (False, False, False, False):
+    passing = False
+    err_msg = "Placeholder Node hooks should be skipped."
+if late.__hooks__ != (False, True, False, False):
+    passing = False
+    err_msg = "Instance level Node hooks should be detected."
+
+# The symmetric Arc from Node 2 to Node 1 is travelled in reverse
+path = simulation.graph.get_optimal_path(nodes[0], late, "time")
+first = simulation.add_object(Order(nodes[0], late, 2, path))
+second = simulation.add_object(Order(nodes[0], late, 1, list(path)))
+rerouted = simulation.add_object(
+    ReroutingOrder(nodes[0], nodes[4], 1, path[:-2])
+)
+# An instance level override of consider_reroute is detected when the Order is added
+instance = Order(nodes[0], nodes[4], 1, path[:-2])
+instance.consider_reroute = lambda: ReroutingOrder.consider_reroute(instance)
+simulation.add_object(instance)
+for order in (first, second, rerouted, instance):
+    simulation.add_event(time_delta=0.0, func=order.start)
+simulation.run(max_time=100.0)
+
+if first.__itinerary__ is not second.__itinerary__:
+    passing = False
+    err_msg = "Orders on the same path should share a compiled itinerary."
+steps = [(arc.id, node.id) for arc, node in first.__itinerary__]
+if steps != [(6, 1), (7, 2), (8, 4), (11, 5)]:
+    passing = False
+    err_msg = f"Unexpected itinerary steps: {steps}"
+visited = [entry["current_obj_id"] for entry in rerouted.history]
+if visited != [0, 0, 6, 1, 9, 3, 10, 4]:
+    passing = False
+    err_msg = f"The rerouted Order did not follow its new path: {visited}"
+if [entry["current_obj_id"] for entry in instance.history] != visited:
+    passing = False
+    err_msg = "Instance level reroutes should be detected."
+completed = first.history[-1]
+if (
+    completed["status"] != "completed"
+    or completed["time_delta"] != 0.0
+    or completed["time"] != first.history[-2]["time"]
+):
+    passing = False
+    err_msg = "Orders should complete at their final arrival."
+# Orders ending at the placeholder hooks of the last Node make no calls there
+if calls != [("placed", 0)] * 4 + [("arrived", 4), ("completed", 4)] * 2:
+    passing = False
+    err_msg = f"Unexpected Node hook calls: {calls}"
+# One start event plus a shipped and an arrived event per hop
+events = simulation.get_event_log().total_events
+if events != 4 * 1 + 2 * 4 * 2 + 2 * 3 * 2:
+    passing = False
+    err_msg = f"Unexpected number of processed events: {events}"
+
+# Unknown status codes and names are rejected before anything is recorded
+rows = len(simulation.history)
+for status in (-1, 4, "lost"):
+    try:
+        first.__next__(status)
+        passing = False
+        err_msg = f"Unknown status {status!r} should raise an error."
+    except ValueError:
+        pass
+if len(simulation.history) != rows:
+    passing = False
+    err_msg = "Unknown statuses should not be recorded."
+
+print(f"23: Itineraries Test Passed: {passing}")
+if not passing:
+    print(err_msg)
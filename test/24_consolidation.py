@@ -0,0 +1,192 @@
+from scar_sim.entity import ORDER_ARRIVED, Node, Arc
+from scar_sim.order import ARRIVED
+from scar_sim.simulation import Simulation
+
+passing = True
+err_msg = ""
+
+
+def build(**arc_kwargs) -> tuple[Simulation, list[Node], Arc]:
+    simulation = Simulation(seed=8, log_events=True)
+    nodes = [
+        simulation.add_object(
+            Node(
+                processing_min_time=0.1,
+                processing_avg_time=0.5,
+                processing_sd_time=0.1,
+                processing_cashflow_per_unit=-1.0,
+            )
+        )
+        for _ in range(3)
+    ]
+    arc = simulation.add_object(
+        Arc(
+            origin_node=nodes[0],
+            destination_node=nodes[1],
+            processing_min_time=1.0,
+            processing_avg_time=4.0,
+            processing_sd_time=1.0,
+            processing_cashflow_per_unit=-5.0,
+            **arc_kwargs,
+        )
+    )
+    simulation.add_object(
+        Arc(
+            origin_node=nodes[1],
+            destination_node=nodes[2],
+            processing_min_time=1.0,
+            processing_avg_time=2.0,
+            processing_sd_time=0.5,
+        )
+    )
+    return simulation, nodes, arc
+
+
+def arrivals(simulation: Simulation, arc: Arc) -> dict:
+    # The Orders arriving over the arc grouped by arrival time
+    groups = {}
+    for order in simulation.orders:
+        for entry in order.history:
+            if (
+                entry["status"] == "arrived"
+                and entry["current_obj_id"] == arc.id
+            ):
+                groups.setdefault(entry["time"], []).append(order)
+    return groups
+
+
+def run(count: int, units: list[int], **arc_kwargs) -> tuple:
+    simulation, nodes, arc = build(**arc_kwargs)
+    simulation.add_orders(
+        origins=[nodes[0]] * count,
+        destinations=[nodes[2]] * count,
+        units=units,
+        start_times=[idx * 0.01 for idx in range(count)],
+    )
+    simulation.run(max_time=1000.0)
+    return simulation, arc
+
+
+# Time window consolidation
+base, base_arc = run(1000, [1] * 1000)
+window, window_arc = run(1000, [1] * 1000, consolidation_window=1.0)
+groups = arrivals(window, window_arc)
+completed = [
+    order
+    for order in window.orders
+    if order.history[-1]["status"] == "completed"
+]
+if len(completed) != 1000:
+    passing = False
+    err_msg = "Every consolidated Order should complete."
+if not 5 <= len(groups) <= 15 or len(arrivals(base, base_arc)) < 900:
+    passing = False
+    err_msg = f"Expected about one shipment per window, got {len(groups)}."
+saved = base.get_event_log().total_events - window.get_event_log().total_events
+if saved < 900:
+    passing = False
+    err_msg = (
+        f"Consolidation should save about an event per Order, saved {saved}."
+    )
+base_cashflow = sum(
+    entry["cashflow"] for order in base.orders for entry in order.history
+)
+window_cashflow = sum(
+    entry["cashflow"] for order in window.orders for entry in order.history
+)
+if base_cashflow != window_cashflow:
+    passing = False
+    err_msg = "Consolidation should not change cashflows."
+
+# Capacity consolidation (Orders of 3 units fill shipments of at most 10 units)
+capacity, capacity_arc = run(
+    60, [3] * 60, consolidation_capacity=10, consolidation_window=5.0
+)
+sizes = [
+    sum(order.units for order in group)
+    for group in arrivals(capacity, capacity_arc).values()
+]
+if sizes != [9] * 20:
+    passing = False
+    err_msg = f"Unexpected shipment sizes: {sizes}"
+# Orders larger than the capacity travel alone
+large, large_arc = run(5, [12] * 5, consolidation_capacity=10)
+if [len(group) for group in arrivals(large, large_arc).values()] != [1] * 5:
+    passing = False
+    err_msg = "Orders larger than the capacity should travel alone."
+
+# Shipments only leave once full without a window
+full, full_arc = run(10, [4] * 10, consolidation_capacity=12)
+if sorted(len(group) for group in arrivals(full, full_arc).values()) != [
+    3,
+    3,
+    3,
+]:
+    passing = False
+    err_msg = "Shipments without a window should leave once full."
+waiting = full_arc.get_shipments()
+if (
+    len(waiting) != 1
+    or waiting[0]["units"] != 4
+    or waiting[0]["node"] is not full.objects[1]
+):
+    passing = False
+    err_msg = "The last Order should still wait for a full shipment."
+
+# Open shipments survive a snapshot round trip
+single, nodes, arc = build(consolidation_window=2.0)
+single.add_orders(
+    [nodes[0]] * 50, [nodes[2]] * 50, [1] * 50, [idx * 0.1 for idx in range(50)]
+)
+single.run(max_time=3.0)
+data = single.export_state()
+if not arc.get_shipments():
+    passing = False
+    err_msg = "Expected an open shipment when taking the snapshot."
+single.run(max_time=100.0)
+restored = Simulation.import_state(data=data)
+restored.run(max_time=100.0)
+if restored.history.to_columns() != single.history.to_columns():
+    passing = False
+    err_msg = "A restored simulation should continue its open shipments."
+
+# Shipments that fill up after a snapshot cancel their restored window event
+for export_format in ("snapshot", "dill"):
+    single, nodes, arc = build(
+        consolidation_window=5.0, consolidation_capacity=4
+    )
+    single.add_orders(
+        [nodes[0]] * 60,
+        [nodes[2]] * 60,
+        [1] * 60,
+        [idx * 0.3 for idx in range(60)],
+    )
+    single.run(max_time=3.3)
+    data = single.export_state(format=export_format)
+    single.run(max_time=100.0)
+    restored = Simulation.import_state(data=data)
+    restored.run(max_time=100.0)
+    if restored.history.to_columns() != single.history.to_columns():
+        passing = False
+        err_msg = (
+            f"Restored window events should be cancelled ({export_format})."
+        )
+
+# Arcs hand shipments back with the Order status code of an arrival
+if ORDER_ARRIVED != ARRIVED:
+    passing = False
+    err_msg = "Arcs should deliver shipments with the arrived status code."
+
+for kwargs in ({"consolidation_window": -1.0}, {"consolidation_capacity": 0}):
+    try:
+        build(**kwargs)
+        passing = False
+        err_msg = (
+            f"Invalid consolidation settings should raise an error: {kwargs}"
+        )
+    except ValueError:
+        pass
+
+print(f"24: Consolidation Test Passed: {passing}")
+if not passing:
+    print(err_msg)
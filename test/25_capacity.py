@@ -0,0 +1,145 @@
+from scar_sim.entity import Node, Arc
+from scar_sim.simulation import Simulation
+
+passing = True
+err_msg = ""
+
+
+def build(node_kwargs: dict, arc_kwargs: dict) -> tuple:
+    simulation = Simulation(seed=2, log_events=True)
+    origin = simulation.add_object(
+        Node(
+            processing_min_time=1.0,
+            processing_avg_time=1.0,
+            processing_sd_time=0.0,
+            **node_kwargs,
+        )
+    )
+    destination = simulation.add_object(Node())
+    arc = simulation.add_object(
+        Arc(
+            origin_node=origin,
+            destination_node=destination,
+            processing_min_time=2.0,
+            processing_avg_time=2.0,
+            processing_sd_time=0.0,
+            **arc_kwargs,
+        )
+    )
+    return simulation, origin, destination, arc
+
+
+def times(simulation: Simulation, status: str) -> list[float]:
+    # The time each Order reached a status, in order_id order
+    return [
+        [entry["time"] for entry in order.history if entry["status"] == status][
+            0
+        ]
+        for order in simulation.orders
+    ]
+
+
+def run(node_kwargs: dict, arc_kwargs: dict, count: int = 6, **order_kwargs):
+    simulation, origin, destination, arc = build(node_kwargs, arc_kwargs)
+    simulation.add_orders(
+        [origin] * count, [destination] * count, [1] * count, **order_kwargs
+    )
+    simulation.run(max_time=100.0)
+    return simulation, origin, arc
+
+
+# A single server processes Orders one at a time in arrival order
+simulation, origin, arc = run({"capacity": 1}, {})
+if times(simulation, "shipped") != [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]:
+    passing = False
+    err_msg = f"Unexpected single server times: {times(simulation, 'shipped')}"
+stats = origin.get_resource_stats()
+if (
+    stats["served"] != 6
+    or stats["max_queue_length"] != 5
+    or stats["mean_waiting_time"] != 2.5
+    or stats["max_waiting_time"] != 5.0
+    or stats["busy"] != 0
+    or stats["queue_length"] != 0
+    or abs(stats["utilisation"] - 6.0 / simulation.current_time()) > 1e-9
+    or abs(stats["mean_queue_length"] - 15.0 / simulation.current_time()) > 1e-9
+):
+    passing = False
+    err_msg = f"Unexpected single server statistics: {stats}"
+
+# Parallel servers
+simulation, origin, arc = run({"capacity": 2}, {})
+if times(simulation, "shipped") != [1.0, 1.0, 2.0, 2.0, 3.0, 3.0]:
+    passing = False
+    err_msg = "Unexpected parallel server times."
+
+# Priority waiting lines serve the earliest due Orders first among waiting Orders
+simulation, origin, arc = run(
+    {"capacity": 1, "queue_discipline": "priority"},
+    {},
+    due_times=[50.0, 10.0, 40.0, 20.0, 30.0, None],
+)
+if times(simulation, "shipped") != [1.0, 2.0, 5.0, 3.0, 4.0, 6.0]:
+    passing = False
+    err_msg = f"Unexpected priority times: {times(simulation, 'shipped')}"
+
+# Throughput extends processing by the units of each Order
+simulation, origin, destination, arc = build({"throughput": 2.0}, {})
+simulation.add_orders([origin] * 2, [destination] * 2, [4, 1])
+simulation.run(max_time=100.0)
+if times(simulation, "shipped") != [3.0, 1.5]:
+    passing = False
+    err_msg = "Throughput should extend processing times by units."
+
+# Arcs with a capacity hold Orders at their origin Node until a server frees up
+simulation, origin, arc = run({}, {"capacity": 2})
+if times(simulation, "arrived") != [3.0, 3.0, 5.0, 5.0, 7.0, 7.0]:
+    passing = False
+    err_msg = f"Unexpected arc capacity times: {times(simulation, 'arrived')}"
+# Both servers are busy from time 1 until the last arrival at time 7
+utilisation = arc.get_resource_stats()["utilisation"]
+if abs(utilisation - 12.0 / (2 * simulation.current_time())) > 1e-9:
+    passing = False
+    err_msg = "Unexpected arc utilisation."
+
+# On consolidating arcs the capacity applies to shipments
+simulation, origin, arc = run(
+    {}, {"capacity": 1, "consolidation_capacity": 2}, count=6
+)
+if times(simulation, "arrived") != [3.0, 3.0, 5.0, 5.0, 7.0, 7.0]:
+    passing = False
+    err_msg = "Shipments should wait for a free arc server."
+if arc.get_resource_stats()["served"] != 3:
+    passing = False
+    err_msg = "Each shipment should take one arc server."
+
+# Capacity survives a snapshot round trip with Orders waiting
+simulation, origin, destination, arc = build({"capacity": 1}, {"capacity": 1})
+simulation.add_orders([origin] * 20, [destination] * 20, [1] * 20)
+simulation.run(max_time=4.5)
+restored = Simulation.import_state(data=simulation.export_state())
+simulation.run(max_time=100.0)
+restored.run(max_time=100.0)
+if (
+    restored.history.to_columns() != simulation.history.to_columns()
+    or restored.objects[0].get_resource_stats()
+    != simulation.objects[0].get_resource_stats()
+):
+    passing = False
+    err_msg = "A restored simulation should continue its waiting lines."
+
+for kwargs in (
+    {"capacity": 0},
+    {"throughput": 0.0},
+    {"queue_discipline": "lifo"},
+):
+    try:
+        Node(**kwargs)
+        passing = False
+        err_msg = f"Invalid capacity settings should raise an error: {kwargs}"
+    except ValueError:
+        pass
+
+print(f"25: Capacity Test Passed: {passing}")
+if not passing:
+    print(err_msg)